@@ -0,0 +1,171 @@
+"""
+Synthetic pages used by the benchmarks, generated deterministically at several sizes.
+
+Run `python -m benchmarks.corpus` to write them again in benchmarks/corpus/ after a change of this file.
+"""
+
+from pathlib import Path
+import random
+from typing import Any, Callable
+
+from conversion.bracket_conversion import BRACKETS
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+SIZES = {"small": 1, "medium": 4, "large": 16}
+MAPS = ("Alcyone", "Amphion", "Crimson Court", "Dynasty", "Ghost River", "Goldenaura", "Oceanborn", "Post-Youth")
+RACES = ("p", "t", "z", "r")
+FLAGS = ("kr", "fr", "de", "us", "pl", "fi", "cn", "tw", "se", "ca")
+
+
+def player(rng: random.Random) -> str:
+    return f"Player{rng.randrange(1000)}"
+
+
+def bracket_match_summary(rng: random.Random) -> str:
+    text = "{{BracketMatchSummary"
+    for i in range(1, rng.choice((3, 5, 7)) + 1):
+        text += f"\n|map{i}={rng.choice(MAPS)}|map{i}win={rng.choice((1, 2))}"
+    return text + "\n}}"
+
+
+def legacy_bracket_page(rng: random.Random, scale: int) -> str:
+    # Large LegacyBracket pages: 64-player brackets with details for every match
+    texts = []
+    for b in range(scale):
+        text = f"=={b + 1}==\n{{{{LegacyBracket|Bracket/64|64SEBracket|id=BENCH{b:06d}"
+        text += "\n|R1=Round of 64 {{Bo|3}}|R2=Round of 32 {{Bo|3}}|R3=Round of 16 {{Bo|5}}"
+        for *player_prefixes, game_prefix in BRACKETS["64SEBracket"].values():
+            for prefix, win in zip(player_prefixes, rng.sample((0, 1), 2)):
+                text += f"\n|{prefix}={player(rng)}|{prefix}race={rng.choice(RACES)}"
+                text += f"|{prefix}flag={rng.choice(FLAGS)}|{prefix}score={2 if win else rng.randrange(2)}"
+                if win:
+                    text += f"|{prefix}win=1"
+            text += f"\n|{game_prefix}details={bracket_match_summary(rng)}"
+        texts.append(text + "\n}}")
+    return "\n\n".join(texts) + "\n"
+
+
+def match_list_page(rng: random.Random, scale: int) -> str:
+    # Match lists: 300 matches on the medium page, in lists of 20 matches
+    texts = []
+    for m in range(scale * 75 // 20):
+        text = f"==Group {m + 1}==\n{{{{Legacy Match list start|id=BENCH{m:06d}|title=Group {m + 1} Matches}}}}"
+        for _ in range(20):
+            text += "\n{{Match maps"
+            for i in (1, 2):
+                text += f"\n|player{i}={player(rng)}|player{i}race={rng.choice(RACES)}"
+                text += f"|player{i}flag={rng.choice(FLAGS)}"
+            for i in range(1, 4):
+                text += f"\n|map{i}={rng.choice(MAPS)}|map{i}win={rng.choice((1, 2))}"
+            text += f"\n|p1score={rng.randrange(3)}|p2score={rng.randrange(3)}\n}}}}"
+        texts.append(text + "\n{{Match list end}}")
+    return "\n\n".join(texts) + "\n"
+
+
+def prize_pool_page(rng: random.Random, scale: int) -> str:
+    # Long prize pool tables: slots for the first places, then slots shared by 4 to 32 opponents
+    text = "==Prize Pool==\n{{Prize pool start|localcurrency=krw}}"
+    place = 1
+    for size in (1, 1, 2, *(4, 8, 16, 32) * scale):
+        text += f"\n{{{{Prize pool slot|place={place}" + (f"-{place + size - 1}" if size > 1 else "")
+        text += f"|usdprize={rng.randrange(100, 10000)}|localprize={rng.randrange(100000, 10000000)}"
+        for i in range(1, size + 1):
+            text += f"\n|{player(rng)}|flag{i}={rng.choice(FLAGS)}|race{i}={rng.choice(RACES)}"
+            text += f"|lastvs{i}={player(rng)}|lastscore{i}={rng.randrange(3)}|lastvsscore{i}=3"
+        text += "\n}}"
+        place += size
+    return text + "\n{{LegacyPrizePoolEnd}}\n"
+
+
+def team_match_page(rng: random.Random, scale: int) -> str:
+    # Proleague pages: sections of team matches of 7 games and an ace match
+    texts = []
+    for w in range(scale * 4):
+        text = f"==Week {w + 1}=="
+        for _ in range(4):
+            text += f"\n{{{{TeamMatch|team1=Team{rng.randrange(20)}|team2=Team{rng.randrange(20)}"
+            text += f"|teamwin={rng.choice((1, 2))}"
+            for prefix in [f"m{i}" for i in range(1, 8)] + ["ace"]:
+                text += f"\n|{prefix}p1={player(rng)}|{prefix}p1race={rng.choice(RACES)}"
+                text += f"|{prefix}p2={player(rng)}|{prefix}p2race={rng.choice(RACES)}"
+                text += f"|{prefix}map={rng.choice(MAPS)}|{prefix}win={rng.choice((1, 2))}"
+            text += "\n}}"
+        texts.append(text)
+    return "\n\n".join(texts) + "\n"
+
+
+def navbox(rng: random.Random, depth: int = 0, width: int = 3) -> str:
+    text = "{{Navbox" if depth == 0 else "{{Navbox subgroup"
+    text += f"\n|title=Level {depth}"
+    for i in range(1, width + 1):
+        text += f"\n|group{i}=Group {i}"
+        if depth < 3:
+            text += f"\n|list{i}={navbox(rng, depth + 1, width)}"
+        else:
+            text += f"\n|list{i}=" + " {{•}} ".join(f"[[{player(rng)}]]" for _ in range(8))
+    return text + "\n}}"
+
+
+def navbox_page(rng: random.Random, scale: int) -> str:
+    # Deep navboxes: 3 levels of subgroups
+    return "\n\n".join(navbox(rng) for _ in range(scale)) + "\n"
+
+
+def bracket_join_page(rng: random.Random, scale: int) -> str:
+    # Pairs of Bracket/32 joined into a Bracket/64
+    texts = []
+    for b in range(scale * 2):
+        text = "{{Bracket|Bracket/32|id=BENCH" + f"{b:06d}"
+        for r, count in enumerate((16, 8, 4, 2, 1), start=1):
+            for m in range(1, count + 1):
+                opponents = "".join(f"|opponent{i}={{{{1Opponent|{player(rng)}}}}}" for i in (1, 2))
+                text += f"\n|R{r}M{m}={{{{Match{opponents}}}}}"
+        texts.append(text + "\n}}")
+    return "\n".join(texts) + "\n"
+
+
+def team_card_page(rng: random.Random, scale: int) -> str:
+    # Team cards: a header table followed by a table of players
+    texts = []
+    for t in range(scale * 8):
+        text = f"{{|\n|{{{{Team|Team{t}}}}}\n|}}\n{{|"
+        for row in range(4):
+            text += "\n|-\n|" + " || ".join(
+                f"{{{{Player|{player(rng)}|flag={rng.choice(FLAGS)}|race={rng.choice(RACES)}}}}}" for _ in range(2)
+            )
+        texts.append(text + "\n|}")
+    return "\n\n".join(texts) + "\n"
+
+
+# Name of the case: generator of the page and converter used for it
+CASES: dict[str, tuple[Callable[[random.Random, int], str], str]] = {
+    "legacy_bracket": (legacy_bracket_page, "tournament"),
+    "match_list": (match_list_page, "tournament"),
+    "prize_pool": (prize_pool_page, "tournament"),
+    "team_match": (team_match_page, "tournament"),
+    "navbox": (navbox_page, "navbox"),
+    "bracket_join": (bracket_join_page, "bracket_join"),
+    "team_card": (team_card_page, "team_card"),
+}
+
+# Options of the conversion of a case, over the default ones
+CASE_OPTIONS: dict[str, dict[str, Any]] = {
+    # Without the details, the slots are converted without their opponents
+    "prize_pool": {"prize_pool_opponent_details": True, "prize_pool_opponent_last_results": True},
+}
+
+
+def generate(case: str, size: str) -> str:
+    generator, _ = CASES[case]
+    return generator(random.Random(f"{case}|{size}"), SIZES[size])
+
+
+def corpus_path(case: str, size: str) -> Path:
+    return CORPUS_DIR / f"{case}-{size}.wiki"
+
+
+if __name__ == "__main__":
+    CORPUS_DIR.mkdir(exist_ok=True)
+    for case in CASES:
+        for size in SIZES:
+            corpus_path(case, size).write_text(generate(case, size), encoding="utf-8")
@@ -0,0 +1,110 @@
+"""
+Benchmark of the converters on the corpus of benchmarks/corpus/.
+
+`python -m benchmarks.run --save` records the timings and the outputs in a baseline file,
+then `python -m benchmarks.run` compares with it: it fails if a case is slower than the baseline
+by more than the threshold, or if a converted text has changed.
+"""
+
+import argparse
+from hashlib import sha256
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+from bracket_join import bracket_join
+from convert_navbox import NavboxConverter
+from convert_team_card import convert_team_card
+from conversion.convert_tournaments import TournamentConverter
+from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+from benchmarks.corpus import CASE_OPTIONS, CASES, SIZES, corpus_path
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+# A case fails if its time is more than (1 + threshold) times the time of the baseline
+DEFAULT_THRESHOLD = 0.25
+# Ids are generated from a seed, so that the converted texts can be compared between runs
+OPTIONS = {**BOOL_OPTIONS, **STRING_OPTIONS, "id_seed": "benchmark"}
+
+CONVERTERS: dict[str, Callable[[str, str, dict[str, Any]], str]] = {
+    "tournament": lambda text, title, options: TournamentConverter(text, title, options).convert()[0],
+    "navbox": lambda text, title, options: NavboxConverter(text, title, options).convert()[0],
+    "bracket_join": lambda text, title, options: bracket_join(text),
+    "team_card": lambda text, title, options: convert_team_card(text),
+}
+
+
+def measure(
+    converter: Callable[[str, str, dict[str, Any]], str], text: str, title: str, options: dict[str, Any], repeat: int
+) -> tuple[float, str]:
+    # Median of the runs, less sensitive to a noisy run than the mean
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converted = converter(text, title, dict(options))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), sha256(converted.encode("utf-8")).hexdigest()
+
+
+def run(cases: list[str], sizes: list[str], repeat: int) -> dict[str, dict[str, float | str]]:
+    results = {}
+    totals: dict[str, list[float]] = {}
+    print(f"{'case':<24}{'size':>10}{'time':>10}{'MB/s':>10}")
+    for case in cases:
+        _, converter_name = CASES[case]
+        options = {**OPTIONS, **CASE_OPTIONS.get(case, {})}
+        for size in sizes:
+            text = corpus_path(case, size).read_text(encoding="utf-8")
+            seconds, output_hash = measure(CONVERTERS[converter_name], text, f"Benchmark/{case}", options, repeat)
+            size_in_bytes = len(text.encode("utf-8"))
+            results[f"{case}-{size}"] = {"time": seconds, "bytes": size_in_bytes, "output": output_hash}
+            totals.setdefault(converter_name, []).append(seconds)
+            throughput = size_in_bytes / 1e6 / seconds
+            print(f"{case + '-' + size:<24}{size_in_bytes / 1e3:>8.1f}kB{seconds * 1000:>8.1f}ms{throughput:>10.2f}")
+
+    print()
+    for converter_name, times in totals.items():
+        print(f"{converter_name:<24}{len(times) / sum(times):>10.1f} pages/s")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    failures = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["time"] / baseline[name]["time"]
+        if ratio > 1 + threshold:
+            failures.append(f"{name}: {ratio:.2f}x slower than the baseline")
+        if result["output"] != baseline[name]["output"]:
+            failures.append(f"{name}: converted text differs from the baseline")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("cases", nargs="*", help=f"cases to run among {', '.join(CASES)} (default: all)")
+    parser.add_argument("--size", action="append", choices=SIZES, help="sizes to run (default: all)")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="number of runs of each case")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    args = parser.parse_args()
+    if unknown := [case for case in args.cases if case not in CASES]:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = run(args.cases or list(CASES), args.size or list(SIZES), args.repeat)
+
+    if args.save:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"\nBaseline saved in {args.baseline}")
+    elif args.baseline.exists():
+        failures = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        print()
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        print(f"{len(failures)} regression(s) (threshold: +{args.threshold:.0%})")
+        sys.exit(1 if failures else 0)
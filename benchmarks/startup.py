@@ -0,0 +1,95 @@
+"""
+Benchmark of the start of the server: import time of main.py (from `python -X importtime`)
+and time until the server answers its first request to /.
+
+`python -m benchmarks.startup` fails if the first response takes longer than the budget.
+"""
+
+import argparse
+from pathlib import Path
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = Path(__file__).parent.parent
+# Time (in seconds) from the start of the server process to its first response to /
+DEFAULT_BUDGET = 0.5
+# Modules with the longest import times shown in the report
+REPORTED_MODULES = 12
+FIRST_RESPONSE_TIMEOUT = 30
+POLL_INTERVAL = 0.005
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    # Self and cumulative import time (in microseconds) of each module imported by the given one
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_time), int(cumulative_time))
+    return times
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def first_response_time() -> float:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < FIRST_RESPONSE_TIMEOUT:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=FIRST_RESPONSE_TIMEOUT) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                if process.poll() is not None:
+                    raise RuntimeError(f"The server exited with code {process.returncode}")
+                time.sleep(POLL_INTERVAL)
+        raise TimeoutError(f"No response from the server after {FIRST_RESPONSE_TIMEOUT}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="number of starts measured")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="maximum time to the first response")
+    args = parser.parse_args()
+
+    runs = [import_times("main") for _ in range(args.repeat)]
+    print(f"{'module':<40}{'self':>10}{'cumulative':>12}")
+    slowest = sorted(runs[0], key=lambda name: -statistics.median(run[name][0] for run in runs if name in run))
+    for name in slowest[:REPORTED_MODULES]:
+        self_time = statistics.median(run[name][0] for run in runs if name in run)
+        cumulative_time = statistics.median(run[name][1] for run in runs if name in run)
+        print(f"{name:<40}{self_time / 1000:>8.1f}ms{cumulative_time / 1000:>10.1f}ms")
+    print(f"{'import main':<40}{statistics.median(run['main'][1] for run in runs) / 1000:>20.1f}ms")
+
+    seconds = statistics.median(first_response_time() for _ in range(args.repeat))
+    print(f"{'first response to /':<40}{seconds * 1000:>20.1f}ms")
+    if seconds > args.budget:
+        print(f"\nOVER BUDGET: {seconds * 1000:.0f}ms > {args.budget * 1000:.0f}ms")
+        sys.exit(1)
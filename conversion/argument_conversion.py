@@ -1,15 +1,64 @@
+from dataclasses import dataclass
 from itertools import takewhile
+import re
 
+# Characters which make an argument key a pattern instead of a plain argument name
+PATTERN_CHARACTERS = set("\\.^$*+?{}[]|()")
 
-def _wrap_arguments(args: dict[str, str | int | None]) -> tuple[str, dict[str, str | int | None]]:
+
+@dataclass(slots=True)
+class ArgumentTable:
+    """
+    Conversion of template arguments, compiled from a dict mapping argument names (regular expressions) to:
+    * int: the index of the part where the next arguments are added
+    * str: the new argument name (may use the groups of the key)
+    * None: the argument is not kept
+    The first key matching an argument name is used.
+    """
+
+    part_count: int
+    # Plain argument names, with what the first matching key gives for them
+    exact: dict[str, str | int | None]
+    # All the other keys, combined in a single pattern, with one named group per key
+    pattern: re.Pattern | None
+    entries: dict[str, tuple[re.Pattern, str | int | None]]
+
+    def convert(self, arg_name: str) -> tuple[bool, str | int | None]:
+        if arg_name in self.exact:
+            return True, self.exact[arg_name]
+        if self.pattern is not None and (m := self.pattern.match(arg_name)):
+            key_pattern, to_arg = self.entries[m.lastgroup]
+            if isinstance(to_arg, str):
+                return True, key_pattern.sub(to_arg, arg_name)
+            return True, to_arg
+        return False, None
+
+
+def _compile_arguments(args: dict[str, str | int | None]) -> ArgumentTable:
     try:
         part_count = 1 + max(takewhile(lambda x: isinstance(x, int), args.values()))
     except ValueError:
         part_count = 1
-    return (part_count, args)
+
+    def first_match(arg_name: str) -> str | int | None:
+        for from_arg, to_arg in args.items():
+            if re.match(rf"^{from_arg}$", arg_name):
+                return re.sub(from_arg, to_arg, arg_name) if isinstance(to_arg, str) else to_arg
+
+    exact = {}
+    alternatives = []
+    entries = {}
+    for i, (from_arg, to_arg) in enumerate(args.items()):
+        if PATTERN_CHARACTERS.isdisjoint(from_arg):
+            exact[from_arg] = first_match(from_arg)
+        else:
+            alternatives.append(rf"(?P<k{i}>^{from_arg}$)")
+            entries[f"k{i}"] = (re.compile(from_arg), to_arg)
+
+    return ArgumentTable(part_count, exact, re.compile("|".join(alternatives)) if alternatives else None, entries)
 
 
-PRIZE_POOL_START_ARGUMENTS = _wrap_arguments(
+PRIZE_POOL_START_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "localcurrency": 1,
@@ -30,7 +79,7 @@ PRIZE_POOL_START_ARGUMENTS = _wrap_arguments(
         "\\d+": None,
     }
 )
-PRIZE_POOL_SLOT_ARGUMENTS = _wrap_arguments(
+PRIZE_POOL_SLOT_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "localprize": 1,
@@ -54,7 +103,7 @@ PRIZE_POOL_SLOT_ARGUMENTS = _wrap_arguments(
         "localprize\\d+": None,
     }
 )
-MATCH_SUMMARY_ARGUMENTS = _wrap_arguments(
+MATCH_SUMMARY_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "(?:flag|race|link|map|win)?\\d+": 1,
@@ -75,7 +124,7 @@ MATCH_SUMMARY_ARGUMENTS = _wrap_arguments(
         "vodgame(\\d+)": "vodgame\\1",
     }
 )
-MATCH_LIST_START_ARGUMENTS = _wrap_arguments(
+MATCH_LIST_START_ARGUMENTS = _compile_arguments(
     {
         "id": "id",
         "1": "title",
@@ -85,7 +134,7 @@ MATCH_LIST_START_ARGUMENTS = _wrap_arguments(
         "vod": None,
     }
 )
-MATCH_LIST_ARGUMENTS = _wrap_arguments(
+MATCH_LIST_ARGUMENTS = _compile_arguments(
     {
         "id": "id",
         "1": "title",
@@ -96,7 +145,7 @@ MATCH_LIST_ARGUMENTS = _wrap_arguments(
         "match\\d+": None,
     }
 )
-MATCH_MAPS_ARGUMENTS = _wrap_arguments(
+MATCH_MAPS_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "player[12](?:flag|race)?": 1,
@@ -126,7 +175,7 @@ MATCH_MAPS_ARGUMENTS = _wrap_arguments(
         "vodgame(\\d+)": "vodgame\\1",
     }
 )
-MATCH_MAPS_TEAM_ARGUMENTS = _wrap_arguments(
+MATCH_MAPS_TEAM_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "(?:team|score)[12]": 1,
@@ -150,7 +199,7 @@ MATCH_MAPS_TEAM_ARGUMENTS = _wrap_arguments(
         "vod": "vod",
     }
 )
-BRACKET_ARGUMENTS = _wrap_arguments(
+BRACKET_ARGUMENTS = _compile_arguments(
     {
         "hideroundtitles": "hideRoundTitles",
         "noDuplicateCheck": "noDuplicateCheck",
@@ -162,7 +211,7 @@ BRACKET_ARGUMENTS = _wrap_arguments(
         "id|type": None,
     }
 )
-BRACKET_MATCH_SUMMARY_ARGUMENTS = _wrap_arguments(
+BRACKET_MATCH_SUMMARY_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "map\\d+(?:win)?": 1,
@@ -193,7 +242,7 @@ BRACKET_MATCH_SUMMARY_ARGUMENTS = _wrap_arguments(
         "vodgame(\\d+)": "vodgame\\1",
     }
 )
-TEAM_MATCH_ARGUMENTS = _wrap_arguments(
+TEAM_MATCH_ARGUMENTS = _compile_arguments(
     {
         # Cutoff arguments
         "team[12](?:short|literal)?": 1,
@@ -237,7 +286,7 @@ TEAM_MATCH_ARGUMENTS = _wrap_arguments(
         "vod": "vod",
     }
 )
-GROUP_TABLE_ARGUMENTS = _wrap_arguments(
+GROUP_TABLE_ARGUMENTS = _compile_arguments(
     {
         "id": "id",
         "1": "title",
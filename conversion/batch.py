@@ -0,0 +1,179 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+import json
+from multiprocessing import get_context
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable, Iterator, TextIO
+
+from conversion.classes import warnings_html, warnings_json
+from conversion.convert import fetch_pages
+from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+from conversion.workers import CONVERTERS, convert_timed
+
+WIKITEXT_SUFFIX = ".wiki"
+# Number of phases logged for each page when timings are requested
+BATCH_LOGGED_PHASES = 5
+
+
+@dataclass(slots=True)
+class BatchJob:
+    wiki: str
+    title: str
+    text: str | None = None
+    path: str = ""
+
+
+@dataclass(slots=True)
+class BatchResult:
+    wiki: str
+    title: str
+    path: str
+    converted: str
+    # Warnings in HTML, as shown by the web pages, and as records
+    info: str
+    warnings: list[dict[str, str]]
+    summary: str
+    error: str
+    # Conversion time (in seconds), fetching excluded
+    time: float
+    # Time and number of calls of each phase, if requested
+    timings: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def read_page_list(path: Path) -> Iterator[BatchJob]:
+    # One page per line: the wiki and the title, separated by a space
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        wiki, _, title = line.partition(" ")
+        yield BatchJob(wiki, title.strip())
+
+
+def read_wikitext_dir(path: Path, wiki: str) -> Iterator[BatchJob]:
+    # The title of a page is the path of its file, so subpages are files in subdirectories
+    for file in sorted(path.rglob(f"*{WIKITEXT_SUFFIX}")):
+        title = file.relative_to(path).with_suffix("").as_posix().replace("_", " ")
+        yield BatchJob(wiki, title, file.read_text(encoding="utf-8"), str(file))
+
+
+def parse_options(values: list[str]) -> dict[str, Any]:
+    # Options are given as name=value; a boolean option alone is set to true
+    options = {**BOOL_OPTIONS, **STRING_OPTIONS}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if key in BOOL_OPTIONS:
+            options[key] = not sep or val.lower() in ("1", "true", "yes", "on")
+        elif key in STRING_OPTIONS:
+            options[key] = val
+        else:
+            raise ValueError(f"Unknown option: {key}")
+    return options
+
+
+def fill_texts(jobs: list[BatchJob], ignore_cache: bool) -> list[BatchResult]:
+    # Pages of a wiki are fetched together, with as few API requests as possible
+    from requests import RequestException
+
+    errors = []
+    titles_by_wiki: dict[str, list[str]] = {}
+    for job in jobs:
+        if job.text is None:
+            titles_by_wiki.setdefault(job.wiki, []).append(job.title)
+    for wiki, titles in titles_by_wiki.items():
+        try:
+            pages = fetch_pages(wiki, titles, ignore_cache)
+        except (KeyError, RequestException) as e:
+            print(f"Error while getting pages from wiki {wiki}: {e!r}", file=sys.stderr)
+            pages = {}
+        for job in jobs:
+            if job.wiki == wiki and job.text is None and (page := pages.get(job.title)) and page.content:
+                job.text = page.content
+    for job in jobs:
+        if job.text is None:
+            error = f"Error while getting {job.title} from wiki {job.wiki}"
+            errors.append(BatchResult(job.wiki, job.title, job.path, "", "", [], "", error, 0.0))
+    return errors
+
+
+def timed_conversion(
+    converter: Callable, text: str, title: str, options: dict[str, Any], phases: bool
+) -> tuple[Any, float, dict[str, dict[str, Any]]]:
+    start = time.perf_counter()
+    if phases:
+        result, timings = convert_timed(converter, text, title, options)
+    else:
+        result, timings = converter(text, title, options), {}
+    return result, time.perf_counter() - start, timings
+
+
+def batch_convert(
+    jobs: list[BatchJob],
+    converter: Callable,
+    options: dict[str, Any],
+    processes: int | None = None,
+    phases: bool = False,
+) -> Iterator[BatchResult]:
+    """
+    Convert many pages in a pool of worker processes, and yield the results as they are done.
+    """
+    yield from fill_texts(jobs, options["ignore_cache"])
+
+    with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as executor:
+        futures = {
+            executor.submit(timed_conversion, converter, job.text, job.title, options, phases): job
+            for job in jobs
+            if job.text is not None
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                (converted, warnings, summary), seconds, timings = future.result()
+            except Exception as e:
+                yield BatchResult(job.wiki, job.title, job.path, "", "", [], "", repr(e), 0.0)
+            else:
+                yield BatchResult(
+                    job.wiki,
+                    job.title,
+                    job.path,
+                    converted,
+                    warnings_html(warnings),
+                    warnings_json(warnings),
+                    summary,
+                    "",
+                    seconds,
+                    timings,
+                )
+
+
+def run_batch(args: Any, output: TextIO) -> int:
+    jobs: list[BatchJob] = []
+    for path in args.pages:
+        jobs.extend(read_page_list(Path(path)))
+    for path in args.dir:
+        jobs.extend(read_wikitext_dir(Path(path), args.wiki))
+    options = parse_options(args.option)
+
+    start = time.perf_counter()
+    count = failed = 0
+    for result in batch_convert(jobs, CONVERTERS[args.converter], options, args.jobs, args.timings):
+        output.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+        output.flush()
+        count += 1
+        if result.error:
+            failed += 1
+            print(f"FAILED  {result.wiki} {result.title}: {result.error}", file=sys.stderr)
+        else:
+            print(f"{result.time:7.3f}s {result.wiki} {result.title}", file=sys.stderr)
+            # The slowest phases of the page
+            phases = sorted(
+                ((name, t) for name, t in result.timings.items() if name != "total"),
+                key=lambda item: -item[1]["time"],
+            )
+            for name, timing in phases[:BATCH_LOGGED_PHASES]:
+                print(f"{'':9}{timing['time']:7.3f}s {timing['count']:5}x {name}", file=sys.stderr)
+
+    print(f"{count} pages ({failed} failed) in {time.perf_counter() - start:.3f}s", file=sys.stderr)
+    return 1 if failed else 0
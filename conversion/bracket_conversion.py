@@ -2041,9 +2041,6 @@ BRACKET_NEW_NAMES = {
     "User:Pres.sure/Template:FinalDoubleKotH": "Bracket/4H4L2DSL1DL",
 }
 
-BRACKET_LEGACY_NAMES = {new: legacy for legacy, new in BRACKET_NEW_NAMES.items()}
-LEGACY_PLAYER_AND_GAME_PREFIXES = {name: sum(matches.values(), ()) for name, matches in BRACKETS.items()}
-
 """
 Single-block brackets
 Brackets with only one block (blocks being Upper/Middle/Lower)
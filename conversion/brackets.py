@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from functools import cache
+
+
+@dataclass(frozen=True, slots=True)
+class BracketDefinition:
+    # Match id, player (or team) prefixes and game prefix of each match, in the order of the bracket
+    matches: tuple[tuple[str, tuple[str, ...], str], ...]
+    # Player and game prefixes of all the matches, for the detection of unknown arguments
+    prefixes: frozenset[str]
+    # Legacy round header arguments and their new names
+    round_headers: dict[str, str | tuple[str, ...]]
+
+
+@dataclass(frozen=True, slots=True)
+class BracketTables:
+    # By legacy name
+    brackets: dict[str, BracketDefinition]
+    new_names: dict[str, str]
+    # By new name
+    legacy_names: dict[str, str]
+    single_block: frozenset[str]
+
+
+@cache
+def bracket_tables() -> BracketTables:
+    # The bracket definitions are only imported and compiled for the first bracket conversion of the process
+    from conversion import bracket_conversion as source
+
+    return BracketTables(
+        brackets={
+            name: BracketDefinition(
+                matches=tuple(
+                    (match_id, tuple(prefixes), game_prefix) for match_id, (*prefixes, game_prefix) in matches.items()
+                ),
+                prefixes=frozenset(prefix for prefixes in matches.values() for prefix in prefixes),
+                round_headers=source.ROUND_HEADERS.get(name, {}),
+            )
+            for name, matches in source.BRACKETS.items()
+        },
+        new_names=source.BRACKET_NEW_NAMES,
+        legacy_names={new: legacy for legacy, new in source.BRACKET_NEW_NAMES.items()},
+        single_block=frozenset(source.SINGLE_BLOCK_BRACKETS),
+    )
@@ -1,9 +1,24 @@
-from dataclasses import dataclass, field
-from functools import cached_property
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from functools import cached_property, lru_cache
+import random
+import string
+import time
+from typing import Any, Callable, ContextManager, Hashable, Iterator
 
 from conversion.countries import COUNTRIES
 from conversion.races import RACES
 
+# Whitespace stripped from argument names by wikitextparser
+ARGUMENT_NAME_WHITESPACE = "\r\n\t "
+# Warnings kept for each category, the next ones are only counted
+WARNINGS_PER_CATEGORY = 100
+# Categories of the warnings rendered under a [category id] header
+GROUPED_WARNING_CATEGORIES = ("Bracket", "Cross table")
+# Flags and races remembered by their lookups: few are used, but a long-running server converts any input
+CANONICAL_CACHE_SIZE = 1024
+
 
 @dataclass
 class Participant:
@@ -18,13 +33,46 @@ class Participant:
 
     @cached_property
     def clean_flag(self):
-        flag = self.flag.lower()
-        return COUNTRIES.get(flag, flag)
+        return canonical_flag(self.flag)
 
     @cached_property
     def clean_race(self):
-        race = self.race.lower()
-        return RACES.get(race, race)
+        return canonical_race(self.race)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_flag(flag: str) -> str:
+    flag = flag.lower()
+    return COUNTRIES.get(flag, flag)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_race(race: str) -> str:
+    race = race.lower()
+    return RACES.get(race, race)
+
+
+def clean_link(link: str) -> str:
+    return link[0].upper() + link[1:].replace("_", " ")
+
+
+@dataclass(slots=True)
+class ParticipantIndex:
+    # Participants by name and by link (in the form given by clean_link), the last one added wins
+    by_name: dict[str, Participant] = field(default_factory=dict)
+    by_link: dict[str, Participant] = field(default_factory=dict)
+    # Links of players given by name, canonical flag and canonical race
+    aliases: dict[tuple[str, str, str], str] = field(default_factory=dict)
+
+    def add(self, p: Participant) -> None:
+        self.by_name[p.name] = p
+        self.by_link[clean_link(p.link or p.name)] = p
+
+    def add_alias(self, name: str, flag: str, race: str, link: str) -> None:
+        self.aliases[(name, canonical_flag(flag), canonical_race(race))] = link
+
+    def alias(self, name: str, flag: str, race: str) -> str | None:
+        return self.aliases.get((name, canonical_flag(flag), canonical_race(race)))
 
 
 @dataclass(slots=True)
@@ -100,6 +148,82 @@ class TeamMatchEntry:
     grouped: bool = False
 
 
+@dataclass(slots=True)
+class SectionGrouping:
+    # Matches of a section grouped into a matchlist, replacing the contents of the section
+    title: str
+    span: tuple[int, int]
+    text: str
+    entries: list[MatchSummaryEntry | TeamMatchEntry]
+
+
+@dataclass(slots=True)
+class RelocationIndex:
+    # Match summaries or team matches which can be moved into a bracket, by key, in the order of the page
+    queues: dict[Hashable, deque[MatchSummaryEntry | TeamMatchEntry]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        entries: list[MatchSummaryEntry] | list[TeamMatchEntry],
+        key: Callable[[MatchSummaryEntry | TeamMatchEntry], Hashable],
+        movable: Callable[[MatchSummaryEntry | TeamMatchEntry], bool],
+    ) -> "RelocationIndex":
+        index = cls()
+        for entry in entries:
+            if movable(entry):
+                index.queues.setdefault(key(entry), deque()).append(entry)
+        return index
+
+    def claim(self, key: Hashable) -> MatchSummaryEntry | TeamMatchEntry | None:
+        # The first entry with this key which has not been moved or grouped yet
+        queue = self.queues.get(key)
+        while queue:
+            entry = queue.popleft()
+            if not (entry.moved or entry.grouped):
+                entry.moved = True
+                return entry
+        return None
+
+
+@dataclass(slots=True)
+class TemplateArguments:
+    """
+    Arguments of a template, read with a single walk of its arguments.
+    get() finds an argument like Template.get_arg (the last one with a name wins) without scanning the template,
+    and value() cleans the value of an argument only once.
+    """
+
+    template: Any
+    # Cleaning of the value of an argument, a missing argument has an empty value
+    clean: Callable[[Any], str]
+    # Unstripped names and arguments, in the order of the template
+    items: list[tuple[str, Any]] = field(init=False)
+    by_name: dict[str, Any] = field(init=False)
+    values: dict[str, str] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # Positional arguments are counted here: wikitextparser counts the previous arguments for each name
+        self.items = []
+        position = 0
+        for arg in self.template.arguments:
+            if arg.positional:
+                position += 1
+                self.items.append((str(position), arg))
+            else:
+                self.items.append((arg.name, arg))
+        self.by_name = {name.strip(ARGUMENT_NAME_WHITESPACE): arg for name, arg in self.items}
+
+    def get(self, name: str) -> Any:
+        return self.by_name.get(name)
+
+    def value(self, name: str) -> str:
+        if (value := self.values.get(name)) is None:
+            arg = self.by_name.get(name)
+            value = self.values[name] = "" if arg is None else self.clean(arg)
+        return value
+
+
 @dataclass(slots=True)
 class Prize:
     value: str = ""
@@ -152,3 +276,167 @@ class Match:
 class BestofMove:
     destination: str
     source: str | None = None
+
+
+@dataclass(slots=True)
+class ChangeSet:
+    changes: list[tuple[int, int, str]] = field(default_factory=list)
+    discarded: list[tuple[int, int, str]] = field(default_factory=list)
+    # When a change contains another one, the outer change is kept (as when the changes were applied one by one
+    # from the end of the text, the outer one last), or the inner one if keep_inner is set
+    keep_inner: bool = False
+
+    def add(self, start: int, end: int, new_text: str) -> None:
+        self.changes.append((start, end, new_text))
+
+    def overlapping(self, start: int, end: int) -> list[tuple[int, int, str]]:
+        return [change for change in self.changes if change[0] < end and start < change[1]]
+
+    def resolve(self) -> list[tuple[int, int, str]]:
+        # Sort by start, outer changes first, then drop:
+        # * changes nested in another change (or the changes containing them, if keep_inner is set)
+        # * changes partially overlapping (or equal to) a previous change
+        self.discarded = []
+        kept: list[tuple[int, int, str]] = []
+        for change in sorted(self.changes, key=lambda change: (change[0], -change[1])):
+            start, end, _ = change
+            if kept and start < kept[-1][1]:
+                last_start, last_end, _ = kept[-1]
+                if self.keep_inner and end <= last_end and (start, end) != (last_start, last_end):
+                    self.discarded.append(kept.pop())
+                else:
+                    self.discarded.append(change)
+                    continue
+            kept.append(change)
+        return kept
+
+    def apply(self, text: str) -> str:
+        parts: list[str] = []
+        pos = 0
+        for start, end, new_text in self.resolve():
+            parts.append(text[pos:start])
+            parts.append(new_text)
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+ID_CHARS = string.ascii_letters + string.digits
+
+
+@dataclass(slots=True)
+class IdGenerator:
+    # Without a seed, ids are random. With a seed, an id only depends on the seed and on the key it is generated for
+    seed: str = ""
+    used: set[str] = field(default_factory=set)
+    length: int = 10
+    rng: random.Random = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed or random.SystemRandom().getrandbits(64))
+
+    def generate(self, key: object = None) -> str:
+        rng = random.Random(f"{self.seed}|{key}") if self.seed and key is not None else self.rng
+        while (id_ := "".join(rng.choices(ID_CHARS, k=self.length))) in self.used:
+            pass
+        self.used.add(id_)
+        return id_
+
+
+@dataclass(slots=True)
+class PhaseTiming:
+    time: float = 0.0
+    count: int = 0
+
+
+@dataclass(slots=True)
+class Timings:
+    # Wall time (in seconds) and number of calls of each phase of a conversion; nested phases are counted in both
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing = self.phases.setdefault(name, PhaseTiming())
+            timing.time += time.perf_counter() - start
+            timing.count += 1
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        return {name: {"time": round(t.time, 6), "count": t.count} for name, t in self.phases.items()}
+
+
+@dataclass(slots=True)
+class ConversionWarning:
+    # Kind of template or feature the warning is about, e.g. "Bracket" or "Participant table"
+    category: str
+    # Id of the template (e.g. of a bracket or a matchlist), empty if it has none
+    template_id: str
+    # Stable identifier of the warning, e.g. "unknown-arguments"
+    code: str
+    message: str
+
+
+@dataclass(slots=True)
+class Warnings:
+    """
+    Warnings of a conversion, kept as records and only rendered when the conversion is done:
+    as HTML for the web pages (warnings_html), as a JSON array for the API (warnings_json).
+    """
+
+    limit: int = WARNINGS_PER_CATEGORY
+    records: list[ConversionWarning] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def add(self, category: str, template_id: str, code: str, message: str) -> None:
+        count = self.counts[category] = self.counts.get(category, 0) + 1
+        if count <= self.limit:
+            self.records.append(ConversionWarning(category, template_id, code, message))
+
+    def collect(self) -> list[ConversionWarning]:
+        # The kept warnings, then one for each category with dropped warnings
+        return self.records + [
+            ConversionWarning(category, "", "dropped-warnings", f"{count - self.limit} more warnings not shown")
+            for category, count in self.counts.items()
+            if count > self.limit
+        ]
+
+
+# Converted text, warnings and summary of a conversion
+ConversionResult = tuple[str, list[ConversionWarning], str]
+
+
+def warnings_html(warnings: list[ConversionWarning]) -> str:
+    # Consecutive warnings about the same bracket (or cross table) are grouped under its id,
+    # the messages of the other warnings already name their template
+    parts = []
+    last_id = ""
+    for warning in warnings:
+        prefix = ""
+        if warning.code == "dropped-warnings":
+            prefix = f"[{warning.category}] "
+        elif warning.category in GROUPED_WARNING_CATEGORIES:
+            prefix = "    " if warning.template_id == last_id else f"[{warning.category} {warning.template_id}]"
+            last_id = warning.template_id
+            if not warning.message.startswith("["):
+                prefix += " "
+        parts.append(f'<div class="warning">⚠️ {prefix}{warning.message}</div>')
+    return "".join(parts)
+
+
+def warnings_json(warnings: list[ConversionWarning]) -> list[dict[str, str]]:
+    return [asdict(warning) for warning in warnings]
+
+
+NO_PHASE = nullcontext()
+
+
+class NoTimings:
+    # Used when timings are disabled: a phase costs a method call and nothing else
+    def phase(self, name: str) -> ContextManager[None]:
+        return NO_PHASE
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        return {}
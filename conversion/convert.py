@@ -1,11 +1,29 @@
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from os import makedirs
-import os.path
-import re
-import requests
-from typing import Any, Callable
+from threading import Event, Lock
+import time
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+from urllib.parse import urlsplit
 
+from conversion.classes import ConversionResult, ConversionWarning, warnings_html
+from conversion.metrics import (
+    API_REQUEST_DURATION,
+    API_REQUEST_FAILURES,
+    CONVERSION_DURATION,
+    CONVERSION_FAILURES,
+    CONVERSIONS,
+    PAGE_CACHE_REQUESTS,
+    RESULT_CACHE_REQUESTS,
+    count_summary,
+)
+from conversion.page_cache import CachedPage, PageCache, normalize_title
+from conversion.result_cache import ResultCache, result_key
+from conversion.workers import ConversionWorkers, convert_timed
+
+# requests (and urllib3) are imported by the first API request, to keep them out of the start of the server
+if TYPE_CHECKING:
+    import requests
 
 API_URLS = {
     "starcraft": "https://liquipedia.net/starcraft/api.php",
@@ -15,67 +33,337 @@ HEADERS = {
     "Accept-Encoding": "gzip",
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36 EnuajBot (enuaj on Liquipedia)",
 }
+# Maximum number of titles in a single query
+API_TITLES_LIMIT = 50
+# Maximum number of open connections to each API host
+API_POOL_SIZE = 10
+# Connect and read timeouts (in seconds)
+API_TIMEOUT = (5, 30)
+# Arguments of the urllib3 Retry of the failed requests
+API_RETRY = {
+    "total": 5,
+    "backoff_factor": 0.5,
+    "status_forcelist": (429, 500, 502, 503, 504),
+    "allowed_methods": ("GET",),
+    "respect_retry_after_header": True,
+}
+# Token bucket for each wiki: sustained rate (in requests per second) and burst size
+API_RATE = 0.5
+API_BURST = 3
+# After this delay (in seconds), the revision of a cached page is checked before using it
+CACHE_MAX_AGE = 3600
+PAGE_CACHE = PageCache(Path(__file__).parent.parent / "cache" / "pages.sqlite3")
+# Number of conversion results kept in memory
+RESULT_CACHE_SIZE = 128
+RESULT_CACHE = ResultCache(RESULT_CACHE_SIZE)
+# Conversions are run in the server process unless workers are started
+WORKERS = ConversionWorkers()
+
+
+@dataclass(slots=True)
+class Revision:
+    content: str
+    revid: int | None = None
+    timestamp: str = ""
+
+
+@dataclass(slots=True)
+class Flight:
+    # A fetch in progress, shared by all the callers asking for the same page
+    done: Event = field(default_factory=Event)
+    result: Any = None
+    error: Exception | None = None
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter: a caller takes a token, and waits for it if the bucket is empty.
+    Tokens are reserved under the lock but waited for outside of it, so callers are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay > 0:
+            time.sleep(delay)
+
+
+SESSIONS: dict[str, "requests.Session"] = {}
+SESSIONS_LOCK = Lock()
+RATE_LIMITERS = {wiki: TokenBucket(API_RATE, API_BURST) for wiki in API_URLS}
+IN_FLIGHT: dict[Hashable, Flight] = {}
+IN_FLIGHT_LOCK = Lock()
+
 
+def convert_page(
+    wiki: str, title: str, converter: Callable, options: dict[str, Any], timings: dict[str, Any] | None = None
+) -> tuple[str, str, list[ConversionWarning], str, str]:
+    # Converted text, messages of the fetch (or error), warnings and summary of the conversion, and original text
+    from requests import RequestException
 
-def convert_page(wiki: str, title: str, converter: Callable, options: dict[str, Any]) -> tuple[str, str, str, str]:
     title = title.replace("_", " ")
 
-    cache_folder = Path(__file__).parent.parent / "cache" / wiki
-    makedirs(cache_folder, exist_ok=True)
-    cache_title = re.sub(r"[\\/\?\":\*]", "_", title)
-    p = cache_folder / cache_title
+    # Concurrent requests for the same page wait for a single fetch
+    key = (wiki, normalize_title(title), options["ignore_cache"])
+    try:
+        page, info_cache = coalesce(key, lambda: get_page(wiki, title, options["ignore_cache"]))
+    except RequestException as e:
+        return "", f"Error while getting {title} from wiki {wiki}: {e}", [], "", ""
+
+    if page and page.content:
+        text = page.content
+        converted, warnings, summary = convert_cached(text, title, converter, options, timings)
+        return converted, info_cache, warnings, summary, text
+
+    return "", f"Error while getting {title} from wiki {wiki}", [], "", ""
+
+
+def get_page(wiki: str, title: str, ignore_cache: bool) -> tuple[CachedPage | None, str]:
+    from requests import RequestException
 
     info_cache = ""
-    if not options["ignore_cache"] and p.exists() and p.is_file():
-        cache_timestamp = os.path.getmtime(p)
-        info_cache += f"Getting cached content ({datetime.fromtimestamp(cache_timestamp).isoformat()})"
-        text: str | None = p.read_text(encoding="utf-8")
-        if datetime.now().timestamp() - cache_timestamp > 3600:
-            info_cache += '<div class="warning">⚠️ Cache is more than 1-hour old</div>'
+    page = PAGE_CACHE.get(wiki, title)
+    if page is not None:
+        checked = datetime.fromtimestamp(page.checked).isoformat()
+        if ignore_cache or time.time() - page.checked > CACHE_MAX_AGE:
+            # Only get the content again if the page has a new revision
+            try:
+                revid = get_liquipedia_page_revid(wiki, title)
+            except RequestException as e:
+                print(f"Error while checking the revision of {title}: {e}")
+                revid = None
+            if revid is not None and revid == page.revid:
+                PAGE_CACHE.touch(wiki, title)
+                PAGE_CACHE_REQUESTS.inc("revalidated")
+                info_cache += f"Getting cached content (revision {revid} is the latest)"
+            elif revid is None and not ignore_cache:
+                PAGE_CACHE_REQUESTS.inc("stale")
+                info_cache += f"Getting cached content ({checked})"
+                info_cache += '<div class="warning">⚠️ Cache is more than 1-hour old</div>'
+            else:
+                PAGE_CACHE_REQUESTS.inc("outdated")
+                page = None
+        else:
+            PAGE_CACHE_REQUESTS.inc("fresh")
+            info_cache += f"Getting cached content ({checked})"
     else:
-        cache_timestamp = None
+        PAGE_CACHE_REQUESTS.inc("miss")
+
+    if page is None:
         info_cache += "Getting content from the API"
-        text = get_liquipedia_page_content(wiki, title)
-        if text:
-            p.write_text(text, encoding="utf-8")
+        if revision := get_liquipedia_page(wiki, title):
+            page = PAGE_CACHE.put(wiki, title, revision.content, revision.revid, revision.timestamp)
+
+    return page, info_cache
 
-    if text:
-        converted, info, summary = converter(text, title, options)
-        return converted, info_cache + ("" if info_cache.endswith("</div>") else "\n") + info, summary, text
 
-    return "", f"Error while getting {title} from wiki {wiki}", "", ""
+def coalesce(key: Hashable, function: Callable[[], Any]) -> Any:
+    with IN_FLIGHT_LOCK:
+        flight = IN_FLIGHT.get(key)
+        leader = flight is None
+        if leader:
+            flight = IN_FLIGHT[key] = Flight()
 
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
 
-def convert_wikitext(text: str, title: str, converter: Callable, options: dict[str, Any]) -> tuple[str, str, str]:
+    try:
+        flight.result = function()
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with IN_FLIGHT_LOCK:
+            del IN_FLIGHT[key]
+        flight.done.set()
+    return flight.result
+
+
+def convert_wikitext(
+    text: str, title: str, converter: Callable, options: dict[str, Any], timings: dict[str, Any] | None = None
+) -> tuple[str, str, list[ConversionWarning], str]:
     if text:
-        return converter(text, title, options)
+        converted, warnings, summary = convert_cached(text, title, converter, options, timings)
+        return converted, "", warnings, summary
 
-    return "", f"Error: no wikitext", ""
+    return "", f"Error: no wikitext", [], ""
 
 
-def get_liquipedia_page_content(wiki: str, title: str) -> str | None:
-    params = {
-        "action": "query",
-        "format": "json",
-        "titles": title,
-        "prop": "revisions",
-        "rvprop": "content",
-    }
+def info_html(info: str, warnings: list[ConversionWarning]) -> str:
+    # Messages of the fetch (or error), followed by the warnings of the conversion
+    if not warnings:
+        return info
+    return info + ("" if not info or info.endswith("</div>") else "\n") + warnings_html(warnings)
+
 
-    response = requests.get(API_URLS[wiki], headers=HEADERS, params=params)
-    if response.status_code == 200:
-        data = response.json()
+def convert_cached(
+    text: str, title: str, converter: Callable, options: dict[str, Any], timings: dict[str, Any] | None = None
+) -> ConversionResult:
+    # The same wikitext converted with the same options gives the same result
+    key = result_key(text, title, converter, options)
+    if timings is not None:
+        # Timings are requested: the conversion is always run, and its phases are added to the given dict
+        result, phases = run_conversion(converter, text, title, options, timed=True)
+        timings.update(phases)
+        RESULT_CACHE.put(key, result)
+    elif (result := RESULT_CACHE.get(key)) is None:
+        RESULT_CACHE_REQUESTS.inc("miss")
+        result = run_conversion(converter, text, title, options)
+        RESULT_CACHE.put(key, result)
+    else:
+        RESULT_CACHE_REQUESTS.inc("hit")
+    return result
 
-        page_data = data["query"]["pages"]
-        page_id = list(page_data.keys())[0]
 
-        if page_id == "-1":
-            print("Page not found")
-            return None
+def run_conversion(converter: Callable, text: str, title: str, options: dict[str, Any], timed: bool = False) -> Any:
+    name = converter.__name__
+    CONVERSIONS.inc(name)
+    try:
+        with CONVERSION_DURATION.time(name):
+            if timed:
+                result = WORKERS.run(convert_timed, converter, text, title, options)
+            else:
+                result = WORKERS.run(converter, text, title, options)
+    except Exception:
+        CONVERSION_FAILURES.inc(name)
+        raise
+    count_summary(name, (result[0] if timed else result)[2])
+    return result
 
-        revision_data = page_data[page_id]["revisions"][0]
-        content = revision_data["*"]
 
-        return content
+def fetch_pages(wiki: str, titles: list[str], ignore_cache: bool = False) -> dict[str, CachedPage | None]:
+    # Fill the cache for many pages at once, with one API request per API_TITLES_LIMIT pages
+    pages = {title: PAGE_CACHE.get(wiki, title) for title in titles}
 
+    to_check = [
+        title
+        for title, page in pages.items()
+        if page is not None and (ignore_cache or time.time() - page.checked > CACHE_MAX_AGE)
+    ]
+    for title, revid in get_liquipedia_page_revids(wiki, to_check).items():
+        if revid is not None and revid == pages[title].revid:
+            PAGE_CACHE.touch(wiki, title)
+        elif revid is not None or ignore_cache:
+            pages[title] = None
+
+    to_fetch = [title for title, page in pages.items() if page is None]
+    for title, revision in get_liquipedia_pages(wiki, to_fetch).items():
+        if revision:
+            pages[title] = PAGE_CACHE.put(wiki, title, revision.content, revision.revid, revision.timestamp)
+
+    return pages
+
+
+def get_session(wiki: str) -> "requests.Session":
+    # One session per API host, so that connections are kept alive and shared between greenlets
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    host = urlsplit(API_URLS[wiki]).netloc
+    with SESSIONS_LOCK:
+        if host not in SESSIONS:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=API_POOL_SIZE, max_retries=Retry(**API_RETRY), pool_block=True
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            SESSIONS[host] = session
+        return SESSIONS[host]
+
+
+def query_revisions(wiki: str, titles: list[str], rvprop: str) -> dict[str, dict[str, Any] | None]:
+    # Latest revision of each title, following title normalizations and redirects
+    from requests import RequestException
+
+    revisions: dict[str, dict[str, Any] | None] = {}
+    unique_titles = list(dict.fromkeys(titles))
+    for i in range(0, len(unique_titles), API_TITLES_LIMIT):
+        chunk = unique_titles[i : i + API_TITLES_LIMIT]
+        params = {
+            "action": "query",
+            "format": "json",
+            "titles": "|".join(chunk),
+            "redirects": 1,
+            "prop": "revisions",
+            "rvprop": rvprop,
+        }
+
+        aliases: dict[str, str] = {}
+        revisions_by_title: dict[str, dict[str, Any]] = {}
+        while True:
+            RATE_LIMITERS[wiki].acquire()
+            try:
+                with API_REQUEST_DURATION.time(wiki):
+                    response = get_session(wiki).get(API_URLS[wiki], params=params, timeout=API_TIMEOUT)
+                response.raise_for_status()
+            except RequestException:
+                API_REQUEST_FAILURES.inc(wiki)
+                raise
+            data = response.json()
+
+            query = data.get("query", {})
+            for alias in query.get("normalized", []) + query.get("redirects", []):
+                aliases[alias["from"]] = alias["to"]
+            for page_data in query.get("pages", {}).values():
+                if page_data.get("revisions"):
+                    revisions_by_title[page_data["title"]] = page_data["revisions"][0]
+
+            # Large contents may be split over multiple responses
+            if "continue" not in data:
+                break
+            params = {**params, **data["continue"]}
+
+        for title in chunk:
+            target = title
+            seen = {target}
+            while target in aliases and aliases[target] not in seen:
+                target = aliases[target]
+                seen.add(target)
+            if target not in revisions_by_title:
+                print(f"Page not found: {title}")
+            revisions[title] = revisions_by_title.get(target)
+
+    return {title: revisions[title] for title in titles}
+
+
+def get_liquipedia_pages(wiki: str, titles: list[str]) -> dict[str, Revision | None]:
+    return {
+        title: Revision(data["*"], data.get("revid"), data.get("timestamp", "")) if data and "*" in data else None
+        for title, data in query_revisions(wiki, titles, "content|ids|timestamp").items()
+    }
+
+
+def get_liquipedia_page(wiki: str, title: str) -> Revision | None:
+    return get_liquipedia_pages(wiki, [title])[title]
+
+
+def get_liquipedia_page_content(wiki: str, title: str) -> str | None:
+    if revision := get_liquipedia_page(wiki, title):
+        return revision.content
     return None
+
+
+def get_liquipedia_page_revids(wiki: str, titles: list[str]) -> dict[str, int | None]:
+    # Cheap query: the revision ids without the contents
+    return {title: data.get("revid") if data else None for title, data in query_revisions(wiki, titles, "ids").items()}
+
+
+def get_liquipedia_page_revid(wiki: str, title: str) -> int | None:
+    return get_liquipedia_page_revids(wiki, [title])[title]
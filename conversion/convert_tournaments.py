@@ -1,22 +1,21 @@
 from collections import defaultdict
 from copy import deepcopy
+from heapq import merge
 from itertools import chain, combinations, groupby
-import random
 import re
-import string
-from typing import Any
+from typing import Any, Iterator
 
 import wikitextparser as wtp
 
 from conversion.argument_conversion import *
-from conversion.bracket_conversion import *
+from conversion.brackets import bracket_tables
 from conversion.countries import COUNTRIES
 from conversion.classes import *
-from conversion.my_wikitextparser import get_italics, get_sections, Italic, Section as mwtp_Section
+from conversion.my_wikitextparser import get_sections, Italic, Section as mwtp_Section, SectionIndex, spans_between
 from conversion.races import RACES
 
-
 rc = re.compile
+EXISTING_ID_PATTERN = rc(r"\|\s*id\s*=\s*(\w+)", re.UNICODE)
 WIKITEXT_COMMENT_PATTERN = rc(r"<!--((?!-->).)*-->", re.UNICODE | re.DOTALL)
 NOTE_PATTERN = rc(r"<sup>((?:(?!<\/sup>).)+)<\/sup>", re.UNICODE)
 ASTERISK_PATTERN = rc(r"(\*+)(?:<\/nowiki>)?$", re.UNICODE)
@@ -71,6 +70,7 @@ PRIZE_POOL_PRIZE_PATTERN = rc(r"\|(?:local|usd)prize=[^\|]+", re.UNICODE)
 PRIZE_POOL_IMPORT_PATTERN = rc(r"(.+)(\|import(?:Limit)?=[^\|]+)(\|.+)")
 WIDTH_IN_PX_TEXT_PATTERN = rc(r"^(\|width=\d+)px$")
 MATCH_ARG_PATTERN = rc(r"^match(\d+)$")
+TEAM_MATCH_GAME_ARG_PATTERN = rc(r"^m([1-9]\d*)(?:win|p1|map|p2)$")
 INCLUDEONLY_SUB = rc(r"<includeonly>(?:(?!\}\}|<\/includeonly>).)+?<\/includeonly>").sub
 PRIZE_POOL_SLOT_OPPONENT_SUB = rc(r"(\{\{(?:Archon)?Opponent)(?=\|)").sub
 GROUP_TABLE_TITLE_WIDTH_SUB = rc(r"(\|title=[^\|]+)\n(\|width=\d+)").sub
@@ -80,38 +80,132 @@ SIMPLE_TEMPLATE_SUB = rc("\{\{[^\}]+\}\}").sub
 SHORT_RACES = ("p", "t", "z", "r")
 POINTS_SEED = {"tsl3": ("2011 Pokerstrategy.com TSL3", "TSL 3")}
 BG_ALIASES = {"proceed": "up", "drop": "down"}
+TEAM_MATCH_TEMPLATES = ("TeamMatch", "TeamMatch/Code", "TeamMatchCompact", "ProleagueMatchNL")
+PASS1_TEMPLATES = (
+    "SingleMatch",
+    "Bracket",
+    "LegacyBracket",
+    "LegacyBracketDisplay",
+    "Legacy Match list start",
+    "LegacyMatchList",
+    "Matchlist",
+    "GroupTableStart",
+)
 
 
 class TournamentConverter:
-    def __init__(self, text: str, title: str, options: dict[str, Any]) -> None:
+    def __init__(
+        self, text: str, title: str, options: dict[str, Any], timings: Timings | NoTimings | None = None
+    ) -> None:
         self.text = text
         self.title = title
         self.options = options
-        self.participants_by_name: dict[str, Participant] = {}
-        self.participants_by_link: dict[str, Participant] = {}
+        self.timings = timings or NoTimings()
+        # Names of the phases are only built when they are timed
+        self.timed = not isinstance(self.timings, NoTimings)
+        self.participants = ParticipantIndex()
         self.participant_tables_not_to_convert: list[int] = []
         if self.options["participant_table_do_not_convert"]:
             self.participant_tables_not_to_convert = transform_string_to_list(
                 self.options["participant_table_do_not_convert"]
             )
 
-    def convert(self) -> tuple[str, str, str]:
-        self.preprocess_text()
+    def convert(self) -> tuple[str, list[ConversionWarning], str]:
+        with self.timings.phase("preprocess"):
+            self.preprocess_text()
 
-        self.info: str = ""
+        self.warnings = Warnings()
         self.summary: str = ""
         self.counter: defaultdict[str, int] = defaultdict(int)
-        self.parsed = wtp.parse(self.text)
+        # Generated ids must not collide with the ids already on the page
+        self.ids = IdGenerator(
+            f"{self.options['id_seed']}|{self.title}" if self.options["id_seed"] else "",
+            set(EXISTING_ID_PATTERN.findall(self.text)),
+        )
+
+        converted = self.convert_sections() if self.options["sections"] else self.convert_parsed()
+        return converted, self.warnings.collect(), self.summary
+
+    def convert_parsed(self) -> str:
+        with self.timings.phase("parse"):
+            self.parsed = wtp.parse(self.text)
+            self.index_templates()
+        # Built on first use
+        self.section_index: SectionIndex | None = None
 
         # Alternatives
         if self.options["convert_very_old_team_matches"]:
-            return self.convert_very_old_team_matches(), self.info, ""
+            return self.convert_very_old_team_matches()
         if self.options["convert_very_old_player_matches_v1"]:
-            return self.convert_very_old_player_matches_v2(), self.info, ""
+            return self.convert_very_old_player_matches_v2()
         if self.options["convert_very_old_player_matches_v2"]:
-            return self.convert_very_old_player_matches_v2(), self.info, ""
+            return self.convert_very_old_player_matches_v2()
 
-        return self.convert_standard(), self.info, self.summary
+        return self.convert_standard()
+
+    def convert_sections(self) -> str:
+        """
+        Only the chosen sections (with their subsections) are parsed and converted, one after the other,
+        and their converted texts are spliced back into the page.
+        The ids, counters and participants are shared by the sections, but participants of other sections are unknown.
+        """
+        text = self.text
+        sections = get_sections(text)
+        spans = []
+        for target_section in (s.strip() for s in self.options["sections"].split(",")):
+            found = [section for section in sections if section.title.strip() == target_section]
+            if not found:
+                self.warn("Sections", "", "section-not-found", f"Section {target_section} not found")
+            spans += [(section.title_span[0], section.contents_span[1]) for section in found]
+
+        # Chosen sections may contain each other
+        merged_spans: list[list[int]] = []
+        for start, end in sorted(spans):
+            if merged_spans and start <= merged_spans[-1][1]:
+                merged_spans[-1][1] = max(merged_spans[-1][1], end)
+            else:
+                merged_spans.append([start, end])
+
+        parts = []
+        pos = 0
+        for start, end in merged_spans:
+            self.text = text[start:end]
+            parts += [text[pos:start], self.convert_parsed()]
+            pos = end
+        parts.append(text[pos:])
+        self.text = text
+        return "".join(parts)
+
+    def index_templates(self) -> None:
+        # Walk the templates of the page once, and normalize their names once
+        self.templates: list[wtp.Template] = self.parsed.templates
+        self.template_names: dict[tuple[int, int], str] = {}
+        self.template_clean_names: dict[tuple[int, int], str] = {}
+        self.templates_by_name: defaultdict[str, list[wtp.Template]] = defaultdict(list)
+        # Arguments of the templates read for the template being converted, by span: a template found in the
+        # arguments of another one is a new object, but has the same span as in the page
+        self.template_arguments: dict[tuple[int, int], TemplateArguments] = {}
+        for tpl in self.templates:
+            name = tpl.normal_name(capitalize=True)
+            clean_name = INCLUDEONLY_SUB("", name) if "<includeonly>" in name else name
+            self.template_names[tpl.span] = name
+            self.template_clean_names[tpl.span] = clean_name
+            self.templates_by_name[clean_name].append(tpl)
+
+    def index_sections(self) -> SectionIndex:
+        # Sections and italics of the text, shared by all the features grouping the matches of a section
+        if self.section_index is None:
+            self.section_index = SectionIndex.build(self.text)
+        return self.section_index
+
+    def templates_named(self, *names: str) -> Iterator[wtp.Template]:
+        # Templates are indexed by their name without <includeonly> parts, in the order of the page
+        return merge(*(self.templates_by_name.get(name, ()) for name in names), key=lambda tpl: tpl.span)
+
+    def args(self, tpl: wtp.Template) -> TemplateArguments:
+        if (arguments := self.template_arguments.get(tpl.span)) is None:
+            arguments = self.template_arguments[tpl.span] = TemplateArguments(tpl, clean_arg_value)
+        return arguments
 
     def preprocess_text(self) -> None:
         if self.options["convert_very_old_player_matches_v1"] or self.options["convert_very_old_player_matches_v2"]:
@@ -141,62 +235,74 @@ class TournamentConverter:
     def convert_standard(self) -> str:
         # Populated in conversion functions
         self.not_converted_arguments: set[tuple[str, str]] = set()
-        self.changes: list[tuple[int, int, str]] = []
+        self.changes = ChangeSet()
         self.match_summaries: list[MatchSummaryEntry] = []
         self.team_matches: list[TeamMatchEntry] = []
+        # Built on first use, once the entries have been grouped
+        self.match_summary_index: RelocationIndex | None = None
+        self.team_match_index: RelocationIndex | None = None
         self.participant_tables_processed: int = 0
-        self.warning_last_id: str = ""
+        # Only applied after pass 2, if no other conversion happens in their sections
+        self.groupings: list[SectionGrouping] = []
+        # Built on first use, to name the conversions in warnings
+        self.template_starts: dict[int, str] | None = None
 
         # Get match summaries
-        for tpl in self.parsed.templates:
-            name = tpl.normal_name(capitalize=True)
-            if name == "MatchSummary" and (ms_result := self.convert_match_summary(tpl)):
-                self.match_summaries.append(MatchSummaryEntry(*ms_result))
+        with self.timings.phase("match summaries"):
+            for tpl in self.templates_named("MatchSummary"):
+                if self.template_names[tpl.span] == "MatchSummary" and (ms_result := self.convert_match_summary(tpl)):
+                    self.match_summaries.append(MatchSummaryEntry(*ms_result))
 
         # Get aliases from the form options
         self.get_aliases_from_options()
 
         # Get team matches
-        for tpl in self.parsed.templates:
-            name = tpl.normal_name(capitalize=True)
-            if name in ("TeamMatch", "TeamMatch/Code", "TeamMatchCompact", "ProleagueMatchNL") and (
-                tm_result := self.convert_team_match(tpl)
-            ):
-                self.team_matches.append(TeamMatchEntry(*tm_result))
+        with self.timings.phase("team matches"):
+            for tpl in self.templates_named(*TEAM_MATCH_TEMPLATES):
+                if self.template_names[tpl.span] in TEAM_MATCH_TEMPLATES and (
+                    tm_result := self.convert_team_match(tpl)
+                ):
+                    self.team_matches.append(TeamMatchEntry(*tm_result))
 
         # Group match summaries of a section into a matchlist (if enabled)
         if self.options["group_matches_of_section"]:
-            self.group_match_summaries()
+            with self.timings.phase("group match summaries"):
+                self.group_match_summaries()
 
         # Group team matches of a section into a matchlist (if enabled)
         if self.options["group_team_matches_of_section"]:
-            self.group_team_matches()
+            with self.timings.phase("group team matches"):
+                self.group_team_matches()
 
         # Parse templates (Pass 1)
         self.single_match_ids: list[str] = []
         self.group_tbl_ids: list[list[str]] = []
-        for tpl in self.parsed.templates:
-            name = tpl.normal_name(capitalize=True)
-
-            match name:
-                case "SingleMatch":
-                    if x := tpl.get_arg("id"):
-                        self.single_match_ids.append(clean_arg_value(x))
-                case "Bracket" | "LegacyBracket" | "LegacyBracketDisplay":
-                    if (x1 := tpl.get_arg("1")) and clean_arg_value(x1) == "Bracket/2" and (x := tpl.get_arg("id")):
-                        self.single_match_ids.append(clean_arg_value(x))
-                case "Legacy Match list start" | "LegacyMatchList" | "Matchlist":
-                    if self.group_tbl_ids and (x := tpl.get_arg("id")):
-                        self.group_tbl_ids[-1].append(clean_arg_value(x))
-                case "GroupTableStart":
-                    self.group_tbl_ids.append([])
-                case _:
-                    name = INCLUDEONLY_SUB("", name)
-                    if name == "GroupTableStart":
+        with self.timings.phase("pass 1"):
+            for tpl in self.templates_named(*PASS1_TEMPLATES):
+                name = self.template_names[tpl.span]
+
+                match name:
+                    case "SingleMatch":
+                        if x := self.args(tpl).get("id"):
+                            self.single_match_ids.append(clean_arg_value(x))
+                    case "Bracket" | "LegacyBracket" | "LegacyBracketDisplay":
+                        if (
+                            (x1 := self.args(tpl).get("1"))
+                            and clean_arg_value(x1) == "Bracket/2"
+                            and (x := self.args(tpl).get("id"))
+                        ):
+                            self.single_match_ids.append(clean_arg_value(x))
+                    case "Legacy Match list start" | "LegacyMatchList" | "Matchlist":
+                        if self.group_tbl_ids and (x := self.args(tpl).get("id")):
+                            self.group_tbl_ids[-1].append(clean_arg_value(x))
+                    case "GroupTableStart":
                         self.group_tbl_ids.append([])
+                    case _:
+                        if self.template_clean_names[tpl.span] == "GroupTableStart":
+                            self.group_tbl_ids.append([])
 
         # For the second pass, we mix tables and templates
-        parsed_tables_and_templates = sorted(self.parsed.tables + self.parsed.templates, key=lambda obj: obj.span)
+        parsed_tables_and_templates = sorted(self.parsed.tables + self.templates, key=lambda obj: obj.span)
 
         # Parse tables and templates (Pass 2)
         self.templates_to_skip = set()
@@ -216,10 +322,16 @@ class TournamentConverter:
         for tbl_or_tpl in parsed_tables_and_templates:
             if tbl_or_tpl.span in self.templates_to_skip:
                 continue
+            self.template_arguments.clear()
             if isinstance(tbl_or_tpl, wtp.Table) and not self.options["participant_table_do_not_convert_any"]:
-                self.pass2_for_table(tbl_or_tpl)
+                with self.timings.phase("pass 2: table"):
+                    self.pass2_for_table(tbl_or_tpl)
             elif isinstance(tbl_or_tpl, wtp.Template):
-                self.pass2_for_template(tbl_or_tpl)
+                phase_name = f"pass 2: {self.template_names[tbl_or_tpl.span]}" if self.timed else ""
+                with self.timings.phase(phase_name):
+                    self.pass2_for_template(tbl_or_tpl)
+
+        self.apply_groupings()
 
         # Convert match summaries that have not been moved or grouped
         for ms_entry in self.match_summaries:
@@ -227,11 +339,11 @@ class TournamentConverter:
                 # Do nothing
                 pass
             elif ms_entry.moved:
-                self.changes.append((*ms_entry.span, ""))
+                self.changes.add(*ms_entry.span, "")
             else:
-                mid = generate_id()
+                mid = self.ids.generate(ms_entry.span)
                 new_text = f"{{{{SingleMatch|id={mid}" + "\n|M1={{Match\n" + "\n".join(ms_entry.texts) + "\n}}\n}}"
-                self.changes.append((*ms_entry.span, new_text))
+                self.changes.add(*ms_entry.span, new_text)
 
         # Convert team matches that have not been moved or grouped
         for tm_entry in self.team_matches:
@@ -239,21 +351,31 @@ class TournamentConverter:
                 # Do nothing
                 pass
             elif tm_entry.moved:
-                self.changes.append((*tm_entry.span, ""))
+                self.changes.add(*tm_entry.span, "")
             else:
-                mid = generate_id()
+                mid = self.ids.generate(tm_entry.span)
                 new_text = f"{{{{SingleMatch|id={mid}" + "\n" + "|M1={{Match\n" + tm_entry.text + "\n}}\n}}"
-                self.changes.append((*tm_entry.span, new_text))
+                self.changes.add(*tm_entry.span, new_text)
 
         # Apply changes
-        converted = self.text
-        for start, end, new_text in sorted(self.changes, reverse=True):
-            converted = f"{converted[:start]}{new_text}{converted[end:]}"
+        with self.timings.phase("apply changes"):
+            converted = self.changes.apply(self.text)
+        if self.changes.discarded:
+            self.warn(
+                "Conversion",
+                "",
+                "overlapping-conversions",
+                f"Overlapping conversions: {len(self.changes.discarded)} discarded"
+                f" ({', '.join(self.describe_span(start, end) for start, end, _ in self.changes.discarded)})",
+            )
 
         if self.not_converted_arguments:
-            self.info += f'<div class="warning">⚠️ Arguments not converted: {len(self.not_converted_arguments)} '
-            self.info += str(sorted(self.not_converted_arguments))
-            self.info += "</div>"
+            self.warn(
+                "Conversion",
+                "",
+                "arguments-not-converted",
+                f"Arguments not converted: {len(self.not_converted_arguments)} {sorted(self.not_converted_arguments)}",
+            )
 
         # Create a summary
         if self.counter:
@@ -265,18 +387,18 @@ class TournamentConverter:
 
     def pass2_for_table(self, tbl: wtp.Table) -> None:
         if table_result := self.convert_table_to_participant_table(tbl):
-            self.changes.append((*tbl.span, table_result))
+            self.changes.add(*tbl.span, table_result)
             self.counter["participant table"] += 1
         if table_result is not None:
             self.participant_table_span = tbl.span
 
     def pass2_for_template(self, tpl: wtp.Template) -> None:
-        name = tpl.normal_name(capitalize=True)
+        name = self.template_names[tpl.span]
 
         if not self.options["prize_pool_table_do_not_convert"]:
             match name:
                 case "Prize pool start":
-                    if (x := tpl.get_arg("award")) and self.read_bool(clean_arg_value(x)):
+                    if (x := self.args(tpl).get("award")) and self.read_bool(clean_arg_value(x)):
                         self.prize_pool_type = "Award"
                     else:
                         self.prize_pool_type = "Solo"
@@ -320,33 +442,42 @@ class TournamentConverter:
                 self.match_list_text = "{{Matchlist" + "".join(texts) + "\n"
                 self.match_list_start_pos = tpl.span[0]
                 self.match_list_matches = []
-                self.match_list_id = clean_arg_value(tpl.get_arg("id"))
+                self.match_list_id = self.args(tpl).value("id")
                 self.match_list_comments = []
                 self.match_maps_prev_bestof = None
-                if (x := tpl.get_arg("vod")) and (vod := clean_arg_value(x)):
+                if (x := self.args(tpl).get("vod")) and (vod := clean_arg_value(x)):
                     self.match_list_vod = vod
-                    self.info += (
-                        f'<div class="warning">⚠️ vod in Match list start {self.match_list_id}'
-                        " moved to the first match of the list</div>"
+                    self.warn(
+                        "Matchlist",
+                        self.match_list_id,
+                        "vod-moved",
+                        f"vod in Match list start {self.match_list_id} moved to the first match of the list",
                     )
                 else:
                     self.match_list_vod = None
                 if name == "LegacyMatchList":
-                    match_args = list(filter_template_args(tpl, MATCH_ARG_PATTERN))
+                    match_args = list(filter_template_args(self.args(tpl), MATCH_ARG_PATTERN))
                     # First, verify the order and warn if needed
                     last_index = 0
                     for x, m in match_args:
                         index = int(m[1])
                         if int(m[1]) != last_index + 1:
-                            self.info += (
-                                f'<div class="warning">⚠️ Unexpected index ({index} after {last_index})'
-                                f" in matchlist {self.match_list_id}</div>"
+                            self.warn(
+                                "Matchlist",
+                                self.match_list_id,
+                                "unexpected-index",
+                                f"Unexpected index ({index} after {last_index}) in matchlist {self.match_list_id}",
                             )
                         last_index = index
                     # Process the matchX arguments
                     for x, m in sorted(match_args, key=lambda t: int(t[1][1])):
                         if not x.templates:
-                            self.info += f'<div class="warning">⚠️ Empty {m[0]} in matchlist {self.match_list_id}</div>'
+                            self.warn(
+                                "Matchlist",
+                                self.match_list_id,
+                                "empty-match",
+                                f"Empty {m[0]} in matchlist {self.match_list_id}",
+                            )
                         else:
                             sub_tpl = x.templates[0]
                             self.pass2_for_template(sub_tpl)
@@ -354,7 +485,7 @@ class TournamentConverter:
                     self.close_match_list(tpl)
             case "Match maps" | "MatchMaps/Legacy":
                 if self.match_list_id is None:
-                    self.info += '<div class="warning">⚠️ Match maps found out of a matchlist</div>'
+                    self.warn("Matchlist", "", "match-out-of-matchlist", "Match maps found out of a matchlist")
                 if mm_result := self.convert_match_maps(tpl):
                     mm_result.header = "\n" if self.text[tpl.span[0] - 2 : tpl.span[0]] == "\n\n" else ""
                     self.match_list_matches.append(mm_result)
@@ -363,24 +494,27 @@ class TournamentConverter:
                     mmt_result.header = "\n" if self.text[tpl.span[0] - 2 : tpl.span[0]] == "\n\n" else ""
                     self.match_list_matches.append(mmt_result)
             case "Match list comment":
-                self.info += (
-                    f'<div class="warning">⚠️ [Matchlist {self.match_list_id}] Match list comment may be lost</div>'
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "comment-lost",
+                    f"[Matchlist {self.match_list_id}] Match list comment may be lost",
                 )
-                self.match_list_comments.append(clean_arg_value(tpl.get_arg("1")))
+                self.match_list_comments.append(self.args(tpl).value("1"))
             case "Match list end":
                 if self.match_list_id is None:
-                    self.info += f'<div class="warning">⚠️ Match list end without a start</div>'
+                    self.warn("Matchlist", "", "end-without-start", "Match list end without a start")
                 else:
                     self.close_match_list(tpl)
 
             case "LegacyBracket" | "LegacyBracketDisplay":
                 if bracket_result := self.convert_bracket(tpl):
-                    self.changes.append((*tpl.span, bracket_result))
+                    self.changes.add(*tpl.span, bracket_result)
                     self.counter["LegacyBracket"] += 1
 
             case "ExternalCupList":
                 if self.options["external_cup_list_convert"] and (list_result := self.convert_external_cup_list(tpl)):
-                    self.changes.append((*tpl.span, list_result))
+                    self.changes.add(*tpl.span, list_result)
                     self.counter["ExternalCupList"] += 1
 
             case "StorePlayerLink":
@@ -393,11 +527,11 @@ class TournamentConverter:
                 participants = self.add_participants_from_participant_table(tpl)
                 if self.options["participant_table_convert_first_to_qualified_prize_pool_table"]:
                     prize_pool_table = self.prize_pool_table_from_sections([Section("", participants)])
-                    self.changes.append((*tpl.span, prize_pool_table))
+                    self.changes.add(*tpl.span, prize_pool_table)
 
             case "LegacyPlayerCrossTable":
                 if cross_table_result := self.convert_legacy_player_cross_table(tpl):
-                    self.changes.append((*tpl.span, cross_table_result))
+                    self.changes.add(*tpl.span, cross_table_result)
                     self.counter["LegacyPlayerCrossTable"] += 1
 
             case "GroupTableStart":
@@ -415,9 +549,9 @@ class TournamentConverter:
                 if "TeamBracket" in name or name in ("IPTLBracket", "TeSLBracket"):
                     name = name.replace("TeamBracket", "Bracket")
                     if team_bracket_result := self.convert_team_bracket(tpl, name):
-                        self.changes.append((*tpl.span, team_bracket_result))
+                        self.changes.add(*tpl.span, team_bracket_result)
 
-                name = INCLUDEONLY_SUB("", name)
+                name = self.template_clean_names[tpl.span]
 
                 if name == "GroupTableStart":
                     self.process_group_table_start(tpl)
@@ -430,9 +564,11 @@ class TournamentConverter:
         if len(self.match_list_matches) > 1 and not self.match_list_matches[0].bestof_is_set:
             for i, match in enumerate(self.match_list_matches[1:], start=2):
                 if match.bestof_is_set:
-                    self.info += (
-                        f'<div class="warning">⚠️ [Matchlist {self.match_list_id}]'
-                        f" Move |bestof={match.bestof} from M{i} to M1</div>"
+                    self.warn(
+                        "Matchlist",
+                        self.match_list_id,
+                        "bestof-moved",
+                        f"[Matchlist {self.match_list_id}] Move |bestof={match.bestof} from M{i} to M1",
                     )
                     self.match_list_matches[0].bestof = match.bestof
                     match.bestof_is_set = False
@@ -446,20 +582,15 @@ class TournamentConverter:
         if self.match_list_comments:
             self.match_list_text += "\n" + " ".join(self.match_list_comments)
         if self.match_list_vod:
-            self.info += '<div class="warning">⚠️ ... No match to move the VOD to</div>'
-        self.changes.append((self.match_list_start_pos, match_list_end_pos, self.match_list_text))
+            self.warn("Matchlist", self.match_list_id, "vod-not-moved", "... No match to move the VOD to")
+        self.changes.add(self.match_list_start_pos, match_list_end_pos, self.match_list_text)
         self.counter["Legacy Match list"] += 1
         self.match_list_id = None
 
     def get_aliases_from_options(self) -> None:
-        self.tm_player_aliases = {}
         if self.options["team_match_player_aliases"]:
-            self.tm_player_aliases = {
-                (name, flag, race): link
-                for name, flag, race, link in (
-                    line.split("|") for line in self.options["team_match_player_aliases"].replace("\r", "").split("\n")
-                )
-            }
+            for line in self.options["team_match_player_aliases"].replace("\r", "").split("\n"):
+                self.participants.add_alias(*line.split("|"))
         self.team_aliases = {}
         if self.options["team_aliases"]:
             self.team_aliases = {
@@ -470,32 +601,29 @@ class TournamentConverter:
             }
 
     def group_match_summaries(self) -> None:
-        sections = get_sections(self.text)
-        italics = get_italics(self.text)
-        try:
-            section = next(
-                section for section in sections if section.title == self.options["group_matches_of_section"]
-            )
-        except StopIteration:
+        index = self.index_sections()
+        if (section := index.by_title.get(self.options["group_matches_of_section"])) is None:
             print(f"Section {self.options['group_matches_of_section']} not found")
         else:
             start, end = section.contents_span
+            starts = [ms_entry.span[0] for ms_entry in self.match_summaries]
             stuff = sorted(
                 (
                     *((child.title_span, child) for child in section.children),
-                    *((it.span, it) for it in italics),
+                    *((it.span, it) for it in index.italics_between(start, end)),
                     *(
                         (ms_entry.span, ms_entry)
-                        for ms_entry in self.match_summaries
-                        if start <= ms_entry.span[0] and ms_entry.span[1] <= end
+                        for ms_entry in spans_between(self.match_summaries, starts, start, end)
                     ),
                 )
             )
 
-            mid = generate_id()
+            mid = self.ids.generate((start, end))
             new_text = f"{{{{Matchlist|id={mid}" + "\n"
+            entries = []
             i = 1
-            date = ""
+            # A date given before the section applies to its first matches
+            date = italic.text if (italic := index.last_italic_before(start, DATE_PATTERN)) else ""
             for item in stuff:
                 if isinstance(item[1], mwtp_Section):
                     if HIDDEN_ANCHOR_PATTERN.search(item[1].title) is None:
@@ -510,18 +638,19 @@ class TournamentConverter:
                         new_text += f"|date={date}" + "\n"
                     new_text += "\n".join(item[1].texts) + "\n}}\n"
                     item[1].grouped = True
+                    entries.append(item[1])
                     i += 1
             new_text += "}}\n"
-            self.changes.append((*section.contents_span, new_text))
+            self.groupings.append(SectionGrouping(section.title.strip(), section.contents_span, new_text, entries))
 
     def group_team_matches(self) -> None:
-        sections = get_sections(self.text)
-        italics = get_italics(self.text)
+        index = self.index_sections()
+        starts = [tm_entry.span[0] for tm_entry in self.team_matches]
         target_sections = (s.strip() for s in self.options["group_team_matches_of_section"].split(","))
         mode = self.options["group_team_matches_mode"] or "single"
 
         for target_section in target_sections:
-            if (section := next((section for section in sections if section.title == target_section), None)) is None:
+            if (section := index.by_title.get(target_section)) is None:
                 print(f"Section {target_section} not found")
                 continue
 
@@ -529,16 +658,12 @@ class TournamentConverter:
             stuff = sorted(
                 (
                     *((child.title_span, child) for child in section.children),
-                    *((it.span, it) for it in italics),
-                    *(
-                        (tm_entry.span, tm_entry)
-                        for tm_entry in self.team_matches
-                        if start <= tm_entry.span[0] and tm_entry.span[1] <= end
-                    ),
+                    *((it.span, it) for it in index.italics_between(start, end)),
+                    *((tm_entry.span, tm_entry) for tm_entry in spans_between(self.team_matches, starts, start, end)),
                 )
             )
 
-            mid = generate_id()
+            mid = self.ids.generate((start, end))
             if mode == "single":
                 new_text = f"{{{{Matchlist|id={mid}"
                 if self.options["group_team_matches_width"]:
@@ -549,8 +674,9 @@ class TournamentConverter:
             elif mode == "multiple":
                 new_text = ""
             section_text = ""
+            entries = []
             i = 1
-            date = ""
+            date = italic.text if (italic := index.last_italic_before(start, DATE_PATTERN)) else ""
             for item in stuff:
                 if isinstance(item[1], mwtp_Section):
                     if mode == "single":
@@ -565,7 +691,7 @@ class TournamentConverter:
                             new_text += section_text
                             new_text += "{{Box|break|padding=4em}}\n"
                         new_text += "\n" + f"{'=' * item[1].level}{item[1].title}{'=' * item[1].level}" + "\n"
-                        mid = generate_id()
+                        mid = self.ids.generate(item[0])
                         section_text = f"{{{{Matchlist|id={mid}|collapsed=false"
                         if self.options["group_team_matches_width"]:
                             section_text += f"|width={self.options['group_team_matches_width']}"
@@ -585,6 +711,7 @@ class TournamentConverter:
                     elif mode == "multiple":
                         section_text += match_text
                     item[1].grouped = True
+                    entries.append(item[1])
                     i += 1
             if mode == "single":
                 new_text += "}}\n"
@@ -593,11 +720,48 @@ class TournamentConverter:
                 new_text += section_text
                 new_text += "{{Box|end}}\n"
 
-            self.changes.append((*section.contents_span, new_text))
+            self.groupings.append(SectionGrouping(section.title.strip(), section.contents_span, new_text, entries))
+
+    def apply_groupings(self) -> None:
+        """
+        A grouping replaces the whole contents of its section: it is only applied if nothing else in the section
+        is converted (e.g. a group table, a matchlist or a match not grouped with the others).
+        Otherwise its matches are converted one by one, like the matches of the other sections.
+        """
+        applied: list[SectionGrouping] = []
+        for grouping in self.groupings:
+            start, end = grouping.span
+            conflicts = [change[:2] for change in self.changes.overlapping(start, end)]
+            conflicts += [g.span for g in applied if g.span[0] < end and start < g.span[1]]
+            conflicts += [
+                entry.span
+                for entry in (*self.match_summaries, *self.team_matches)
+                if not entry.grouped and start <= entry.span[0] and entry.span[1] <= end
+            ]
+            if conflicts:
+                for entry in grouping.entries:
+                    entry.grouped = False
+                self.warn(
+                    "Conversion",
+                    "",
+                    "grouping-discarded",
+                    f"Matches of section {grouping.title} not grouped, the section has other conversions"
+                    f" ({', '.join(self.describe_span(*span) for span in sorted(conflicts))})",
+                )
+            else:
+                self.changes.add(start, end, grouping.text)
+                applied.append(grouping)
+
+    def describe_span(self, start: int, end: int) -> str:
+        # Name of the template starting the span, or else its first line
+        if self.template_starts is None:
+            self.template_starts = {tpl.span[0]: self.template_names[tpl.span] for tpl in self.templates}
+        if (name := self.template_starts.get(start)) is not None:
+            return name
+        return self.text[start:end].strip().split("\n", 1)[0][:40]
 
     def add_participant(self, p: Participant) -> None:
-        self.participants_by_name[p.name] = p
-        self.participants_by_link[clean_link(p.link or p.name)] = p
+        self.participants.add(p)
 
     def add_participants(self, participants: list[Participant]) -> None:
         for p in participants:
@@ -677,20 +841,20 @@ class TournamentConverter:
 
             p = Participant(race=table_races[col])
             for tpl in c.templates:
-                name = tpl.normal_name(capitalize=True)
+                name = self.template_names[tpl.span]
                 if name in ("TeamPart", "TeamIcon"):
                     has_a_teampart_tpl = True
-                    p.team = clean_arg_value(tpl.get_arg("1"))
+                    p.team = self.args(tpl).value("1")
                 elif name in ("Player", "Playersp"):
-                    if x := tpl.get_arg("1"):
+                    if x := self.args(tpl).get("1"):
                         p.name = clean_arg_value(x)
                         if m := PIPE_PATTERN.match(p.name):
                             p.link, p.name = m.groups()
-                    if x := tpl.get_arg("flag"):
+                    if x := self.args(tpl).get("flag"):
                         p.flag = clean_arg_value(x)
-                    if race := clean_arg_value(tpl.get_arg("race")):
+                    if race := self.args(tpl).value("race"):
                         p.race = race
-                    if x := tpl.get_arg("link"):
+                    if x := self.args(tpl).get("link"):
                         p.link = clean_arg_value(x)
                 elif m := FLAG_TEMPLATE_PATTERN.match(name):
                     p.flag = m.group(1)
@@ -704,7 +868,7 @@ class TournamentConverter:
                     else:
                         p.name = c.plain_text().strip().removeprefix("|").lstrip()
                 elif name in ("Flag", "FlagNoLink"):
-                    p.flag = clean_arg_value(tpl.get_arg("1"))
+                    p.flag = self.args(tpl).value("1")
                     if c.wikilinks:
                         link = c.wikilinks[0]
                         if link.text is not None:
@@ -715,7 +879,7 @@ class TournamentConverter:
                     else:
                         p.name = c.plain_text().strip().removeprefix("|").lstrip()
                 elif name in ("RaceColorClass", "RaceIconSmall", "RaceColor2", "RaceIcon"):
-                    race = clean_arg_value(tpl.get_arg("1"))[0].lower()
+                    race = self.args(tpl).value("1")[0].lower()
                     race = RACES.get(race, race)
                     for race_index in range(real_col, next_real_col):
                         if race == "r" and "Unknown" in val:
@@ -782,11 +946,13 @@ class TournamentConverter:
         for section in sections:
             self.add_participants(section.participants)
         if table.comments:
-            self.info += '<div class="warning">⚠️ Comments in participant table may be lost</div>'
+            self.warn("Participant table", "", "comments-lost", "Comments in participant table may be lost")
 
         # Set the notes property for players with asterisks
         if players_with_asterisk:
-            self.info += '<div class="warning">⚠️ Asterisks converted to notes in participant table</div>'
+            self.warn(
+                "Participant table", "", "asterisks-to-notes", "Asterisks converted to notes in participant table"
+            )
             # Find the note number of each asterisk count
             asterisk_note_numbers = {}
             for asterisk_count in sorted(set(players_with_asterisk.values())):
@@ -797,10 +963,10 @@ class TournamentConverter:
                 asterisk_note_numbers[asterisk_count] = n
             # Set the note property for the players
             for link, asterisk_count in players_with_asterisk.items():
-                self.participants_by_link[link].notes.append(str(asterisk_note_numbers[asterisk_count]))
+                self.participants.by_link[link].notes.append(str(asterisk_note_numbers[asterisk_count]))
         # Set the notes property for players with refs
         if players_with_ref:
-            self.info += '<div class="warning">⚠️ Refs converted to notes in participant table</div>'
+            self.warn("Participant table", "", "refs-to-notes", "Refs converted to notes in participant table")
             # Find the note number of each ref
             ref_note_numbers = {}
             for n, ref_name in enumerate(refs.keys(), start=1):
@@ -811,7 +977,7 @@ class TournamentConverter:
             # Set the note property for the players
             for link, ref_names in players_with_ref.items():
                 for ref_name in ref_names:
-                    self.participants_by_link[link].notes.append(str(ref_note_numbers[ref_name]))
+                    self.participants.by_link[link].notes.append(str(ref_note_numbers[ref_name]))
             # Build the text to append to the template
             refs_appendix = "\n" + "<br/>\n".join(
                 "{{Note|" + str(ref_note_numbers[ref_name]) + "|" + ref_text + "}}"
@@ -848,14 +1014,24 @@ class TournamentConverter:
         for section in sections:
             if not section.participants:
                 if section.title:
-                    self.info += f'<div class="warning">⚠️ Titled section without players in participant table</div>'
+                    self.warn(
+                        "Participant table",
+                        "",
+                        "empty-section",
+                        "Titled section without players in participant table",
+                    )
                 else:
                     continue
 
             use_participant_section_template = bool(section.title)
             if len(sections) > 1 and not use_participant_section_template:
                 use_participant_section_template = True
-                self.info += f'<div class="warning">⚠️ Title needed for untitled section in participant table</div>'
+                self.warn(
+                    "Participant table",
+                    "",
+                    "untitled-section",
+                    "Title needed for untitled section in participant table",
+                )
 
             if use_participant_section_template:
                 result += f"|{{{{ParticipantSection|title={section.title}\n"
@@ -898,7 +1074,7 @@ class TournamentConverter:
     def convert_prize_pool_start(self, tpl: wtp.Template) -> str | None:
         start_texts, end_texts = self.arguments_to_texts(PRIZE_POOL_START_ARGUMENTS, tpl)
 
-        self.prize_pool_localcurrency = clean_arg_value(tpl.get_arg("localcurrency"))
+        self.prize_pool_localcurrency = self.args(tpl).value("localcurrency")
         if self.prize_pool_localcurrency:
             if self.prize_pool_localcurrency.lower() in ("pcnt", "percent"):
                 start_texts.append(f"|percentage=1")
@@ -911,8 +1087,8 @@ class TournamentConverter:
         self.prize_pool_point_indexes_with_suffix: list[int] = []
         self.prize_pool_freetext: list[str] = []
         self.prize_pool_hardware_point_index = None
-        for x in tpl.arguments:
-            arg_name = x.name.strip()
+        for name, x in self.args(tpl).items:
+            arg_name = name.strip()
             if m := PRIZE_POOL_POINTS_ARG_PATTERN.match(arg_name):
                 arg_val = clean_arg_value(x)
                 point_index = int(m[1]) if m[1] else 1
@@ -938,12 +1114,12 @@ class TournamentConverter:
         if (
             self.options["prize_pool_import"] == "false"
             and self.prize_pool_type != "Award"
-            and not self.read_bool(clean_arg_value(tpl.get_arg("lpdb")))
+            and not self.read_bool(self.args(tpl).value("lpdb"))
         ):
             texts.append(f"|import=false")
         elif self.options["prize_pool_import"] == "fixed_limit":
             texts.append(f"|importLimit={self.options['prize_pool_import_fixed_limit_val']}")
-        elif (x := tpl.get_arg("importLimit")) and (limit := clean_arg_value(x)):
+        elif (x := self.args(tpl).get("importLimit")) and (limit := clean_arg_value(x)):
             texts.append(f"|importLimit={limit}")
         elif self.options["prize_pool_import"] == "guess_limit":
             texts.append(f"|importLimit=%@%£%$%")
@@ -954,13 +1130,14 @@ class TournamentConverter:
         self.prize_slots = []
         self.prize_pool_max_placement = 0
         self.prize_pool_qual_tuples: list[tuple[str, str]] = []
-        self.prize_pool_noprize = self.read_bool(clean_arg_value(tpl.get_arg("noprize")))
+        self.prize_pool_noprize = self.read_bool(self.args(tpl).value("noprize"))
         self.prize_pool_points_used: set[int] = set()
 
     def convert_prize_pool_slot(self, tpl: wtp.Template) -> tuple[str | None, int, list[str], list[str]] | None:
         texts: list[str] = []
         is_award = self.prize_pool_type == "Award"
-        args = {x.name.strip(): clean_arg_value(x) for x in tpl.arguments}
+        arguments = self.args(tpl)
+        args = {name.strip(): clean_arg_value(x) for name, x in arguments.items}
         warning_info = f"[{self.prize_pool_type} prize pool]"
 
         start_texts, end_texts = self.arguments_to_texts(PRIZE_POOL_SLOT_ARGUMENTS, tpl)
@@ -1011,26 +1188,26 @@ class TournamentConverter:
                     read_prize_pool_opponent_args(opp, args, i, "", self.prize_pool_type)
                 if self.options["prize_pool_opponent_last_results"]:
                     read_prize_pool_opponent_args(opp, args, i, "lastvs", self.prize_pool_type)
-                    if (x := tpl.get_arg(f"lastscore{i}")) or (i == 1 and (x := tpl.get_arg(f"lastscore"))):
+                    if (x := arguments.get(f"lastscore{i}")) or (i == 1 and (x := arguments.get(f"lastscore"))):
                         opp.lastscore = clean_arg_value(x)
-                    if (x := tpl.get_arg(f"lastvsscore{i}")) or (i == 1 and (x := tpl.get_arg(f"lastvsscore"))):
+                    if (x := arguments.get(f"lastvsscore{i}")) or (i == 1 and (x := arguments.get(f"lastvsscore"))):
                         opp.lastvsscore = clean_arg_value(x)
-                    if (x := tpl.get_arg(f"woto{i}")) or (i == 1 and (x := tpl.get_arg(f"woto"))):
+                    if (x := arguments.get(f"woto{i}")) or (i == 1 and (x := arguments.get(f"woto"))):
                         opp.woto = self.read_bool(clean_arg_value(x))
-                    if (x := tpl.get_arg(f"wofrom{i}")) or (i == 1 and (x := tpl.get_arg(f"wofrom"))):
+                    if (x := arguments.get(f"wofrom{i}")) or (i == 1 and (x := arguments.get(f"wofrom"))):
                         opp.wofrom = self.read_bool(clean_arg_value(x))
-                    if (x := tpl.get_arg(f"wdl{i}")) or (i == 1 and (x := tpl.get_arg(f"wdl"))):
+                    if (x := arguments.get(f"wdl{i}")) or (i == 1 and (x := arguments.get(f"wdl"))):
                         opp.wdl = clean_arg_value(x)
                 if not self.prize_pool_noprize:
-                    if x := tpl.get_arg(f"usdprize{i}"):
+                    if x := arguments.get(f"usdprize{i}"):
                         opp.usdprize = clean_arg_value(x)
-                    if x := tpl.get_arg(f"localprize{i}"):
+                    if x := arguments.get(f"localprize{i}"):
                         opp.localprize = clean_arg_value(x)
                 for j in self.prize_pool_points.keys():
-                    if (x := tpl.get_arg(f"{j}points{i}")) or (j == 1 and (x := tpl.get_arg(f"points{i}"))):
+                    if (x := arguments.get(f"{j}points{i}")) or (j == 1 and (x := arguments.get(f"points{i}"))):
                         opp.points[j] = clean_arg_value(x)
                 if (is_award or self.options["prize_pool_opponent_last_results"]) and (
-                    x := tpl.get_arg(f"date{i}") or tpl.get_arg(f"date{i}")
+                    x := arguments.get(f"date{i}") or arguments.get(f"date{i}")
                 ):
                     opp.date = clean_arg_value(x)
 
@@ -1043,20 +1220,38 @@ class TournamentConverter:
                     text += "}}"
                     if opp.woto:
                         if opp.lastscore or opp.lastvsscore:
-                            self.info += f'<div class="warning">⚠️ {warning_info}[opp={i}] woto AND last score both defined</div>'
+                            self.warn(
+                                "Prize pool",
+                                "",
+                                "woto-and-last-score",
+                                f"{warning_info}[opp={i}] woto AND last score both defined",
+                            )
                         text += f"|lastvsscore=L-W"
                     elif opp.wofrom:
                         if opp.lastscore or opp.lastvsscore:
-                            self.info += f'<div class="warning">⚠️ {warning_info}[opp={i}] wofrom AND last score both defined</div>'
+                            self.warn(
+                                "Prize pool",
+                                "",
+                                "wofrom-and-last-score",
+                                f"{warning_info}[opp={i}] wofrom AND last score both defined",
+                            )
                         text += f"|lastvsscore=W-L"
                     elif opp.lastscore and opp.lastvsscore:
                         text += f"|lastvsscore={opp.lastscore}-{opp.lastvsscore}"
                     elif opp.lastscore or opp.lastvsscore:
-                        self.info += (
-                            f'<div class="warning">⚠️ {warning_info}[opp={i}] last score is partially defined</div>'
+                        self.warn(
+                            "Prize pool",
+                            "",
+                            "partial-last-score",
+                            f"{warning_info}[opp={i}] last score is partially defined",
                         )
                 elif opp.woto or opp.wofrom or opp.lastscore or opp.lastvsscore:
-                    self.info += f'<div class="warning">⚠️ {warning_info}[opp={i}] last score is defined but not the opponent</div>'
+                    self.warn(
+                        "Prize pool",
+                        "",
+                        "last-score-without-opponent",
+                        f"{warning_info}[opp={i}] last score is defined but not the opponent",
+                    )
                 if opp.usdprize:
                     text += f"|usdprize={opp.usdprize}"
                 if opp.localprize and (
@@ -1106,9 +1301,11 @@ class TournamentConverter:
         if points_name == "seed":
             if val in ("0", "-"):
                 return None
-            self.info += (
-                f'<div class="warning">⚠️ [{self.prize_pool_type} prize pool] Raw value'
-                f" in 'seed' column ({val})</div>"
+            self.warn(
+                "Prize pool",
+                "",
+                "raw-seed-value",
+                f"[{self.prize_pool_type} prize pool] Raw value in 'seed' column ({val})",
             )
             if "Seed" in self.prize_pool_freetext:
                 freetext_index = self.prize_pool_freetext.index("Seed") + 1
@@ -1136,8 +1333,11 @@ class TournamentConverter:
         if points_name in ("pcnt", "percent"):
             return f"|percentage={val.removesuffix('%').rstrip()}"
         if PRIZE_POOL_NUMERIC_POINT_PATTERN.match(val) is None:
-            self.info += (
-                f'<div class="warning">⚠️ [{self.prize_pool_type} prize pool] Non-numeric point value ({val})</div>'
+            self.warn(
+                "Prize pool",
+                "",
+                "non-numeric-points",
+                f"[{self.prize_pool_type} prize pool] Non-numeric point value ({val})",
             )
 
         if i is not None:
@@ -1196,7 +1396,9 @@ class TournamentConverter:
                         PRIZE_POOL_SLOT_OPPONENT_SUB(rf"\1{specific_string}", opp_text) for opp_text in opp_texts
                     ]
 
-                self.info += f'<div class="warning">⚠️ {warning_info} Merged slots with common place {slot_place}</div>'
+                self.warn(
+                    "Prize pool", "", "merged-slots", f"{warning_info} Merged slots with common place {slot_place}"
+                )
 
             slot_opp_count = len(slot_opp_texts)
 
@@ -1214,7 +1416,7 @@ class TournamentConverter:
             )
             if check_count and slot_expected_opp_count != 256 and slot_opp_count != slot_expected_opp_count:
                 word = "More" if slot_opp_count > slot_expected_opp_count else "Fewer"
-                self.info += f'<div class="warning">⚠️ {warning_info} {word} opponents than the slot capacity</div>'
+                self.warn("Prize pool", "", "slot-capacity", f"{warning_info} {word} opponents than the slot capacity")
 
             prize_pool_slot_texts.append("|{{Slot" + "".join(slot_texts) + "}}")
 
@@ -1222,7 +1424,7 @@ class TournamentConverter:
         self.prize_pool_text += "\n}}"
 
         prize_pool_end_pos = tpl.span[1]
-        self.changes.append((self.prize_pool_start_pos, prize_pool_end_pos, self.prize_pool_text))
+        self.changes.add(self.prize_pool_start_pos, prize_pool_end_pos, self.prize_pool_text)
         self.counter[f"{self.prize_pool_type} prize pool"] += 1
 
     def convert_match_summary(self, tpl: wtp.Template) -> list[str] | None:
@@ -1230,13 +1432,13 @@ class TournamentConverter:
         texts: list[str] = []
 
         for i, player in enumerate(players, start=1):
-            if x := tpl.get_arg(str(i)):
+            if x := self.args(tpl).get(str(i)):
                 player.name = clean_arg_value(x)
-            if x := tpl.get_arg(f"link{i}"):
+            if x := self.args(tpl).get(f"link{i}"):
                 player.link = clean_arg_value(x)
-            if x := tpl.get_arg(f"flag{i}"):
+            if x := self.args(tpl).get(f"flag{i}"):
                 player.flag = clean_arg_value(x)
-            if x := tpl.get_arg(f"race{i}"):
+            if x := self.args(tpl).get(f"race{i}"):
                 player.race = clean_arg_value(x)
             if player.name:
                 found, offrace = self.look_for_player(player)
@@ -1251,13 +1453,13 @@ class TournamentConverter:
         start_texts, end_texts = self.arguments_to_texts(MATCH_SUMMARY_ARGUMENTS, tpl)
         texts += start_texts
 
-        if not tpl.get_arg("bestof"):
+        if not self.args(tpl).get("bestof"):
             texts.append("|bestof=3")
 
         i = 1
         has_set_map = False
         while True:
-            x = tpl.get_arg(f"map{i}")
+            x = self.args(tpl).get(f"map{i}")
             if x:
                 map_ = clean_arg_value(x)
                 if m := PIPE_PATTERN.match(map_):
@@ -1271,7 +1473,7 @@ class TournamentConverter:
             else:
                 map_ = ""
                 map_display_name = ""
-            x_win = tpl.get_arg(f"win{i}")
+            x_win = self.args(tpl).get(f"win{i}")
             if x or x_win:
                 winner = clean_arg_value(x_win)
                 winner = "" if winner == "0" else winner
@@ -1285,10 +1487,10 @@ class TournamentConverter:
                 break
 
         veto_index = 1
-        if x := tpl.get_arg("veto1"):
+        if x := self.args(tpl).get("veto1"):
             texts.append(f"|veto1={clean_arg_value(x)}|vetoplayer1=1")
             veto_index = 2
-        if x := tpl.get_arg("veto2"):
+        if x := self.args(tpl).get("veto2"):
             texts.append(f"|veto{veto_index}={clean_arg_value(x)}|vetoplayer{veto_index}=2")
 
         texts += end_texts
@@ -1296,7 +1498,8 @@ class TournamentConverter:
         return tpl.span, has_set_map, players, texts
 
     def convert_team_match(self, tpl: wtp.Template, opponents: tuple[str] | None = None) -> str | None:
-        self.tm_args = clean_arguments(tpl)
+        # Cleaned values are cached by the view, which is shared by all the conversions of the template
+        self.tm_args = self.args(tpl)
 
         # Get players
         self.tm_has_set_map = False
@@ -1304,52 +1507,60 @@ class TournamentConverter:
         maps: list[str] = []
         self.tm_players: list[dict[str, MatchPlayer]] = [{}, {}]
         game_index = 1
-        for i in range(1, 101):
+        # Only the games with arguments are checked, in the order of their index
+        game_numbers = sorted({int(m[1]) for _, m in filter_template_args(self.tm_args, TEAM_MATCH_GAME_ARG_PATTERN)})
+        for i in (i for i in game_numbers if i <= 100):
             if (
-                self.tm_args.get(f"m{i}win")
-                or self.tm_args.get(f"m{i}p1")
-                or self.tm_args.get(f"m{i}map")
-                or self.tm_args.get(f"m{i}p2")
+                self.tm_args.value(f"m{i}win")
+                or self.tm_args.value(f"m{i}p1")
+                or self.tm_args.value(f"m{i}map")
+                or self.tm_args.value(f"m{i}p2")
             ):
                 maps.append(self.convert_team_match_helper(f"m{i}", str(i), game_index))
                 game_index += 1
 
         if (
-            self.tm_args.get(f"acewin")
-            or self.tm_args.get(f"acep1")
-            or self.tm_args.get(f"acemap")
-            or self.tm_args.get(f"acep2")
+            self.tm_args.value(f"acewin")
+            or self.tm_args.value(f"acep1")
+            or self.tm_args.value(f"acemap")
+            or self.tm_args.value(f"acep2")
         ):
             maps.append(self.convert_team_match_helper(f"ace", "ace", game_index))
             game_index += 1
         for i in range(1, 4):
             if (
-                self.tm_args.get(f"ace{i}win")
-                or self.tm_args.get(f"ace{i}p1")
-                or self.tm_args.get(f"ace{i}map")
-                or self.tm_args.get(f"ace{i}p2")
+                self.tm_args.value(f"ace{i}win")
+                or self.tm_args.value(f"ace{i}p1")
+                or self.tm_args.value(f"ace{i}map")
+                or self.tm_args.value(f"ace{i}p2")
             ):
                 maps.append(self.convert_team_match_helper(f"ace{i}", f"ace{i}", game_index))
                 game_index += 1
             else:
                 break
 
-        # Get opponents (if not given as argument)
+        # Get opponents (if not given as argument), with the arguments they are read from
+        opponent_args: list[wtp.Argument | None] = [None, None]
         if not opponents:
-            opponents = tuple(
-                FLAG_TEAM_PATTERN.sub(
-                    "",
-                    self.tm_args.get(f"team{i}")
-                    or self.tm_args.get(f"team{i}short")
-                    or self.tm_args.get(f"team{i}literal")
-                    or "",
+            opponents = ()
+            for i in range(1, 3):
+                name = next(
+                    (name for name in (f"team{i}", f"team{i}short", f"team{i}literal") if self.tm_args.value(name)),
+                    None,
                 )
-                for i in range(1, 3)
-            )
-        opponents = tuple(self.team_aliases.get(opponent.lower(), opponent) for opponent in opponents)
+                opponent_args[i - 1] = self.tm_args.get(name) if name else None
+                opponents += (FLAG_TEAM_PATTERN.sub("", self.tm_args.value(name) if name else ""),)
+        aliased_opponents = tuple(self.team_aliases.get(opponent.lower(), opponent) for opponent in opponents)
         opponent_texts = []
-        for i, opponent in enumerate(opponents, start=1):
-            opp_players = find_player_templates(wtp.parse(opponent))
+        for i, (opponent, aliased_opponent) in enumerate(zip(opponents, aliased_opponents), start=1):
+            if "{{" not in aliased_opponent:
+                opp_players = []
+            elif aliased_opponent == opponent and opponent_args[i - 1] is not None:
+                # The templates of the opponent are those of its argument, already parsed with the page
+                opp_players = find_player_templates(opponent_args[i - 1])
+            else:
+                opp_players = find_player_templates(wtp.parse(aliased_opponent))
+            opponent = aliased_opponent
             if 0 < len(opp_players) < 5:
                 # For teams that are actually 1, 2, 3 or 4 player templates
                 opponent = "&".join(sorted(player.name for player in opp_players))
@@ -1367,7 +1578,7 @@ class TournamentConverter:
                     players_text = "|p1=TBD"
                 if players_text:
                     opponent_text += f"|players={{{{Players{players_text}}}}}"
-            if score := self.tm_args.get(f"team{i}score"):
+            if score := self.tm_args.value(f"team{i}score"):
                 opponent_text += f"|score={score}"
             opponent_text += "}}"
             opponent_texts.append(opponent_text)
@@ -1381,32 +1592,32 @@ class TournamentConverter:
             text += f"|dateheader=true" + "\n"
         text += f"|opponent1={opponent_texts[0]}" + "\n"
         text += f"|opponent2={opponent_texts[1]}"
-        if winner := self.tm_args.get("teamwin"):
+        if winner := self.tm_args.value("teamwin"):
             text += "\n" + f"|winner={winner}"
         if maps:
             text += "\n" + "\n".join(f"|map{i}={text}" for i, text in enumerate(maps, start=1))
         if end_texts:
             text += "\n" + "\n".join(end_texts)
-        return tpl.span, self.tm_has_set_map, tuple(opp.lower() for opp in opponents), text
+        return tpl.span, self.tm_has_set_map, tuple(opp.lower() for opp in aliased_opponents), text
 
     def convert_team_match_helper(self, prefix: str, original_game_index: str, game_index: int) -> str:
         text = ""
         scores = ["", ""]
         for j in range(1, 3):
             player_prefixes = [f"{prefix}p{j}"]
-            if self.tm_args.get("2v2") == original_game_index:
+            if self.tm_args.value("2v2") == original_game_index:
                 player_prefixes.append(f"2v2p{j}")
             else:
                 player_prefixes += [f"{prefix}t{j}p{k}" for k in range(2, 5)]
 
             for k, player_prefix in enumerate(player_prefixes, start=1):
                 player = MatchPlayer()
-                player.name = self.tm_args.get(player_prefix, "")
-                player.link = self.tm_args.get(f"{player_prefix}link", "")
+                player.name = self.tm_args.value(player_prefix)
+                player.link = self.tm_args.value(f"{player_prefix}link")
                 if player.link in ("false", "true"):
                     player.link = ""
-                player.flag = self.tm_args.get(f"{player_prefix}flag", "")
-                player.race = self.tm_args.get(f"{player_prefix}race", "").lower()
+                player.flag = self.tm_args.value(f"{player_prefix}flag")
+                player.race = self.tm_args.value(f"{player_prefix}race").lower()
                 if k == 1 and not player.name:
                     player.name = "TBD"
 
@@ -1437,11 +1648,9 @@ class TournamentConverter:
                 for k_increment, player in enumerate(players):
                     if player.name:
                         # Look for an alias
-                        if (ptuple := (player.name, player.flag, player.race)) in self.tm_player_aliases:
-                            print(
-                                f"Alias {self.tm_player_aliases[ptuple]} for {player.name} (flag={player.flag}, race={player.race})"
-                            )
-                            player.link = self.tm_player_aliases[ptuple]
+                        if (alias := self.participants.alias(player.name, player.flag, player.race)) is not None:
+                            print(f"Alias {alias} for {player.name} (flag={player.flag}, race={player.race})")
+                            player.link = alias
 
                         offrace = (
                             player.name in self.tm_players[j - 1]
@@ -1459,19 +1668,20 @@ class TournamentConverter:
                 if is_archon:
                     text += f"|opponent{j}archon=true|opponent{j}race={players[0].race}"
 
-            scores = [self.tm_args.get(f"{prefix}p{k}score", "") for k in range(1, 3)]
+            scores = [self.tm_args.value(f"{prefix}p{k}score") for k in range(1, 3)]
 
             if self.options["team_match_make_duos_archons"] and len(player_prefixes) == 2:
                 text += f"|opponent{j}archon=true|opponent{j}race={players[0].race}"
 
-        map = self.tm_args.get(f"{prefix}map") or ""
+        map = self.tm_args.value(f"{prefix}map")
         if m := PIPE_PATTERN.match(map):
             map = m.group(2)
         if map in ("TBD", "TBA"):
             map = ""
         if map:
             self.tm_has_set_map = True
-        winner = self.tm_args.get(f"{prefix}win")
+        # A missing winner is written as None
+        winner = self.tm_args.value(f"{prefix}win") if self.tm_args.get(f"{prefix}win") is not None else None
 
         if scores[0] and scores[1]:
             text = (
@@ -1480,12 +1690,12 @@ class TournamentConverter:
         else:
             text = f"{{{{Map{text}|map={map}|winner={winner}"
         if (
-            vod := self.tm_args.get(f"vod{game_index}")
-            or self.tm_args.get(f"vodgame{game_index}")
-            or self.tm_args.get(f"m{game_index}vod")
+            vod := self.tm_args.value(f"vod{game_index}")
+            or self.tm_args.value(f"vodgame{game_index}")
+            or self.tm_args.value(f"m{game_index}vod")
         ):
             text += f"|vod={vod}"
-        if walkover := self.tm_args.get(f"{prefix}walkover"):
+        if walkover := self.tm_args.value(f"{prefix}walkover"):
             text += f"|walkover={walkover}"
         text += "}}"
 
@@ -1500,7 +1710,7 @@ class TournamentConverter:
 
         info_id_text = f"[Matchlist {self.match_list_id}][M{len(self.match_list_matches) + 1}]"
         if tpl.comments:
-            self.info += f'<div class="warning">⚠️ {info_id_text} Comments will be lost</div>'
+            self.warn("Matchlist", self.match_list_id, "comments-lost", f"{info_id_text} Comments will be lost")
 
         # Parse maps first
         map_texts = []
@@ -1510,8 +1720,8 @@ class TournamentConverter:
         has_a_non_empty_map = False
         i = 1
         while True:
-            x = tpl.get_arg(f"map{i}")
-            x_win = tpl.get_arg(f"map{i}win")
+            x = self.args(tpl).get(f"map{i}")
+            x_win = self.args(tpl).get(f"map{i}win")
             if not (x or x_win):
                 break
 
@@ -1526,9 +1736,11 @@ class TournamentConverter:
             if map_winner == "draw":
                 map_winner = "0"
             elif map_winner and map_winner not in ("0", "1", "2", "skip"):
-                self.info += (
-                    f'<div class="warning">⚠️ {info_id_text} Map {i} winner is {map_winner}'
-                    " (expected 0, 1, 2, skip or draw)</div>"
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "unexpected-map-winner",
+                    f"{info_id_text} Map {i} winner is {map_winner} (expected 0, 1, 2, skip or draw)",
                 )
 
             map_text = f"|map{i}={{{{Map"
@@ -1542,7 +1754,7 @@ class TournamentConverter:
                 map_text += f"{map_map_text}{map_winner_text}"
             map_has_race = False
             for j in (1, 2):
-                if x := tpl.get_arg(f"map{i}p{j}race"):
+                if x := self.args(tpl).get(f"map{i}p{j}race"):
                     map_has_race = True
                     map_text += f"|t{j}p1race={clean_arg_value(x)}"
 
@@ -1551,9 +1763,7 @@ class TournamentConverter:
                 # Reset empty_map_index
                 empty_map_index = None
                 # Only include VOD to a Map template with data
-                if self.options["match_maps_move_vodgames_to_map"] and (
-                    vod := clean_arg_value(tpl.get_arg(f"vodgame{i}"))
-                ):
+                if self.options["match_maps_move_vodgames_to_map"] and (vod := self.args(tpl).value(f"vodgame{i}")):
                     map_text += f"|vod={vod}"
                     vodgames_moved_to_map.append(i)
             elif empty_map_index is None:
@@ -1571,12 +1781,12 @@ class TournamentConverter:
         if empty_map_index is not None:
             map_texts = map_texts[: empty_map_index - 1]
 
-        is_walkover_set = clean_arg_value(tpl.get_arg("walkover")) in ("0", "1", "2")
+        is_walkover_set = self.args(tpl).value("walkover") in ("0", "1", "2")
 
         i = 1
         while True:
-            x = tpl.get_arg(f"veto{i}")
-            x_player = tpl.get_arg(f"vetoplayer{i}")
+            x = self.args(tpl).get(f"veto{i}")
+            x_player = self.args(tpl).get(f"vetoplayer{i}")
             if x or x_player:
                 map_texts.append(f"|veto{i}={clean_arg_value(x)} |vetoplayer{i}={clean_arg_value(x_player)}")
                 i += 1
@@ -1585,17 +1795,17 @@ class TournamentConverter:
 
         # Parse players
         for i, player in enumerate(players, start=1):
-            if x := tpl.get_arg(f"player{i}"):
+            if x := self.args(tpl).get(f"player{i}"):
                 player.name = clean_arg_value(x)
-            if x := tpl.get_arg(f"playerlink{i}"):
+            if x := self.args(tpl).get(f"playerlink{i}"):
                 player.link = clean_arg_value(x)
                 if player.link in ("false", "true"):
                     player.link = ""
-            if x := tpl.get_arg(f"player{i}flag"):
+            if x := self.args(tpl).get(f"player{i}flag"):
                 player.flag = clean_arg_value(x)
-            if x := tpl.get_arg(f"player{i}race"):
+            if x := self.args(tpl).get(f"player{i}race"):
                 player.race = clean_arg_value(x)
-            if x := tpl.get_arg(f"p{i}score"):
+            if x := self.args(tpl).get(f"p{i}score"):
                 scores[i - 1] = clean_arg_value(x)
             if player.name:
                 if player.name == "BYE":
@@ -1625,10 +1835,12 @@ class TournamentConverter:
                     except ValueError:
                         pass
                     if map_texts and num_scores[i - 1] and map_scores[i - 1] != num_scores[i - 1]:
-                        self.info += (
-                            f'<div class="warning">⚠️ {info_id_text} Discrepancy between'
-                            f" map score {map_scores[i - 1]}"
-                            f" and score {scores[i - 1]} ({player.name})</div>"
+                        self.warn(
+                            "Matchlist",
+                            self.match_list_id,
+                            "score-discrepancy",
+                            f"{info_id_text} Discrepancy between map score {map_scores[i - 1]}"
+                            f" and score {scores[i - 1]} ({player.name})",
                         )
                 elif not map_texts and not is_walkover_set:
                     text += f"|score="
@@ -1645,12 +1857,15 @@ class TournamentConverter:
         is_walkover = is_walkover_set or set(scores) == {"W", "L"}
 
         # If the bestof argument exists and it has an integer value, then use it
-        if bestof := clean_arg_value(tpl.get_arg("bestof")):
+        if bestof := self.args(tpl).value("bestof"):
             try:
                 bestof = int(bestof)
             except ValueError:
-                self.info += (
-                    f'<div class="warning">⚠️ {info_id_text} Existing bestof is not a decimal integer value</div>'
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "invalid-bestof",
+                    f"{info_id_text} Existing bestof is not a decimal integer value",
                 )
             else:
                 match.bestof = bestof
@@ -1660,24 +1875,31 @@ class TournamentConverter:
         bestof = None
         if self.options["match_maps_guess_bestof"] and not is_walkover and None not in num_scores:
             if num_scores[0] == num_scores[1]:
-                self.info += (
-                    f'<div class="warning">⚠️ {info_id_text} bestof cannot be guessed'
-                    f" for score {'-'.join(str(n) for n in num_scores)}</div>"
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "bestof-not-guessed",
+                    f"{info_id_text} bestof cannot be guessed for score {'-'.join(str(n) for n in num_scores)}",
                 )
             else:
                 bestof = max(num_scores) * 2 - 1
                 if bestof != self.match_maps_prev_bestof:
                     match.bestof_is_set = True
                     if self.match_maps_prev_bestof is not None:
-                        self.info += (
-                            f'<div class="warning">⚠️ {info_id_text} Change of bestof'
-                            f" from {self.match_maps_prev_bestof} to {bestof}</div>"
+                        self.warn(
+                            "Matchlist",
+                            self.match_list_id,
+                            "bestof-changed",
+                            f"{info_id_text} Change of bestof from {self.match_maps_prev_bestof} to {bestof}",
                         )
                     self.match_maps_prev_bestof = bestof
         if match.bestof is not None:
             if bestof != match.bestof:
-                self.info += (
-                    f'<div class="warning">⚠️ {info_id_text} Guessed bestof ({bestof}) != arg bestof ({match.bestof})")'
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "bestof-mismatch",
+                    f"{info_id_text} Guessed bestof ({bestof}) != arg bestof ({match.bestof})",
                 )
         else:
             # By default, bestof is the same as previously
@@ -1688,12 +1910,15 @@ class TournamentConverter:
         if is_walkover:
             ignore_list.append("winner")
         elif match.bestof:
-            winner = clean_arg_value(tpl.get_arg("winner"))
+            winner = self.args(tpl).value("winner")
             if winner in ("1", "2"):
                 w = int(winner) - 1
                 if num_scores[w] < num_scores[1 - w]:
-                    self.info += (
-                        f'<div class="warning">⚠️ {info_id_text} bestof={match.bestof} => different winner</div>'
+                    self.warn(
+                        "Matchlist",
+                        self.match_list_id,
+                        "different-winner",
+                        f"{info_id_text} bestof={match.bestof} => different winner",
                     )
                 ignore_list.append("winner")
         for i in vodgames_moved_to_map:
@@ -1706,7 +1931,7 @@ class TournamentConverter:
                 break
         # Add vod from Match list start if there is one
         if self.match_list_vod:
-            if (x := tpl.get_arg("vod")) and clean_arg_value(x):
+            if (x := self.args(tpl).get("vod")) and clean_arg_value(x):
                 vodgame_index = max(vodgames_moved_to_map) + 1 if vodgames_moved_to_map else 1
                 match_list_vod_arg = f"vodgame{vodgame_index}"
             else:
@@ -1729,21 +1954,24 @@ class TournamentConverter:
 
         info_id_text = f"[Matchlist {self.match_list_id}][M{len(self.match_list_matches) + 1}]"
         if tpl.comments:
-            self.info += f'<div class="warning">⚠️ {info_id_text} Comments will be lost</div>'
+            self.warn("Matchlist", self.match_list_id, "comments-lost", f"{info_id_text} Comments will be lost")
 
         for i in range(1, 3):
-            if x := tpl.get_arg(f"team{i}"):
+            if x := self.args(tpl).get(f"team{i}"):
                 teams[i - 1] = clean_arg_value(x)
-            if x := tpl.get_arg(f"score{i}"):
+            if x := self.args(tpl).get(f"score{i}"):
                 scores[i - 1] = clean_arg_value(x)
 
         # If the bestof argument exists and it has an integer value, then use it
-        if bestof := clean_arg_value(tpl.get_arg("bestof")):
+        if bestof := self.args(tpl).value("bestof"):
             try:
                 bestof = int(bestof)
             except ValueError:
-                self.info += (
-                    f'<div class="warning">⚠️ {info_id_text} Existing bestof is not a decimal integer value</div>'
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "invalid-bestof",
+                    f"{info_id_text} Existing bestof is not a decimal integer value",
                 )
             else:
                 match.bestof = bestof
@@ -1758,24 +1986,31 @@ class TournamentConverter:
                 pass
             else:
                 if num_scores[0] == num_scores[1]:
-                    self.info += (
-                        f'<div class="warning">⚠️ {info_id_text} bestof cannot be guessed'
-                        f" for score {'-'.join(scores)}</div>"
+                    self.warn(
+                        "Matchlist",
+                        self.match_list_id,
+                        "bestof-not-guessed",
+                        f"{info_id_text} bestof cannot be guessed for score {'-'.join(scores)}",
                     )
                 else:
                     bestof = max(num_scores) * 2 - 1
                     if bestof != self.match_maps_prev_bestof:
                         match.bestof_is_set = True
                         if self.match_maps_prev_bestof is not None:
-                            self.info += (
-                                f'<div class="warning">⚠️ {info_id_text} Change of bestof'
-                                f" from {self.match_maps_prev_bestof} to {bestof}</div>"
+                            self.warn(
+                                "Matchlist",
+                                self.match_list_id,
+                                "bestof-changed",
+                                f"{info_id_text} Change of bestof from {self.match_maps_prev_bestof} to {bestof}",
                             )
                         self.match_maps_prev_bestof = bestof
         if match.bestof is not None:
             if bestof != match.bestof:
-                self.info += (
-                    f'<div class="warning">⚠️ {info_id_text} Guessed bestof ({bestof}) != arg bestof ({match.bestof})")'
+                self.warn(
+                    "Matchlist",
+                    self.match_list_id,
+                    "bestof-mismatch",
+                    f"{info_id_text} Guessed bestof ({bestof}) != arg bestof ({match.bestof})",
                 )
         else:
             # By default, bestof is the same as previously
@@ -1786,9 +2021,9 @@ class TournamentConverter:
             ignore_list.append("winner")
         start_texts, end_texts = self.arguments_to_texts(MATCH_MAPS_TEAM_ARGUMENTS, tpl, ignore_list)
 
-        if x := tpl.get_arg("details"):
+        if x := self.args(tpl).get("details"):
             try:
-                btm_tpl = next(t for t in x.templates if t.normal_name(capitalize=True) == "BracketTeamMatch")
+                btm_tpl = next(t for t in x.templates if self.template_names[t.span] == "BracketTeamMatch")
             except StopIteration:
                 print(f"No BracketTeamMatch in details for {teams[0]} vs {teams[1]}")
                 for i in range(1, 3):
@@ -1815,39 +2050,45 @@ class TournamentConverter:
         return match
 
     def convert_bracket(self, tpl: wtp.Template) -> str | None:
-        bracket_name = clean_arg_value(tpl.get_arg("1"))
-        legacy_bracket_name = clean_arg_value(tpl.get_arg("2"))
-        id_ = clean_arg_value(tpl.get_arg("id"))
+        bracket_name = self.args(tpl).value("1")
+        legacy_bracket_name = self.args(tpl).value("2")
+        id_ = self.args(tpl).value("id")
 
         if not bracket_name or not legacy_bracket_name:
-            self.warn("Bracket", id_, " Empty argument 1 or 2")
+            self.warn("Bracket", id_, "empty-bracket-name", "Empty argument 1 or 2")
             return None
 
-        if legacy_bracket_name in BRACKET_NEW_NAMES and bracket_name != BRACKET_NEW_NAMES[legacy_bracket_name]:
-            self.warn("Bracket", id_, f" Mismatch between {bracket_name} and legacy bracket {legacy_bracket_name}")
+        tables = bracket_tables()
+        if legacy_bracket_name in tables.new_names and bracket_name != tables.new_names[legacy_bracket_name]:
+            self.warn(
+                "Bracket",
+                id_,
+                "bracket-name-mismatch",
+                f"Mismatch between {bracket_name} and legacy bracket {legacy_bracket_name}",
+            )
 
         if self.options["bracket_identify_by_arg_1"]:
-            if bracket_name in BRACKET_LEGACY_NAMES:
-                legacy_bracket_name = BRACKET_LEGACY_NAMES[bracket_name]
+            if bracket_name in tables.legacy_names:
+                legacy_bracket_name = tables.legacy_names[bracket_name]
             else:
-                self.warn("Bracket", id_, f" Bracket {bracket_name} unknown")
+                self.warn("Bracket", id_, "unknown-bracket", f"Bracket {bracket_name} unknown")
                 return None
 
-        if legacy_bracket_name not in BRACKETS:
-            self.warn("Bracket", id_, f' Bracket "{legacy_bracket_name}" unknown')
+        if legacy_bracket_name not in tables.brackets:
+            self.warn("Bracket", id_, "unknown-bracket", f'Bracket "{legacy_bracket_name}" unknown')
             return None
 
-        conversion = BRACKETS[legacy_bracket_name]
+        definition = tables.brackets[legacy_bracket_name]
         bracket_texts = self.arguments_to_texts(BRACKET_ARGUMENTS, tpl)
 
         # Look for unknown args
         unknown_args = []
-        for x in tpl.arguments:
-            arg_name = x.name.strip()
+        for name, x in self.args(tpl).items:
+            arg_name = name.strip()
             # Headers
             if m := LEGACY_ROUND_HEADER_PATTERN.match(arg_name):
-                if legacy_bracket_name in ROUND_HEADERS and arg_name in ROUND_HEADERS[legacy_bracket_name]:
-                    new_arg = ROUND_HEADERS[legacy_bracket_name][arg_name]
+                if arg_name in definition.round_headers:
+                    new_arg = definition.round_headers[arg_name]
                     new_value = clean_arg_value(x).replace("'''", "")
                     new_value = BO_PATTERN.sub("Bo\\1", new_value)
                     new_value = ABBR_BO_PATTERN.sub("Bo\\1", new_value)
@@ -1860,22 +2101,28 @@ class TournamentConverter:
             elif (
                 (m := LEGACY_PLAYER_PREFIX_PATTERN.match(arg_name))
                 or (m := LEGACY_GAME_DETAILS_PATTERN.match(arg_name))
-            ) and m.group(1) not in LEGACY_PLAYER_AND_GAME_PREFIXES[legacy_bracket_name]:
+            ) and m.group(1) not in definition.prefixes:
                 unknown_args.append(arg_name)
         if unknown_args:
-            self.warn("Bracket", id_, f" Argument(s) unknown ({len(unknown_args)}): {', '.join(unknown_args)}")
+            self.warn(
+                "Bracket",
+                id_,
+                "unknown-arguments",
+                f"Argument(s) unknown ({len(unknown_args)}): {', '.join(unknown_args)}",
+            )
 
         # Used for start-of-round breaks
-        prev_arguments = {x2.name.strip(): x1 for x1, x2 in zip(tpl.arguments, tpl.arguments[1:])}
+        items = self.args(tpl).items
+        prev_arguments = {name.strip(): x1 for (_, x1), (name, _) in zip(items, items[1:])}
 
-        is_single_block_bracket = bracket_name in SINGLE_BLOCK_BRACKETS
+        is_single_block_bracket = bracket_name in tables.single_block
         prev_round_number = ""
         is_new_round = True
         prev_bestof = None
         bracket_matches: dict[str, Match] = {}
         bestof_moves: list[BestofMove] = []
         bestof_sets: dict[str, int] = {}
-        for match_index, (match_id, (*player_prefixes, game_prefix)) in enumerate(conversion.items(), start=1):
+        for match_index, (match_id, player_prefixes, game_prefix) in enumerate(definition.matches, start=1):
             players = [MatchPlayer(), MatchPlayer()]
             match_texts0: list[str] = []
             match_texts1: list[str] = []
@@ -1912,29 +2159,34 @@ class TournamentConverter:
 
             elif (
                 not self.options["bracket_do_not_convert_details"]
-                and (x := tpl.get_arg(f"{game_prefix}details"))
+                and (x := self.args(tpl).get(f"{game_prefix}details"))
                 and x.templates
             ):
                 summary_tpl = x.templates[0]
                 for other_tpl in x.templates[1:]:
                     if other_tpl.span[0] > summary_tpl.span[1]:
-                        self.warn("Bracket", id_, f" Multiple templates in {game_prefix}details")
+                        self.warn("Bracket", id_, "multiple-details", f"Multiple templates in {game_prefix}details")
                         break
-                if summary_tpl.normal_name(capitalize=True) != "BracketMatchSummary":
-                    self.warn("Bracket", id_, f" Template in {game_prefix}details is not BracketMatchSummary")
+                if self.template_names[summary_tpl.span] != "BracketMatchSummary":
+                    self.warn(
+                        "Bracket",
+                        id_,
+                        "unexpected-details",
+                        f"Template in {game_prefix}details is not BracketMatchSummary",
+                    )
                 summary_texts, summary_end_texts = self.arguments_to_texts(
                     BRACKET_MATCH_SUMMARY_ARGUMENTS, summary_tpl
                 )
 
                 if any(ADVANTAGE_HINT_PATTERN.search(s) for t in (summary_texts, summary_end_texts) for s in t):
-                    self.warn("Bracket", id_, f" Possible advantage in {game_prefix}")
+                    self.warn("Bracket", id_, "possible-advantage", f"Possible advantage in {game_prefix}")
 
                 vodgames_moved_to_map = []
                 empty_map_index = None
                 i = 1
                 while True:
-                    x = summary_tpl.get_arg(f"map{i}")
-                    x_win = summary_tpl.get_arg(f"map{i}win") or summary_tpl.get_arg(f"win{i}")
+                    x = self.args(summary_tpl).get(f"map{i}")
+                    x_win = self.args(summary_tpl).get(f"map{i}win") or self.args(summary_tpl).get(f"win{i}")
                     if not (x or x_win):
                         break
 
@@ -1949,7 +2201,12 @@ class TournamentConverter:
                     if map_winner == "draw":
                         map_winner = "0"
                     elif map_winner and map_winner not in ("0", "1", "2", "skip"):
-                        self.warn("Bracket", id_, f" Map {i} winner is {map_winner} (expected 0, 1, 2, skip or draw)")
+                        self.warn(
+                            "Bracket",
+                            id_,
+                            "unexpected-map-winner",
+                            f"Map {i} winner is {map_winner} (expected 0, 1, 2, skip or draw)",
+                        )
 
                     map_text = f"|map{i}={{{{Map"
                     map_map_text = f"|map={map_}"
@@ -1962,7 +2219,7 @@ class TournamentConverter:
                         map_text += f"{map_map_text}{map_winner_text}"
                     map_has_race = False
                     for j in (1, 2):
-                        if x := summary_tpl.get_arg(f"map{i}p{j}race"):
+                        if x := self.args(summary_tpl).get(f"map{i}p{j}race"):
                             map_has_race = True
                             map_text += f"|t{j}p1race={clean_arg_value(x)}"
 
@@ -1972,7 +2229,7 @@ class TournamentConverter:
                         empty_map_index = None
                         # Only include VOD to a Map template with data
                         if self.options["bracket_move_vodgames_to_map"] and (
-                            vod := clean_arg_value(summary_tpl.get_arg(f"vodgame{i}"))
+                            vod := self.args(summary_tpl).value(f"vodgame{i}")
                         ):
                             map_text += f"|vod={vod}"
                             vodgames_moved_to_map.append(i)
@@ -1991,12 +2248,12 @@ class TournamentConverter:
                 if empty_map_index is not None:
                     map_texts = map_texts[: empty_map_index - 1]
 
-                is_walkover_set = clean_arg_value(tpl.get_arg("walkover")) in ("0", "1", "2")
+                is_walkover_set = self.args(tpl).value("walkover") in ("0", "1", "2")
 
                 i = 1
                 while True:
-                    x = summary_tpl.get_arg(f"veto{i}")
-                    x_player = summary_tpl.get_arg(f"vetoplayer{i}")
+                    x = self.args(summary_tpl).get(f"veto{i}")
+                    x_player = self.args(summary_tpl).get(f"vetoplayer{i}")
                     if x or x_player:
                         map_texts.append(f"|veto{i}={clean_arg_value(x)} |vetoplayer{i}={clean_arg_value(x_player)}")
                         i += 1
@@ -2014,12 +2271,17 @@ class TournamentConverter:
                 ]
 
                 # If the bestof argument exists and it has an integer value, then use it
-                if bestof := clean_arg_value(summary_tpl.get_arg("bestof")):
+                if bestof := self.args(summary_tpl).value("bestof"):
                     try:
                         bestof = int(bestof)
                     except ValueError:
                         # If the value is not an integer, then ignore it
-                        self.warn("Bracket", id_, f"[{match_id}] Existing bestof is not a decimal integer value")
+                        self.warn(
+                            "Bracket",
+                            id_,
+                            "invalid-bestof",
+                            f"[{match_id}] Existing bestof is not a decimal integer value",
+                        )
                     else:
                         match.bestof = bestof
                         match.bestof_is_set = True
@@ -2035,7 +2297,7 @@ class TournamentConverter:
 
             for i, (player, prefix) in enumerate(zip(players, player_prefixes), start=1):
                 comments = ""
-                if x := tpl.get_arg(prefix):
+                if x := self.args(tpl).get(prefix):
                     if x.comments:
                         comments = "".join(
                             comment.string
@@ -2043,29 +2305,31 @@ class TournamentConverter:
                             if "\n" not in x.string[len(x.name) + 2 : x.comments[0].span[0] - x.span[0]]
                         )
                     player.name = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}flag"):
+                if x := self.args(tpl).get(f"{prefix}flag"):
                     player.flag = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}race"):
+                if x := self.args(tpl).get(f"{prefix}race"):
                     player.race = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}score"):
+                if x := self.args(tpl).get(f"{prefix}score"):
                     scores[i - 1] = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}score2"):
+                if x := self.args(tpl).get(f"{prefix}score2"):
                     scores2[i - 1] = clean_arg_value(x)
-                    if match_index != len(conversion):
+                    if match_index != len(definition.matches):
                         self.warn(
                             "Bracket",
                             id_,
+                            "score2-unsupported",
                             f"[{match_id}] score2 for this match may not be supported correctly in this bracket",
                         )
-                if x := tpl.get_arg(f"{prefix}score3"):
+                if x := self.args(tpl).get(f"{prefix}score3"):
                     scores3[i - 1] = clean_arg_value(x)
-                    if match_index != len(conversion):
+                    if match_index != len(definition.matches):
                         self.warn(
                             "Bracket",
                             id_,
+                            "score3-unsupported",
                             f"[{match_id}] score3 for this match may not be supported correctly in this bracket",
                         )
-                if x := tpl.get_arg(f"{prefix}win"):
+                if x := self.args(tpl).get(f"{prefix}win"):
                     wins[i - 1] = clean_arg_value(x)
                 if player.name:
                     if player.name == "BYE":
@@ -2079,9 +2343,9 @@ class TournamentConverter:
                             elif offrace:
                                 text += f"|race={player.race}"
                         elif self.options["bracket_details"] == "keep":
-                            if tpl.get_arg(f"{prefix}flag"):
+                            if self.args(tpl).get(f"{prefix}flag"):
                                 text += f"|flag={player.flag}"
-                            if tpl.get_arg(f"{prefix}race"):
+                            if self.args(tpl).get(f"{prefix}race"):
                                 text += f"|race={player.race}"
 
                     text_reset = text
@@ -2101,6 +2365,7 @@ class TournamentConverter:
                             self.warn(
                                 "Bracket",
                                 id_,
+                                "score-discrepancy",
                                 f"[{match_id}] Discrepancy between"
                                 f" map score {map_scores[i - 1] + advantage}"
                                 f" and score {scores[i - 1]} ({player.name})",
@@ -2108,7 +2373,7 @@ class TournamentConverter:
                     elif not map_texts and not is_walkover_set:
                         text += f"|score="
                     if scores2[i - 1]:
-                        if match_index == len(conversion):
+                        if match_index == len(definition.matches):
                             # If this is the last match, move the second score to RxMBR
                             text_reset += f"|score={scores2[i - 1]}"
                         else:
@@ -2118,11 +2383,13 @@ class TournamentConverter:
                     text += "}}"
                     text_reset += "}}"
                     if comments:
-                        self.warn("Bracket", id_, f"[{match_id}] Comments moved to the end of the line")
+                        self.warn(
+                            "Bracket", id_, "comments-moved", f"[{match_id}] Comments moved to the end of the line"
+                        )
                         text += f" {comments}"
 
                     player_texts.append(text)
-                    if scores2[i - 1] and match_index == len(conversion):
+                    if scores2[i - 1] and match_index == len(definition.matches):
                         reset_match_texts.append(text_reset)
                 else:
                     # Empty opponent
@@ -2149,7 +2416,10 @@ class TournamentConverter:
                 if num_scores[0] == num_scores[1]:
                     if match_id != "RxMTP":
                         self.warn(
-                            "Bracket", id_, f"[{match_id}] bestof cannot be guessed for score {'-'.join(scores)}"
+                            "Bracket",
+                            id_,
+                            "bestof-not-guessed",
+                            f"[{match_id}] bestof cannot be guessed for score {'-'.join(scores)}",
                         )
                 else:
                     # We can compute bestof
@@ -2160,10 +2430,20 @@ class TournamentConverter:
                         if bestof_moves[-1].source is None:
                             bestof_moves[-1].source = match_id
                         if not is_new_round:
-                            self.warn("Bracket", id_, f"[{match_id}] Change of bestof from {prev_bestof} to {bestof}")
+                            self.warn(
+                                "Bracket",
+                                id_,
+                                "bestof-changed",
+                                f"[{match_id}] Change of bestof from {prev_bestof} to {bestof}",
+                            )
             if match.bestof is not None:
                 if bestof != match.bestof:
-                    self.warn("Bracket", id_, f"[{match_id}] Guessed bestof ({bestof}) != arg bestof ({match.bestof})")
+                    self.warn(
+                        "Bracket",
+                        id_,
+                        "bestof-mismatch",
+                        f"[{match_id}] Guessed bestof ({bestof}) != arg bestof ({match.bestof})",
+                    )
             else:
                 # By default, bestof is the same as previously
                 match.bestof = bestof or prev_bestof
@@ -2171,22 +2451,26 @@ class TournamentConverter:
             if "W" not in scores:
                 if wins[0] and not wins[1]:
                     if wins[0] != "1":
-                        self.warn("Bracket", id_, f"[{match_id}] {player_prefixes[0]}win={wins[0]}")
+                        self.warn("Bracket", id_, "unexpected-win", f"[{match_id}] {player_prefixes[0]}win={wins[0]}")
                     if players[1].name == "BYE" and scores[1] == "":
                         match_texts1.append("|walkover=1")
                     elif bestof is not None:
                         if scores[0] < scores[1]:
-                            self.warn("Bracket", id_, f"[{match_id}] bestof={bestof} => different winner")
+                            self.warn(
+                                "Bracket", id_, "different-winner", f"[{match_id}] bestof={bestof} => different winner"
+                            )
                     else:
                         match_texts1.append("|winner=1")
                 elif wins[1] and not wins[0]:
                     if wins[1] != "1":
-                        self.warn("Bracket", id_, f"[{match_id}] {player_prefixes[1]}win={wins[1]}")
+                        self.warn("Bracket", id_, "unexpected-win", f"[{match_id}] {player_prefixes[1]}win={wins[1]}")
                     if players[0].name == "BYE" and scores[0] == "":
                         match_texts1.append("|walkover=2")
                     elif bestof is not None:
                         if scores[0] > scores[1]:
-                            self.warn("Bracket", id_, f"[{match_id}] bestof={bestof} => different winner")
+                            self.warn(
+                                "Bracket", id_, "different-winner", f"[{match_id}] bestof={bestof} => different winner"
+                            )
                     else:
                         match_texts1.append("|winner=2")
                 else:
@@ -2222,7 +2506,7 @@ class TournamentConverter:
 
         # If all bestof are the same, keep only the first one
         if len(bestof_sets) > 1 and len(set(bestof_sets.values())) == 1:
-            self.warn("Bracket", id_, " Keep only the first |bestof=")
+            self.warn("Bracket", id_, "duplicate-bestof", "Keep only the first |bestof=")
             for i, match_id in enumerate(bestof_sets):
                 if i > 0:
                     bracket_matches[match_id].bestof_is_set = False
@@ -2235,7 +2519,9 @@ class TournamentConverter:
                 and bracket_matches[move.source].bestof_is_set
             ):
                 bestof = bracket_matches[move.source].bestof
-                self.warn("Bracket", id_, f" Move |bestof={bestof} from {move.source} to {move.destination}")
+                self.warn(
+                    "Bracket", id_, "bestof-moved", f"Move |bestof={bestof} from {move.source} to {move.destination}"
+                )
                 bracket_matches[move.destination].bestof = bestof
                 bracket_matches[move.source].bestof_is_set = False
                 bracket_matches[move.destination].bestof_is_set = True
@@ -2244,35 +2530,36 @@ class TournamentConverter:
             f"{match.header_string()}|{match_id}={match.string()}" for match_id, match in bracket_matches.items()
         ]
 
-        if clean_arg_value(tpl.get_arg("noDuplicateCheck")):
-            self.warn("Bracket", id_, " noDuplicateCheck used")
+        if self.args(tpl).value("noDuplicateCheck"):
+            self.warn("Bracket", id_, "no-duplicate-check", "noDuplicateCheck used")
 
         result = f"{{{{Bracket|{bracket_name}|id={id_}"
         if self.options["bracket_match_width"]:
             result += f"|matchWidth={self.options['bracket_match_width']}"
-        elif x := tpl.get_arg("column-width"):
+        elif x := self.args(tpl).get("column-width"):
             result += f"|matchWidth={clean_arg_value(x)}"
         result += "\n" + "\n".join(bracket_texts) + "\n}}"
         return result
 
     def convert_team_bracket(self, tpl: wtp.Template, legacy_name: str) -> str | None:
-        if legacy_name in BRACKETS:
-            conversion = BRACKETS[legacy_name]
+        tables = bracket_tables()
+        if legacy_name in tables.brackets:
+            definition = tables.brackets[legacy_name]
         else:
             return None
 
-        id_ = generate_id()
-        bracket_name = BRACKET_NEW_NAMES[legacy_name]
+        id_ = self.ids.generate(tpl.span)
+        bracket_name = tables.new_names[legacy_name]
 
         bracket_texts = self.arguments_to_texts(BRACKET_ARGUMENTS, tpl)
 
-        last_match_id = next(reversed(conversion))
-        is_single_block_bracket = bracket_name in SINGLE_BLOCK_BRACKETS
+        last_match_id = definition.matches[-1][0]
+        is_single_block_bracket = bracket_name in tables.single_block
         prev_round_number = ""
         is_new_round = True
         prev_bestof = None
         bracket_matches = {}
-        for match_id, (*team_prefixes, game_prefix) in conversion.items():
+        for match_id, team_prefixes, game_prefix in definition.matches:
             teams = ["", ""]
             match_texts0: list[str] = []
             match_texts1: list[str] = []
@@ -2297,23 +2584,23 @@ class TournamentConverter:
 
             for i, prefix in enumerate(team_prefixes, start=1):
                 if (
-                    (x := tpl.get_arg(f"{prefix}team"))
-                    or (x := tpl.get_arg(f"{prefix}short"))
-                    or (x := tpl.get_arg(f"{prefix}literal"))
-                    or (x := tpl.get_arg(prefix))
+                    (x := self.args(tpl).get(f"{prefix}team"))
+                    or (x := self.args(tpl).get(f"{prefix}short"))
+                    or (x := self.args(tpl).get(f"{prefix}literal"))
+                    or (x := self.args(tpl).get(prefix))
                 ):
                     teams[i - 1] = clean_arg_value(x).replace("'''", "")
                     teams[i - 1] = TEAM_BRACKET_TEMPLATE_SC2.sub("", teams[i - 1])
                     teams[i - 1] = TEAM_BRACKET_TEMPLATE.sub("\\1", teams[i - 1])
                     if teams[i - 1].lower() in self.team_aliases:
                         teams[i - 1] = self.team_aliases[teams[i - 1].lower()]
-                if x := tpl.get_arg(f"{prefix}score"):
+                if x := self.args(tpl).get(f"{prefix}score"):
                     scores[i - 1] = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}score2"):
+                if x := self.args(tpl).get(f"{prefix}score2"):
                     scores2[i - 1] = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}score3"):
+                if x := self.args(tpl).get(f"{prefix}score3"):
                     scores3[i - 1] = clean_arg_value(x)
-                if x := tpl.get_arg(f"{prefix}win"):
+                if x := self.args(tpl).get(f"{prefix}win"):
                     wins[i - 1] = clean_arg_value(x)
 
             # Guess bestof from scores
@@ -2330,7 +2617,10 @@ class TournamentConverter:
                 else:
                     if num_scores[0] == num_scores[1]:
                         self.warn(
-                            "Bracket", id_, f"[{match_id}] bestof cannot be guessed for score {'-'.join(scores)}\n"
+                            "Bracket",
+                            id_,
+                            "bestof-not-guessed",
+                            f"[{match_id}] bestof cannot be guessed for score {'-'.join(scores)}\n",
                         )
                     else:
                         # We can compute bestof
@@ -2339,7 +2629,10 @@ class TournamentConverter:
                             match.bestof_is_set = True
                             if not is_new_round:
                                 self.warn(
-                                    "Bracket", id_, f"[{match_id}] Change of bestof from {prev_bestof} to {bestof}"
+                                    "Bracket",
+                                    id_,
+                                    "bestof-changed",
+                                    f"[{match_id}] Change of bestof from {prev_bestof} to {bestof}",
                                 )
             # By default, bestof is the same as previously
             match.bestof = bestof or prev_bestof
@@ -2347,14 +2640,14 @@ class TournamentConverter:
             if "W" not in scores:
                 if wins[0] and not wins[1]:
                     if wins[0] != "1":
-                        self.warn("Bracket", id_, f"[{match_id}] {team_prefixes[0]}win={wins[0]}")
+                        self.warn("Bracket", id_, "unexpected-win", f"[{match_id}] {team_prefixes[0]}win={wins[0]}")
                     if teams[1] == "BYE" and scores[1] == "":
                         match_texts1.append("|walkover=1")
                     elif bestof is None:
                         match_texts1.append("|winner=1")
                 elif wins[1] and not wins[0]:
                     if wins[1] != "1":
-                        self.warn("Bracket", id_, f"[{match_id}] {team_prefixes[1]}win={wins[1]}")
+                        self.warn("Bracket", id_, "unexpected-win", f"[{match_id}] {team_prefixes[1]}win={wins[1]}")
                     if teams[0] == "BYE" and scores[0] == "":
                         match_texts1.append("|walkover=2")
                     elif bestof is None:
@@ -2378,11 +2671,11 @@ class TournamentConverter:
                     reset_match_texts = [tm_text]
             elif (
                 not self.options["bracket_do_not_convert_details"]
-                and (x := tpl.get_arg(f"{game_prefix}details"))
+                and (x := self.args(tpl).get(f"{game_prefix}details"))
                 and x.templates
             ):
                 team_match_subtemplates = [
-                    t for t in x.templates if t.normal_name(capitalize=True) in ("BracketTeamMatch", "TeamMatch")
+                    t for t in x.templates if self.template_names[t.span] in ("BracketTeamMatch", "TeamMatch")
                 ]
                 if not team_match_subtemplates:
                     print(f"No BracketTeamMatch in details for {teams[0]} vs {teams[1]}")
@@ -2470,50 +2763,41 @@ class TournamentConverter:
 
         bracket_texts += [f"|{match_id}={match.string()}" for match_id, match in bracket_matches.items()]
 
-        if clean_arg_value(tpl.get_arg("noDuplicateCheck")):
-            self.warn("Bracket", id_, " noDuplicateCheck used")
+        if self.args(tpl).value("noDuplicateCheck"):
+            self.warn("Bracket", id_, "no-duplicate-check", "noDuplicateCheck used")
 
         result = f"{{{{Bracket|{bracket_name}|id={id_}"
         if self.options["bracket_match_width"]:
             result += f"|matchWidth={self.options['bracket_match_width']}"
-        elif x := tpl.get_arg("column-width"):
+        elif x := self.args(tpl).get("column-width"):
             result += f"|matchWidth={clean_arg_value(x)}"
         result += "\n" + "\n".join(bracket_texts) + "\n}}"
         return result
 
-    def warn(self, type_: str, id_: str, text: str) -> None:
-        self.info += '<div class="warning">⚠️ '
-        if id_ != self.warning_last_id:
-            self.info += f"[{type_} {id_}]"
-            self.warning_last_id = id_
-        else:
-            self.info += "    "
-        self.info += f"{text}</div>"
+    def warn(self, category: str, id_: str | None, code: str, text: str) -> None:
+        self.warnings.add(category, id_ or "", code, text)
 
     def look_for_player(self, player: MatchPlayer) -> tuple[bool, bool]:
-        if player.name not in self.participants_by_name:
+        if (participant := self.participants.by_name.get(player.name)) is None:
             if player.name.endswith("*"):
-                self.info += f'<div class="warning">⚠️ Asterisk in player name {player.name}</div>'
+                self.warn("Player", "", "asterisk-in-name", f"Asterisk in player name {player.name}")
             # found, is_offrace
             return False, False
 
-        participant = self.participants_by_name[player.name]
-
         if player.flag:
-            flag = player.flag.lower()
-            flag = COUNTRIES.get(flag, flag)
+            flag = canonical_flag(player.flag)
             if flag != (p_flag := participant.clean_flag):
                 if p_flag:
-                    self.info += (
-                        f'<div class="warning">⚠️ {participant.name} found'
-                        f" in participants with flag '{p_flag}' != '{flag}'</div>"
+                    self.warn(
+                        "Player",
+                        "",
+                        "different-flag",
+                        f"{participant.name} found in participants with flag '{p_flag}' != '{flag}'",
                     )
                 return False, False
 
         if player.race:
-            race = player.race.lower()
-            race = RACES.get(race, race)
-            return True, race != participant.clean_race
+            return True, canonical_race(player.race) != participant.clean_race
         return True, False
 
     def look_for_player_by_link(self, player: MatchPlayer) -> tuple[bool, bool]:
@@ -2525,101 +2809,95 @@ class TournamentConverter:
           This is to avoid warnings when the participant flag/race are expected to be retrieved from the LPDB data.
         """
         player_link = clean_link(player.link or player.name)
-        if player_link not in self.participants_by_link:
+        if (participant := self.participants.by_link.get(player_link)) is None:
             if player_link.endswith("*"):
-                self.info += f'<div class="warning">⚠️ Asterisk in player.link {player.link}</div>'
+                self.warn("Player", "", "asterisk-in-link", f"Asterisk in player.link {player.link}")
             # found, is_offrace
             return False, False
 
-        participant = self.participants_by_link[player_link]
-
         if player.flag:
-            flag = player.flag.lower()
-            flag = COUNTRIES.get(flag, flag)
+            flag = canonical_flag(player.flag)
             if participant.clean_flag and flag != (p_flag := participant.clean_flag):
                 if p_flag:
-                    self.info += (
-                        f'<div class="warning">⚠️ {participant.name} found'
-                        f" in participants with flag '{p_flag}' != '{flag}'</div>"
+                    self.warn(
+                        "Player",
+                        "",
+                        "different-flag",
+                        f"{participant.name} found in participants with flag '{p_flag}' != '{flag}'",
                     )
                 return False, False
 
         if player.race:
-            race = player.race.lower()
-            race = RACES.get(race, race)
-            return True, participant.clean_race and race != participant.clean_race
+            return True, participant.clean_race and canonical_race(player.race) != participant.clean_race
         return True, False
 
     def find_match_summary(self, players: list[MatchPlayer]):
-        for i, ms_entry in enumerate(self.match_summaries):
-            if (
-                not (ms_entry.moved or ms_entry.grouped)
-                and (ms_entry.has_set_map or not self.options["bracket_do_not_move_no_map_match_summary"])
-                and all(player.name == ms_player.name for player, ms_player in zip(players, ms_entry.players))
-            ):
-                self.match_summaries[i].moved = True
-                return ms_entry.texts
+        if self.match_summary_index is None:
+            self.match_summary_index = RelocationIndex.build(
+                self.match_summaries,
+                lambda ms_entry: tuple(ms_player.name for ms_player in ms_entry.players),
+                lambda ms_entry: (
+                    ms_entry.has_set_map or not self.options["bracket_do_not_move_no_map_match_summary"]
+                ),
+            )
+        if ms_entry := self.match_summary_index.claim(tuple(player.name for player in players)):
+            return ms_entry.texts
 
     def find_team_match(self, teams: list[str]):
-        for i, tm_entry in enumerate(self.team_matches):
-            if (
-                not (tm_entry.moved or tm_entry.grouped)
-                and (tm_entry.has_set_map or not self.options["bracket_do_not_move_no_map_team_match"])
-                and all(team.lower() == tm_team.lower() for team, tm_team in zip(teams, tm_entry.teams))
-            ):
-                self.team_matches[i].moved = True
-                return tm_entry.text
+        if self.team_match_index is None:
+            self.team_match_index = RelocationIndex.build(
+                self.team_matches,
+                lambda tm_entry: tuple(tm_team.lower() for tm_team in tm_entry.teams),
+                lambda tm_entry: tm_entry.has_set_map or not self.options["bracket_do_not_move_no_map_team_match"],
+            )
+        if tm_entry := self.team_match_index.claim(tuple(team.lower() for team in teams)):
+            return tm_entry.text
 
     def arguments_to_texts(
         self,
-        wrapped_arguments: tuple[int, dict[str, str | int | None]],
+        arguments: ArgumentTable,
         tpl: wtp.Template,
         ignore_list: list[str] | None = None,
         append_empty_strings: bool = False,
     ) -> list[str] | list[list[str]]:
-        part_count, arguments = wrapped_arguments
         ignore_list = ignore_list or []
-        texts = [[] for _ in range(part_count)]
+        texts = [[] for _ in range(arguments.part_count)]
         part = 0
 
-        for x in tpl.arguments:
-            found = False
-            arg_name = x.name.strip()
-            for from_arg, to_arg in arguments.items():
-                if re.match(rf"^{from_arg}$", arg_name):
-                    if isinstance(to_arg, int):
-                        part = to_arg
-                    elif arg_name not in ignore_list and to_arg is not None:
-                        value = clean_arg_value(x)
-                        if value or append_empty_strings:
-                            texts[part].append(f"|{re.sub(from_arg, to_arg, arg_name)}={value}")
-                    found = True
-                    break
+        for name, x in self.args(tpl).items:
+            arg_name = name.strip()
+            found, to_arg = arguments.convert(arg_name)
             if not found:
-                self.not_converted_arguments.add((tpl.normal_name(), x.name))
-
-        if part_count > 1:
+                self.not_converted_arguments.add((tpl.normal_name(), name))
+            elif isinstance(to_arg, int):
+                part = to_arg
+            elif arg_name not in ignore_list and to_arg is not None:
+                value = clean_arg_value(x)
+                if value or append_empty_strings:
+                    texts[part].append(f"|{to_arg}={value}")
+
+        if arguments.part_count > 1:
             return texts
         return texts[0]
 
     def convert_external_cup_list(self, tpl: wtp.Template) -> str | None:
         cup_list = ExternalCupList()
-        cup_list.local_currency = clean_arg_value(tpl.get_arg("localcurrency"))
-        cup_list.prefix = clean_arg_value(tpl.get_arg("prefix"))
+        cup_list.local_currency = self.args(tpl).value("localcurrency")
+        cup_list.prefix = self.args(tpl).value("prefix")
         i = 1
-        while x := tpl.get_arg(str(i)):
+        while x := self.args(tpl).get(str(i)):
             row_tpl = x.templates[0]
-            if row_tpl.normal_name(capitalize=True) == "ExternalCupList/Row":
+            if self.template_names[row_tpl.span] == "ExternalCupList/Row":
                 row = ExternalCupListRow()
-                row.number = clean_arg_value(row_tpl.get_arg("number"))
-                row.date = clean_arg_value(row_tpl.get_arg("date"))
+                row.number = self.args(row_tpl).value("number")
+                row.date = self.args(row_tpl).value("date")
                 for field in ("winner", "runnerup"):
-                    if x := row_tpl.get_arg(field):
+                    if x := self.args(row_tpl).get(field):
                         opp_tpl = x.templates[0]
                         if opp_tpl.normal_name() == "1Opponent":
-                            if x := opp_tpl.get_arg("localprize"):
+                            if x := self.args(opp_tpl).get("localprize"):
                                 setattr(row, f"{field}_prize", LocalPrize(clean_arg_value(x)))
-                            if x := opp_tpl.get_arg("prize"):
+                            if x := self.args(opp_tpl).get("prize"):
                                 setattr(row, f"{field}_prize", UsdPrize(clean_arg_value(x)))
                 cup_list.rows.append(row)
             i += 1
@@ -2647,23 +2925,25 @@ class TournamentConverter:
         return new_text
 
     def convert_legacy_player_cross_table(self, tpl: wtp.Template) -> str | None:
-        id_ = clean_arg_value(tpl.get_arg("id"))
+        id_ = self.args(tpl).value("id")
 
         participants: dict[int, Participant] = {}
-        sorted_player_indexes = sorted(int(m[1]) for _, m in filter_template_args(tpl, CROSS_TABLE_PLAYER_PATTERN))
+        sorted_player_indexes = sorted(
+            int(m[1]) for _, m in filter_template_args(self.args(tpl), CROSS_TABLE_PLAYER_PATTERN)
+        )
         for i in sorted_player_indexes:
-            x = tpl.get_arg(f"player{i}")
+            x = self.args(tpl).get(f"player{i}")
             p = Participant(name=clean_arg_value(x))
             if not p.name:
                 del p
                 continue
-            if x := tpl.get_arg(f"player{i}link"):
+            if x := self.args(tpl).get(f"player{i}link"):
                 p.link = clean_arg_value(x)
                 if p.link in ("false", "true"):
                     p.link = ""
-            if x := tpl.get_arg(f"player{i}flag"):
+            if x := self.args(tpl).get(f"player{i}flag"):
                 p.flag = clean_arg_value(x)
-            if x := tpl.get_arg(f"player{i}race"):
+            if x := self.args(tpl).get(f"player{i}race"):
                 p.race = clean_arg_value(x)
             self.add_participant(p)
             participants[i] = p
@@ -2686,14 +2966,21 @@ class TournamentConverter:
             has_a_non_empty_map = False
             is_walkover_set = False
             are_all_maps_default_win = True
-            if (x := tpl.get_arg(f"{game_prefix}details")) and x.templates:
+            if (x := self.args(tpl).get(f"{game_prefix}details")) and x.templates:
                 summary_tpl = x.templates[0]
                 for other_tpl in x.templates[1:]:
                     if other_tpl.span[0] > summary_tpl.span[1]:
-                        self.warn("Cross table", id_, f" Multiple templates in {game_prefix}details")
+                        self.warn(
+                            "Cross table", id_, "multiple-details", f"Multiple templates in {game_prefix}details"
+                        )
                         break
-                if summary_tpl.normal_name(capitalize=True) != "BracketMatchSummary":
-                    self.warn("Cross table", id_, f" Template in {game_prefix}details is not BracketMatchSummary")
+                if self.template_names[summary_tpl.span] != "BracketMatchSummary":
+                    self.warn(
+                        "Cross table",
+                        id_,
+                        "unexpected-details",
+                        f"Template in {game_prefix}details is not BracketMatchSummary",
+                    )
                 summary_texts, summary_end_texts = self.arguments_to_texts(
                     BRACKET_MATCH_SUMMARY_ARGUMENTS, summary_tpl
                 )
@@ -2702,8 +2989,8 @@ class TournamentConverter:
                 empty_map_index = None
                 i = 1
                 while True:
-                    x = summary_tpl.get_arg(f"map{i}")
-                    x_win = summary_tpl.get_arg(f"map{i}win") or summary_tpl.get_arg(f"win{i}")
+                    x = self.args(summary_tpl).get(f"map{i}")
+                    x_win = self.args(summary_tpl).get(f"map{i}win") or self.args(summary_tpl).get(f"win{i}")
                     if not (x or x_win):
                         break
 
@@ -2720,7 +3007,10 @@ class TournamentConverter:
                         map_winner = "0"
                     elif map_winner and map_winner not in ("0", "1", "2", "skip"):
                         self.warn(
-                            "Cross table", id_, f" Map {i} winner is {map_winner} (expected 0, 1, 2, skip or draw)"
+                            "Cross table",
+                            id_,
+                            "unexpected-map-winner",
+                            f"Map {i} winner is {map_winner} (expected 0, 1, 2, skip or draw)",
                         )
 
                     map_text = f"|map{i}={{{{Map"
@@ -2734,7 +3024,7 @@ class TournamentConverter:
                         map_text += f"{map_map_text}{map_winner_text}"
                     map_has_race = False
                     for j in (1, 2):
-                        if x := summary_tpl.get_arg(f"map{i}p{j}race"):
+                        if x := self.args(summary_tpl).get(f"map{i}p{j}race"):
                             map_has_race = True
                             map_text += f"|t{j}p1race={clean_arg_value(x)}"
 
@@ -2744,7 +3034,7 @@ class TournamentConverter:
                         empty_map_index = None
                         # Only include VOD to a Map template with data
                         if self.options["bracket_move_vodgames_to_map"] and (
-                            vod := clean_arg_value(summary_tpl.get_arg(f"vodgame{i}"))
+                            vod := self.args(summary_tpl).value(f"vodgame{i}")
                         ):
                             map_text += f"|vod={vod}"
                             vodgames_moved_to_map.append(i)
@@ -2763,12 +3053,12 @@ class TournamentConverter:
                 if empty_map_index is not None:
                     map_texts = map_texts[: empty_map_index - 1]
 
-                is_walkover_set = clean_arg_value(tpl.get_arg("walkover")) in ("0", "1", "2")
+                is_walkover_set = self.args(tpl).value("walkover") in ("0", "1", "2")
 
                 i = 1
                 while True:
-                    x = summary_tpl.get_arg(f"veto{i}")
-                    x_player = summary_tpl.get_arg(f"vetoplayer{i}")
+                    x = self.args(summary_tpl).get(f"veto{i}")
+                    x_player = self.args(summary_tpl).get(f"vetoplayer{i}")
                     if x or x_player:
                         map_texts.append(f"|veto{i}={clean_arg_value(x)} |vetoplayer{i}={clean_arg_value(x_player)}")
                         i += 1
@@ -2786,22 +3076,27 @@ class TournamentConverter:
                 ]
 
                 # If the bestof argument exists and it has an integer value, then use it
-                if bestof := clean_arg_value(summary_tpl.get_arg("bestof")):
+                if bestof := self.args(summary_tpl).value("bestof"):
                     try:
                         bestof = int(bestof)
                     except ValueError:
                         # If the value is not an integer, then ignore it
-                        self.warn("Cross table", f"[{game_prefix}] Existing bestof is not a decimal integer value")
+                        self.warn(
+                            "Cross table",
+                            id_,
+                            "invalid-bestof",
+                            f"[{game_prefix}] Existing bestof is not a decimal integer value",
+                        )
                     else:
                         match.bestof = bestof
                         match.bestof_is_set = True
 
-                if x := summary_tpl.get_arg("date"):
+                if x := self.args(summary_tpl).get("date"):
                     match.date = clean_arg_value(x)
 
-            if x := tpl.get_arg(f"{game_prefix}result"):
+            if x := self.args(tpl).get(f"{game_prefix}result"):
                 scores[0] = clean_arg_value(x)
-            if x := tpl.get_arg(f"{game_prefix}resultvs"):
+            if x := self.args(tpl).get(f"{game_prefix}resultvs"):
                 scores[1] = clean_arg_value(x)
 
             if has_a_non_empty_map and are_all_maps_default_win:
@@ -2823,6 +3118,7 @@ class TournamentConverter:
                         self.warn(
                             "Cross table",
                             id_,
+                            "score-discrepancy",
                             f"[{game_prefix}] Discrepancy between"
                             f" map score {map_scores[i - 1]}"
                             f" and score {scores[i - 1]} ({participant.name})",
@@ -2840,7 +3136,10 @@ class TournamentConverter:
             if self.options["bracket_guess_bestof"] and not is_walkover and None not in num_scores:
                 if num_scores[0] == num_scores[1]:
                     self.warn(
-                        "Cross table", id_, f"[{game_prefix}] bestof cannot be guessed for score {'-'.join(scores)}"
+                        "Cross table",
+                        id_,
+                        "bestof-not-guessed",
+                        f"[{game_prefix}] bestof cannot be guessed for score {'-'.join(scores)}",
                     )
                 else:
                     # We can compute bestof
@@ -2850,7 +3149,10 @@ class TournamentConverter:
             if match.bestof is not None:
                 if bestof != match.bestof:
                     self.warn(
-                        "Bracket", id_, f"[{game_prefix}] Guessed bestof ({bestof}) != arg bestof ({match.bestof})"
+                        "Bracket",
+                        id_,
+                        "bestof-mismatch",
+                        f"[{game_prefix}] Guessed bestof ({bestof}) != arg bestof ({match.bestof})",
                     )
             else:
                 # By default, bestof is the same as previously
@@ -2903,16 +3205,16 @@ class TournamentConverter:
 
     def process_group_table_slot(self, tpl: wtp.Template) -> None:
         opponents = []
-        if (x := tpl.get_arg("1")) is None or not (text := clean_arg_value(x)):
+        if (x := self.args(tpl).get("1")) is None or not (text := clean_arg_value(x)):
             return
 
         # Info is in templates or as a simple text
         if x.templates:
             for sub_tpl in x.templates:
-                name = sub_tpl.normal_name(capitalize=True)
+                name = self.template_names[sub_tpl.span]
                 race = None
                 if name in ("Team", "TeamShort", "TeamIcon"):
-                    tt_name = clean_arg_value(sub_tpl.get_arg("1"))
+                    tt_name = self.args(sub_tpl).value("1")
                     if tt_name.lower() in ("tbd", "none", "noteam", ""):
                         if x.wikilinks:
                             link = x.wikilinks[0]
@@ -2929,10 +3231,10 @@ class TournamentConverter:
                     opponents.append((1, [get_match_player_from_template(sub_tpl)]))
                 elif name in ("Flag", "FlagNoLink") and (
                     len(x.templates) == 1
-                    or (len(x.templates) == 2 and (race := x.templates[1].normal_name(capitalize=True)) in "PTZR")
+                    or (len(x.templates) == 2 and (race := self.template_names[x.templates[1].span]) in "PTZR")
                 ):
                     p = MatchPlayer()
-                    p.flag = clean_arg_value(sub_tpl.get_arg("1"))
+                    p.flag = self.args(sub_tpl).value("1")
                     if race:
                         p.race = race.lower()
                     if x.wikilinks:
@@ -2950,7 +3252,9 @@ class TournamentConverter:
             opponents.append(("Literal", text))
         # In case of error, add a "<missing opponent>"
         if len(opponents) == 0 or len(opponents) > 4:
-            self.info += f'<div class="warning">⚠️ No opponent or more than 4 opponents found in GroupTableSlot</div>'
+            self.warn(
+                "Group table", "", "opponent-count", "No opponent or more than 4 opponents found in GroupTableSlot"
+            )
             opponents.append(("Literal", "<missing opponent>"))
 
         if len(opponents) > 1:
@@ -2959,8 +3263,11 @@ class TournamentConverter:
                 # Merge single-player opponents in one opponent
                 opponents = [(len(opponents), sum((opp[1] for opp in opponents), []))]
             else:
-                self.info += (
-                    f'<div class="warning">⚠️ Multiple opponents of different types found in GroupTableSlot</div>'
+                self.warn(
+                    "Group table",
+                    "",
+                    "mixed-opponents",
+                    "Multiple opponents of different types found in GroupTableSlot",
                 )
                 return
         # Generate opponent text
@@ -2980,8 +3287,11 @@ class TournamentConverter:
             opponent_text = f"|{n}={{{{1Opponent|{player.name}"
             # found, offrace = self.look_for_player_by_link(player)
             # if not found:
-            #     self.info += (
-            #         f'<div class="warning">⚠️ Player data from GroupTableSlot ({player.name}) will disappear</div>'
+            #     self.warn(
+            #         "Group table",
+            #         "",
+            #         "player-data-lost",
+            #         f"Player data from GroupTableSlot ({player.name}) will disappear",
             #     )
             #     if player.link:
             #         opponent_text += f"|link={player.link}"
@@ -2990,7 +3300,12 @@ class TournamentConverter:
             #     if player.race:
             #         opponent_text += f"|race={player.race}"
             # elif offrace:
-            #     self.info += f'<div class="warning">⚠️ Player offracing in GroupTableSlot ({player.name}), data will disappear</div>'
+            #     self.warn(
+            #         "Group table",
+            #         "",
+            #         "player-offrace",
+            #         f"Player offracing in GroupTableSlot ({player.name}), data will disappear",
+            #     )
             #     opponent_text += f"|race={player.race}"
             if player.link:
                 opponent_text += f"|link={player.link}"
@@ -3005,8 +3320,11 @@ class TournamentConverter:
                 opponent_text += f"|p{i}={player.name}"
                 found, offrace = self.look_for_player_by_link(player)
                 if not found:
-                    self.info += (
-                        f'<div class="warning">⚠️ Player data from GroupTableSlot ({player.name}) will disappear</div>'
+                    self.warn(
+                        "Group table",
+                        "",
+                        "player-data-lost",
+                        f"Player data from GroupTableSlot ({player.name}) will disappear",
                     )
                     if player.link:
                         opponent_text += f"|p{i}link={player.link}"
@@ -3015,7 +3333,12 @@ class TournamentConverter:
                     if player.race:
                         opponent_text += f"|p{i}race={player.race}"
                 elif offrace:
-                    self.info += f'<div class="warning">⚠️ Player offracing in GroupTableSlot ({player.name}), data will disappear</div>'
+                    self.warn(
+                        "Group table",
+                        "",
+                        "player-offrace",
+                        f"Player offracing in GroupTableSlot ({player.name}), data will disappear",
+                    )
                     opponent_text += f"|p{i}race={player.race}"
             opponent_text += "}}"
         if STRIKETHROUGH_PATTERN.search(text) is not None:
@@ -3026,7 +3349,7 @@ class TournamentConverter:
             self.group_tbl_has_dq_or_note_opponent = True
 
         # Add manual results
-        args = {x.name.strip(): clean_arg_value(x) for x in tpl.arguments}
+        args = {name.strip(): clean_arg_value(x) for name, x in self.args(tpl).items}
         win_g_int = None
         lose_g_int = None
         results_text = ""
@@ -3034,7 +3357,7 @@ class TournamentConverter:
             try:
                 win_m_int = int(win_m)
             except ValueError:
-                self.info += f'<div class="warning">⚠️ Non-numerical win_m value ({win_m})</div>'
+                self.warn("Group table", "", "non-numerical-value", f"Non-numerical win_m value ({win_m})")
             else:
                 self.group_tbl_match_count += win_m_int
             results_text += f"|temp_win_m{n}={win_m}"
@@ -3042,7 +3365,7 @@ class TournamentConverter:
             try:
                 tie_m_int = int(tie_m)
             except ValueError:
-                self.info += f'<div class="warning">⚠️ Non-numerical tie_m value ({tie_m})</div>'
+                self.warn("Group table", "", "non-numerical-value", f"Non-numerical tie_m value ({tie_m})")
             else:
                 self.group_tbl_match_count += tie_m_int
             results_text += f"|temp_tie_m{n}={tie_m}"
@@ -3050,7 +3373,7 @@ class TournamentConverter:
             try:
                 lose_m_int = int(lose_m)
             except ValueError:
-                self.info += f'<div class="warning">⚠️ Non-numerical lose_m value ({lose_m})</div>'
+                self.warn("Group table", "", "non-numerical-value", f"Non-numerical lose_m value ({lose_m})")
             else:
                 self.group_tbl_match_count += lose_m_int
             results_text += f"|temp_lose_m{n}={lose_m}"
@@ -3058,30 +3381,35 @@ class TournamentConverter:
             try:
                 win_g_int = int(win_g)
             except ValueError:
-                self.info += f'<div class="warning">⚠️ Non-numerical win_g value ({win_g})</div>'
+                self.warn("Group table", "", "non-numerical-value", f"Non-numerical win_g value ({win_g})")
             self.group_tbl_show_games = True
             results_text += f"|temp_win_g{n}={win_g}"
         if lose_g := args.get("lose_g"):
             try:
                 lose_g_int = int(lose_g)
             except ValueError:
-                self.info += f'<div class="warning">⚠️ Non-numerical lose_g value ({lose_g})</div>'
+                self.warn("Group table", "", "non-numerical-value", f"Non-numerical lose_g value ({lose_g})")
             self.group_tbl_show_games = True
             results_text += f"|temp_lose_g{n}={lose_g}"
         if diff := args.get("diff"):
             try:
                 diff_int = int(diff)
             except ValueError:
-                self.info += f'<div class="warning">⚠️ Non-numerical diff value ({diff})</div>'
+                self.warn("Group table", "", "non-numerical-value", f"Non-numerical diff value ({diff})")
             else:
                 self.group_tbl_show_diff = True
                 if win_g_int is None or lose_g_int is None:
-                    self.info += f'<div class="warning">⚠️ diff defined when win_g or lose_g is not defined</div>'
+                    self.warn(
+                        "Group table", "", "diff-without-games", "diff defined when win_g or lose_g is not defined"
+                    )
                 else:
                     computed_diff = win_g_int - lose_g_int
                     if computed_diff != diff_int:
-                        self.info += (
-                            f'<div class="warning">⚠️ Diff value ({diff_int}) != win_g - lose_g ({computed_diff})</div>'
+                        self.warn(
+                            "Group table",
+                            "",
+                            "diff-mismatch",
+                            f"Diff value ({diff_int}) != win_g - lose_g ({computed_diff})",
                         )
         if bg := args.get("bg"):
             results_text += f"|bg{n}={bg}"
@@ -3117,31 +3445,31 @@ class TournamentConverter:
             self.group_tbl_text += "\n" + "\n".join(self.group_tbl_manual_texts)
         self.group_tbl_text += "\n}}"
 
-        self.changes.append((self.group_tbl_start_pos, group_table_end_pos, self.group_tbl_text))
+        self.changes.add(self.group_tbl_start_pos, group_table_end_pos, self.group_tbl_text)
         self.counter["GroupTable"] += 1
         self.group_tbl_text = ""
         self.group_tbl_index += 1
 
     def add_participant_from_player_template(self, tpl: wtp.Template) -> None:
         p = Participant()
-        if x := tpl.get_arg("1"):
+        if x := self.args(tpl).get("1"):
             p.name = clean_arg_value(x)
         if not p.name:
             del p
             return
         if m := PIPE_PATTERN.match(p.name):
             p.link, p.name = m.groups()
-        if x := tpl.get_arg("link"):
+        if x := self.args(tpl).get("link"):
             p.link = clean_arg_value(x)
             if p.link in ("false", "true"):
                 p.link = ""
 
-        default_p = self.participants_by_name.get(p.name, None)
-        if x := tpl.get_arg("flag"):
+        default_p = self.participants.by_name.get(p.name, None)
+        if x := self.args(tpl).get("flag"):
             p.flag = clean_arg_value(x)
         if not p.flag and default_p:
             p.flag = default_p.flag
-        if x := tpl.get_arg("race"):
+        if x := self.args(tpl).get("race"):
             p.race = clean_arg_value(x)
         if not p.race and default_p:
             p.race = default_p.race
@@ -3149,19 +3477,19 @@ class TournamentConverter:
 
     def add_participants_from_participant_table(self, tpl: wtp.Template) -> list[Participant]:
         participants: list[Participant] = []
-        for x, m in filter_template_args(tpl, PARTICIPANT_TABLE_PARTICIPANT_PATTERN):
+        for x, m in filter_template_args(self.args(tpl), PARTICIPANT_TABLE_PARTICIPANT_PATTERN):
             i = m[1]
             p = Participant(name=clean_arg_value(x))
             if not p.name:
                 del p
                 continue
-            if x := tpl.get_arg(f"p{i}link"):
+            if x := self.args(tpl).get(f"p{i}link"):
                 p.link = clean_arg_value(x)
                 if p.link in ("false", "true"):
                     p.link = ""
-            if x := tpl.get_arg(f"p{i}flag"):
+            if x := self.args(tpl).get(f"p{i}flag"):
                 p.flag = clean_arg_value(x)
-            if x := tpl.get_arg(f"p{i}race"):
+            if x := self.args(tpl).get(f"p{i}race"):
                 p.race = clean_arg_value(x)
             self.add_participant(p)
             participants.append(p)
@@ -3170,7 +3498,7 @@ class TournamentConverter:
     def read_bool(self, val: str | bool | int) -> bool:
         is_true = val in ("true", "t", "yes", "y", True, "1", 1)
         if not is_true and val not in ("", "false", "f", "no", "n", False, "0", 0):
-            self.info += f'<div class="warning">⚠️ read_bool on a non-boolean value ({val})</div>'
+            self.warn("Conversion", "", "non-boolean-value", f"read_bool on a non-boolean value ({val})")
         return is_true
 
     def convert_very_old_team_matches(self):
@@ -3184,8 +3512,8 @@ class TournamentConverter:
 
         match_texts: list[str] = []
 
-        for tpl in self.parsed.templates:
-            name = tpl.normal_name(capitalize=True)
+        for tpl in self.templates:
+            name = self.template_names[tpl.span]
             if name in ("Team", "TeamShort", "Team2", "Team2Short"):
                 if len(teams) == 2:
                     # Update score after last subgroup
@@ -3221,10 +3549,10 @@ class TournamentConverter:
                     players = [{}, {}]
                     scores = [0, 0]
                     subgroup_scores = [0, 0]
-                teams.append(clean_arg_value(tpl.get_arg("1")))
+                teams.append(self.args(tpl).value("1"))
 
             elif name == "GameSet":
-                opponents = [tpl.get_arg("1"), tpl.get_arg("2")]
+                opponents = [self.args(tpl).get("1"), self.args(tpl).get("2")]
 
                 prev_gameset_players = deepcopy(gameset_players)
                 gameset_players = [set(), set()]
@@ -3236,15 +3564,15 @@ class TournamentConverter:
                         opp_tpl_name = opp_tpl.normal_name(capitalize=True)
                         if opp_tpl_name == "Player":
                             player = MatchPlayer()
-                            if x := opp_tpl.get_arg("1"):
+                            if x := self.args(opp_tpl).get("1"):
                                 player.name = clean_arg_value(x)
-                            if x := opp_tpl.get_arg("link"):
+                            if x := self.args(opp_tpl).get("link"):
                                 player.link = clean_arg_value(x)
                                 if player.link in ("false", "true"):
                                     player.link = ""
-                            if x := opp_tpl.get_arg("flag"):
+                            if x := self.args(opp_tpl).get("flag"):
                                 player.flag = clean_arg_value(x)
-                            if x := opp_tpl.get_arg("race"):
+                            if x := self.args(opp_tpl).get("race"):
                                 player.race = clean_arg_value(x)
                             if player.name:
                                 offrace = player.name in players[i] and player.race != players[i][player.name].race
@@ -3265,14 +3593,14 @@ class TournamentConverter:
                         scores[1] += 1
                     subgroup_scores = [0, 0]
 
-                if x := tpl.get_arg("map"):
+                if x := self.args(tpl).get("map"):
                     map_texts.append(f"|map={clean_arg_value(x)}")
                 skip = False
-                if x := tpl.get_arg("skip"):
+                if x := self.args(tpl).get("skip"):
                     if clean_arg_value(x):
                         skip = True
                         map_texts.append("|winner=skip")
-                if not skip and (x := tpl.get_arg("win")):
+                if not skip and (x := self.args(tpl).get("win")):
                     winner = clean_arg_value(x)
                     map_texts.append(f"|winner={winner}")
                     if winner in ("1", "2"):
@@ -3310,7 +3638,7 @@ class TournamentConverter:
 
         # Replace text
         # Assuming the text to replace is between the start of the first table and the end of the last table
-        mid = generate_id()
+        mid = self.ids.generate(self.parsed.tables[0].span)
         new_text = f"{{{{Matchlist|id={mid}" + "\n"
         new_text += "\n\n".join(f"|M{i}={match_text}" for i, match_text in enumerate(match_texts, start=1))
         new_text += "\n}}"
@@ -3335,23 +3663,23 @@ class TournamentConverter:
 
                 if name in ("Player", "Playersp") and not isinstance(tpl.parent(), wtp.Template):
                     player = MatchPlayer()
-                    if x := tpl.get_arg("1"):
+                    if x := self.args(tpl).get("1"):
                         player.name = clean_arg_value(x)
                         if player.name.startswith("[[") and player.name.endswith("]]"):
                             player.name = player.name.removeprefix("[[").removesuffix("]]")
-                    if x := tpl.get_arg("link"):
+                    if x := self.args(tpl).get("link"):
                         player.link = clean_arg_value(x)
                         if player.link in ("false", "true"):
                             player.link = ""
-                    if x := tpl.get_arg("flag"):
+                    if x := self.args(tpl).get("flag"):
                         player.flag = clean_arg_value(x)
-                    if x := tpl.get_arg("race"):
+                    if x := self.args(tpl).get("race"):
                         player.race = clean_arg_value(x)
                     if player.name:
                         players.append(player)
 
                 elif name == "GameSet":
-                    gameset_opponents = [tpl.get_arg("1"), tpl.get_arg("2")]
+                    gameset_opponents = [self.args(tpl).get("1"), self.args(tpl).get("2")]
 
                     map_texts = []
                     for i, opp in enumerate(gameset_opponents):
@@ -3360,9 +3688,9 @@ class TournamentConverter:
                             opp_tpl_name = opp_tpl.normal_name(capitalize=True)
                             if opp_tpl_name == "Player":
                                 player = MatchPlayer()
-                                if x := opp_tpl.get_arg("1"):
+                                if x := self.args(opp_tpl).get("1"):
                                     player.name = clean_arg_value(x)
-                                if x := opp_tpl.get_arg("race"):
+                                if x := self.args(opp_tpl).get("race"):
                                     player.race = clean_arg_value(x)
                                 if player.name:
                                     if i < len(players):
@@ -3376,14 +3704,14 @@ class TournamentConverter:
                                         map_texts.append(text)
                                 j += 1
 
-                    if x := tpl.get_arg("map"):
+                    if x := self.args(tpl).get("map"):
                         map_texts.append(f"|map={clean_arg_value(x)}")
                     skip = False
-                    if x := tpl.get_arg("skip"):
+                    if x := self.args(tpl).get("skip"):
                         if clean_arg_value(x):
                             skip = True
                             map_texts.append("|winner=skip")
-                    if not skip and (x := tpl.get_arg("win")):
+                    if not skip and (x := self.args(tpl).get("win")):
                         winner = clean_arg_value(x)
                         map_texts.append(f"|winner={winner}")
                         if winner in ("1", "2"):
@@ -3423,16 +3751,11 @@ class TournamentConverter:
             match_texts.append((tbl.span, match_text))
 
         # Replace text
-        sections = get_sections(self.text)
-        italics = get_italics(self.text)
-        try:
-            section = next(
-                section for section in sections if section.title == self.options["group_matches_of_section"]
-            )
-        except StopIteration:
+        index = self.index_sections()
+        if (section := index.by_title.get(self.options["group_matches_of_section"])) is None:
             print(f"Section {self.options['group_matches_of_section']} not found")
             # Assuming the text to replace is between the start of the first table and the end of the last table
-            mid = generate_id()
+            mid = self.ids.generate(self.parsed.tables[0].span)
             new_text = f"{{{{Matchlist|id={mid}" + "\n"
             new_text += "\n\n".join(
                 f"|M{i}={match_text_entry[1]}" for i, match_text_entry in enumerate(match_texts, start=1)
@@ -3447,7 +3770,7 @@ class TournamentConverter:
             stuff = sorted(
                 (
                     *((child.title_span, child) for child in section.children),
-                    *((it.span, it) for it in italics),
+                    *((it.span, it) for it in index.italics_between(start, end)),
                     *(
                         match_text_entry
                         for match_text_entry in match_texts
@@ -3467,7 +3790,7 @@ class TournamentConverter:
                         section_text += "}}\n"
                         new_text += section_text
                     new_text += "\n" + f"{'=' * item[1].level}{item[1].title}{'=' * item[1].level}" + "\n"
-                    mid = generate_id()
+                    mid = self.ids.generate(item[0])
                     section_text = f"{{{{Matchlist|id={mid}|collapsed=false" + "\n"
                     date = ""
                     i = 1
@@ -3483,7 +3806,8 @@ class TournamentConverter:
             return f"{self.text[:start]}{new_text}{self.text[end:]}"
 
     def convert_very_old_player_matches_v2(self):
-        changes = []
+        # Tables containing other converted tables are not converted
+        changes = ChangeSet(keep_inner=True)
         for tbl in self.parsed.tables:
             maps: list[str] = []
             prev_gameset_players = []
@@ -3495,7 +3819,7 @@ class TournamentConverter:
             for tpl in tbl.templates:
                 name = tpl.normal_name(capitalize=True)
                 if name == "GameSet":
-                    opponents = [tpl.get_arg("1"), tpl.get_arg("2")]
+                    opponents = [self.args(tpl).get("1"), self.args(tpl).get("2")]
                     map_texts = []
 
                     gameset_players = []
@@ -3504,15 +3828,15 @@ class TournamentConverter:
                             opp_tpl_name = opp_tpl.normal_name(capitalize=True)
                             if opp_tpl_name in ("Player", "Playersp"):
                                 player = MatchPlayer()
-                                if x := opp_tpl.get_arg("1"):
+                                if x := self.args(opp_tpl).get("1"):
                                     player.name = clean_arg_value(x)
-                                if x := opp_tpl.get_arg("link"):
+                                if x := self.args(opp_tpl).get("link"):
                                     player.link = clean_arg_value(x)
                                     if player.link in ("false", "true"):
                                         player.link = ""
-                                if x := opp_tpl.get_arg("flag"):
+                                if x := self.args(opp_tpl).get("flag"):
                                     player.flag = clean_arg_value(x)
-                                if x := opp_tpl.get_arg("race"):
+                                if x := self.args(opp_tpl).get("race"):
                                     player.race = clean_arg_value(x)
                                 if player.name:
                                     gameset_players.append(player)
@@ -3550,14 +3874,14 @@ class TournamentConverter:
                     else:
                         prev_gameset_players = deepcopy(gameset_players)
 
-                    if x := tpl.get_arg("map"):
+                    if x := self.args(tpl).get("map"):
                         map_texts.append(f"|map={clean_arg_value(x)}")
                     skip = False
-                    if x := tpl.get_arg("skip"):
+                    if x := self.args(tpl).get("skip"):
                         if clean_arg_value(x):
                             skip = True
                             map_texts.append("|winner=skip")
-                    if not skip and (x := tpl.get_arg("win")):
+                    if not skip and (x := self.args(tpl).get("win")):
                         winner = clean_arg_value(x)
                         map_texts.append(f"|winner={winner}")
                         if winner in ("1", "2"):
@@ -3587,30 +3911,14 @@ class TournamentConverter:
                 match_texts.append(match_text)
 
             # Add change to list
-            mid = generate_id()
+            mid = self.ids.generate(tbl.span)
             new_text = f"{{{{Matchlist|id={mid}" + "\n"
             new_text += "\n\n".join(f"|M{i}={match_text}" for i, match_text in enumerate(match_texts, start=1))
             new_text += "\n}}"
-            changes.append((*tbl.span, new_text))
-
-        # Sort changes
-        changes = sorted(changes, reverse=True)
-
-        # Clean changes: remove changes with nested changes
-        new_changes = []
-        for i, (start, end, new_text) in enumerate(changes):
-            for other_start, other_end, _ in changes[:i]:
-                if start < other_start and other_end < end:
-                    # Found a nested change
-                    break
-            else:
-                new_changes.append((start, end, new_text))
-        changes = new_changes
+            changes.add(*tbl.span, new_text)
 
-        # Apply changes
-        converted = self.text
-        for start, end, new_text in changes:
-            converted = f"{converted[:start]}{new_text}{converted[end:]}"
+        # Apply changes (changes with nested changes are discarded)
+        converted = changes.apply(self.text)
 
         return converted
 
@@ -3622,19 +3930,7 @@ def clean_arg_value(arg) -> str:
     return value
 
 
-def clean_arguments(tpl: wtp.Template) -> dict[str, str]:
-    return {x.name.strip(): clean_arg_value(x) for x in tpl.arguments}
-
-
-def generate_id(length=10, chars=string.ascii_letters + string.digits) -> str:
-    return "".join(random.SystemRandom().choice(chars) for _ in range(length))
-
-
-def clean_link(link: str) -> str:
-    return link[0].upper() + link[1:].replace("_", " ")
-
-
-def find_player_templates(parsed: wtp.WikiText) -> list[MatchPlayer]:
+def find_player_templates(parsed: wtp.WikiText | wtp.Argument) -> list[MatchPlayer]:
     players: list[MatchPlayer] = []
     for tpl in parsed.templates:
         tpl_name = tpl.normal_name(capitalize=True)
@@ -3753,9 +4049,9 @@ def prize_pool_opponent_string(opp, prefix, type_):
     return text
 
 
-def filter_template_args(tpl: wtp.Template, pattern: re.Pattern):
-    for x in tpl.arguments:
-        if m := pattern.match(x.name.strip()):
+def filter_template_args(arguments: TemplateArguments, pattern: re.Pattern):
+    for name, x in arguments.items:
+        if m := pattern.match(name.strip()):
             yield (x, m)
 
 
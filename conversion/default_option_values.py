@@ -46,4 +46,6 @@ STRING_OPTIONS = {
     "group_team_matches_width": "",
     "team_match_player_aliases": "",
     "team_aliases": "",
+    "id_seed": "",
+    "sections": "",
 }
\ No newline at end of file
@@ -0,0 +1,153 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import re
+from threading import Lock
+import time
+from typing import Iterator
+
+# Upper bounds (in seconds) of the buckets of the histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SUMMARY_ITEM_PATTERN = re.compile(r"(?:Convert |, )(.+?) \((\d+)x\)")
+# All the metrics, in the order of their creation
+REGISTRY: list["Metric"] = []
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def format_value(value: float) -> str:
+    # Exact value of a sample: "1234567" and not "1.23457e+06" as with :g
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    In-process instrument, exposed in the Prometheus text format.
+    Values are kept by tuple of label values; updates only take a lock and change a dict.
+    """
+
+    type_ = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.lock = Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_}"
+
+
+class Counter(Metric):
+    type_ = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        with self.lock:
+            values = list(self.values.items())
+        for label_values, value in values:
+            yield f"{self.name}{format_labels(self.labels, label_values)} {format_value(value)}"
+
+
+class Histogram(Metric):
+    type_ = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+        # Count of each bucket (not cumulative, the last one is +Inf), sum and count of the observations
+        self.values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            if label_values not in self.values:
+                self.values[label_values] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+            counts, totals = self.values[label_values]
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        with self.lock:
+            values = [
+                (label_values, list(counts), list(totals)) for label_values, (counts, totals) in self.values.items()
+            ]
+        labels = (*self.labels, "le")
+        for label_values, counts, (total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                bound_text = bound if isinstance(bound, str) else f"{bound:g}"
+                yield f"{self.name}_bucket{format_labels(labels, (*label_values, bound_text))} {cumulative}"
+            yield f"{self.name}_sum{format_labels(self.labels, label_values)} {format_value(total)}"
+            yield f"{self.name}_count{format_labels(self.labels, label_values)} {format_value(count)}"
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+def count_summary(converter: str, summary: str) -> None:
+    # The summary of a conversion lists the converted templates, e.g. "Convert LegacyBracket (2x), Match maps (8x)"
+    for m in SUMMARY_ITEM_PATTERN.finditer(summary):
+        CONVERTED_TEMPLATES.inc(converter, m[1], amount=int(m[2]))
+
+
+HTTP_REQUESTS = Counter("liquipedia_convert_http_requests_total", "HTTP requests", ("route", "method", "status"))
+HTTP_REQUEST_DURATION = Histogram(
+    "liquipedia_convert_http_request_duration_seconds", "Time to handle an HTTP request", ("route",)
+)
+CONVERSIONS = Counter("liquipedia_convert_conversions_total", "Conversions run (result cache misses)", ("converter",))
+CONVERSION_DURATION = Histogram(
+    "liquipedia_convert_conversion_duration_seconds", "Time of a conversion", ("converter",)
+)
+CONVERSION_FAILURES = Counter(
+    "liquipedia_convert_conversion_failures_total", "Conversions which raised an exception", ("converter",)
+)
+CONVERTED_TEMPLATES = Counter(
+    "liquipedia_convert_converted_templates_total",
+    "Templates converted, from the summaries",
+    ("converter", "template"),
+)
+RESULT_CACHE_REQUESTS = Counter(
+    "liquipedia_convert_result_cache_requests_total", "Lookups in the conversion result cache", ("result",)
+)
+PAGE_CACHE_REQUESTS = Counter(
+    "liquipedia_convert_page_cache_requests_total",
+    "Lookups in the page cache (fresh, revalidated, stale, outdated or miss)",
+    ("result",),
+)
+API_REQUEST_DURATION = Histogram(
+    "liquipedia_convert_api_request_duration_seconds", "Time of a request to the Liquipedia API", ("wiki",)
+)
+API_REQUEST_FAILURES = Counter(
+    "liquipedia_convert_api_request_failures_total", "Failed requests to the Liquipedia API", ("wiki",)
+)
@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 import re
 
@@ -23,20 +24,23 @@ ITALIC_PATTERN = re.compile(r"(?<!')''(.+?)''")
 
 def get_sections(text: str) -> list[Section]:
     sections: list[Section] = []
+    # Sections whose contents have not ended yet, by increasing level
+    open_sections: list[Section] = []
+    # Last section of each level: the parent of a section is the last one of the level above
+    last_sections: dict[int, Section] = {}
     for m in SECTION_TITLE_PATTERN.finditer(text):
         section = Section(len(m.group(1)), m.group(2), m.span())
-        parent_section = None
-        for previous_section in reversed(sections):
-            if previous_section.contents_span[0] == -1 and previous_section.level >= section.level:
-                previous_section.contents_span = (previous_section.title_span[1] + 1, section.title_span[0] - 1)
-            elif parent_section is None and previous_section.level == section.level - 1:
-                parent_section = previous_section
-                parent_section.children.append(section)
+        while open_sections and open_sections[-1].level >= section.level:
+            previous_section = open_sections.pop()
+            previous_section.contents_span = (previous_section.title_span[1] + 1, section.title_span[0] - 1)
+        if (parent_section := last_sections.get(section.level - 1)) is not None:
+            parent_section.children.append(section)
         sections.append(section)
+        open_sections.append(section)
+        last_sections[section.level] = section
 
-    for section in sections:
-        if section.contents_span[0] == -1:
-            section.contents_span = (section.title_span[1] + 1, len(text))
+    for section in open_sections:
+        section.contents_span = (section.title_span[1] + 1, len(text))
 
     return sections
 
@@ -45,6 +49,41 @@ def get_italics(text: str) -> list[Italic]:
     return [Italic(m.group(1), m.span()) for m in ITALIC_PATTERN.finditer(text)]
 
 
+@dataclass
+class SectionIndex:
+    """
+    Sections and italics of a text, found once and shared by the features working on the contents of a section.
+    """
+
+    sections: list[Section]
+    italics: list[Italic]
+    # First section with each title
+    by_title: dict[str, Section] = field(default_factory=dict)
+    italic_starts: list[int] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, text: str) -> "SectionIndex":
+        index = cls(get_sections(text), get_italics(text))
+        for section in index.sections:
+            index.by_title.setdefault(section.title, section)
+        index.italic_starts = [italic.span[0] for italic in index.italics]
+        return index
+
+    def italics_between(self, start: int, end: int) -> list[Italic]:
+        return self.italics[bisect_left(self.italic_starts, start) : bisect_left(self.italic_starts, end)]
+
+    def last_italic_before(self, pos: int, pattern: re.Pattern) -> Italic | None:
+        for i in range(bisect_left(self.italic_starts, pos) - 1, -1, -1):
+            if pattern.search(self.italics[i].text):
+                return self.italics[i]
+        return None
+
+
+def spans_between(items: list, starts: list[int], start: int, end: int) -> list:
+    # Items (sorted by start, with their starts) whose spans are within start and end
+    return [item for item in items[bisect_left(starts, start) : bisect_right(starts, end)] if item.span[1] <= end]
+
+
 def test_sections():
     s = """
 abc
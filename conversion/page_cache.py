@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+import sqlite3
+from threading import Lock
+import time
+
+
+@dataclass(slots=True)
+class CachedPage:
+    wiki: str
+    title: str
+    content: str
+    revid: int | None
+    timestamp: str
+    content_hash: str
+    # Time of the last fetch or revision check
+    checked: float
+
+
+def normalize_title(title: str) -> str:
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def content_hash(content: str) -> str:
+    return sha256(content.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    Wikitext of the pages fetched from the API, stored in a single SQLite database.
+    The connection is opened on first use, in WAL mode so that readers are not blocked by a writer.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = Lock()
+        self.connection: sqlite3.Connection | None = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " wiki TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " content TEXT NOT NULL,"
+                " revid INTEGER,"
+                " timestamp TEXT NOT NULL DEFAULT '',"
+                " content_hash TEXT NOT NULL,"
+                " checked REAL NOT NULL,"
+                " PRIMARY KEY (wiki, title)"
+                ")"
+            )
+            self.connection = connection
+        return self.connection
+
+    def get(self, wiki: str, title: str) -> CachedPage | None:
+        with self.lock:
+            row = (
+                self.connect()
+                .execute(
+                    "SELECT wiki, title, content, revid, timestamp, content_hash, checked FROM pages"
+                    " WHERE wiki = ? AND title = ?",
+                    (wiki, normalize_title(title)),
+                )
+                .fetchone()
+            )
+        return CachedPage(*row) if row else None
+
+    def put(self, wiki: str, title: str, content: str, revid: int | None = None, timestamp: str = "") -> CachedPage:
+        page = CachedPage(wiki, normalize_title(title), content, revid, timestamp, content_hash(content), time.time())
+        with self.lock:
+            self.connect().execute(
+                "INSERT OR REPLACE INTO pages (wiki, title, content, revid, timestamp, content_hash, checked)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (page.wiki, page.title, page.content, page.revid, page.timestamp, page.content_hash, page.checked),
+            )
+        return page
+
+    def touch(self, wiki: str, title: str) -> None:
+        # The cached revision is still the latest one
+        with self.lock:
+            self.connect().execute(
+                "UPDATE pages SET checked = ? WHERE wiki = ? AND title = ?",
+                (time.time(), wiki, normalize_title(title)),
+            )
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from functools import cache
+from hashlib import sha256
+import json
+from pathlib import Path
+import sqlite3
+from threading import Lock
+from typing import Any, Callable
+
+from conversion.classes import ConversionResult, ConversionWarning, warnings_json
+from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+
+ROOT = Path(__file__).parent.parent
+# Options which do not change the result of a conversion
+IGNORED_OPTIONS = {"ignore_cache"}
+
+
+@cache
+def source_version() -> str:
+    # Any change in the code of the converters invalidates the results computed before it
+    # (hashed on the first use of the result cache, not at import, to keep the startup fast)
+    digest = sha256()
+    for path in sorted([*ROOT.glob("*.py"), *(ROOT / "conversion").glob("*.py")]):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def result_key(text: str, title: str, converter: Callable, options: dict[str, Any]) -> str:
+    canonical_options = {
+        key: options.get(key, value)
+        for key, value in {**BOOL_OPTIONS, **STRING_OPTIONS}.items()
+        if key not in IGNORED_OPTIONS
+    }
+    digest = sha256()
+    for part in (
+        source_version(),
+        f"{converter.__module__}.{converter.__qualname__}",
+        json.dumps(canonical_options, sort_keys=True),
+        title,
+        sha256(text.encode("utf-8")).hexdigest(),
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Results of the conversions, in memory (least recently used ones are evicted first),
+    and optionally in a SQLite database so that they survive restarts.
+    """
+
+    def __init__(self, capacity: int, path: Path | None = None) -> None:
+        self.capacity = capacity
+        self.path = path
+        self.lock = Lock()
+        self.results: OrderedDict[str, ConversionResult] = OrderedDict()
+        self.connection: sqlite3.Connection | None = None
+
+    def persist(self, path: Path) -> None:
+        with self.lock:
+            self.path = path
+            self.connection = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # The info column holds the warnings, as a JSON array
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " converted TEXT NOT NULL,"
+                " info TEXT NOT NULL,"
+                " summary TEXT NOT NULL"
+                ")"
+            )
+            self.connection = connection
+        return self.connection
+
+    def get(self, key: str) -> ConversionResult | None:
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                return self.results[key]
+            if self.path is None:
+                return None
+            row = (
+                self.connect().execute("SELECT converted, info, summary FROM results WHERE key = ?", (key,)).fetchone()
+            )
+            if row is None:
+                return None
+            converted, info, summary = row
+            result = (converted, [ConversionWarning(**warning) for warning in json.loads(info)], summary)
+            self.remember(key, result)
+        return result
+
+    def put(self, key: str, result: ConversionResult) -> None:
+        with self.lock:
+            self.remember(key, result)
+            if self.path is not None:
+                converted, warnings, summary = result
+                self.connect().execute(
+                    "INSERT OR REPLACE INTO results (key, converted, info, summary) VALUES (?, ?, ?, ?)",
+                    (key, converted, json.dumps(warnings_json(warnings), ensure_ascii=False), summary),
+                )
+
+    def remember(self, key: str, result: ConversionResult) -> None:
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.capacity:
+            self.results.popitem(last=False)
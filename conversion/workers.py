@@ -0,0 +1,146 @@
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+import os
+import pickle
+from queue import Queue
+from typing import Any, Callable
+
+from conversion.classes import ConversionResult, Timings
+
+
+# The converters (and wikitextparser) are imported on their first use, so that starting the server,
+# a worker or a command does not wait for modules it may not need
+def convert_tournament(
+    text: str, title: str, options: dict[str, Any], timings: Timings | None = None
+) -> ConversionResult:
+    from conversion.convert_tournaments import TournamentConverter
+
+    return TournamentConverter(text, title, options, timings).convert()
+
+
+def convert_navbox(text: str, title: str, options: dict[str, Any], timings: Timings | None = None) -> ConversionResult:
+    from convert_navbox import NavboxConverter
+
+    return NavboxConverter(text, title, options, timings).convert()
+
+
+CONVERTERS = {"tournament": convert_tournament, "navbox": convert_navbox}
+
+
+def convert_timed(
+    converter: Callable, text: str, title: str, options: dict[str, Any]
+) -> tuple[ConversionResult, dict[str, dict[str, Any]]]:
+    # The timings are returned with the result, as the conversion may run in another process
+    timings = Timings()
+    with timings.phase("total"):
+        result = converter(text, title, options, timings)
+    return result, timings.as_dict()
+
+
+def warm_up() -> None:
+    # Imports the converters and loads the bracket tables in a new worker, before its first conversion
+    from conversion.brackets import bracket_tables
+    import conversion.convert_tournaments
+    import convert_navbox
+
+    bracket_tables()
+
+
+def serve(connection: Connection) -> None:
+    # Loop of a worker process: runs the jobs it receives until it receives None,
+    # or until the server exits without stopping its workers
+    warm_up()
+    try:
+        while (job := connection.recv()) is not None:
+            function, args = job
+            try:
+                result = (True, function(*args))
+            except Exception as e:
+                result = (False, e)
+            try:
+                connection.send(result)
+            except (AttributeError, TypeError, pickle.PicklingError) as e:
+                # The result (or its error) cannot be pickled
+                connection.send((False, RuntimeError(f"Result of {function.__name__} not sent: {e!r}")))
+    except (EOFError, BrokenPipeError):
+        pass
+
+
+class ConversionWorkers:
+    """
+    Conversions are CPU-bound: when started, they are run in a pool of worker processes,
+    so that a large page does not block the other requests of the server.
+    Each worker is driven through a pipe: waiting for a free worker or for a result only blocks the current greenlet
+    (the queue and the polling of the pipe are monkey-patched), never the event loop of the server.
+    """
+
+    def __init__(self) -> None:
+        self.processes: dict[Connection, BaseProcess] = {}
+        self.idle: Queue[Connection] | None = None
+
+    def start(self, count: int) -> None:
+        # Processes are spawned and not forked, so that they do not inherit the event loop of the server
+        # The workers warm up while the server starts: a conversion requested meanwhile waits for one of them
+        self.idle = Queue()
+        for _ in range(count):
+            self.idle.put(self.spawn())
+
+    def spawn(self) -> Connection:
+        context = get_context("spawn")
+        connection, worker_connection = context.Pipe()
+        # The pipe is a socket pair, non-blocking when monkey-patched: once a result starts to arrive, it is read whole
+        os.set_blocking(connection.fileno(), True)
+        os.set_blocking(worker_connection.fileno(), True)
+        process = context.Process(target=serve, args=(worker_connection,), daemon=True)
+        process.start()
+        worker_connection.close()
+        self.processes[connection] = process
+        return connection
+
+    def stop(self) -> None:
+        if self.idle is None:
+            return
+        for connection, process in self.processes.items():
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+        self.processes = {}
+        self.idle = None
+
+    def run(self, function: Callable, *args: Any) -> Any:
+        if self.idle is None:
+            return function(*args)
+        connection = self.idle.get()
+        try:
+            connection.send((function, args))
+        except (AttributeError, TypeError, pickle.PicklingError):
+            # The job cannot be pickled, so nothing was sent to the worker
+            self.idle.put(connection)
+            raise
+        except BaseException:
+            self.replace(connection)
+            raise
+        try:
+            connection.poll(None)
+            succeeded, result = connection.recv()
+        except BaseException:
+            # The worker died, or the greenlet was killed while the worker was busy
+            # (its result would then be read by the next conversion)
+            self.replace(connection)
+            raise
+        self.idle.put(connection)
+        if not succeeded:
+            raise result
+        return result
+
+    def replace(self, connection: Connection) -> None:
+        # A worker which died, or whose state is unknown, is replaced by a new one
+        self.processes.pop(connection).kill()
+        connection.close()
+        self.idle.put(self.spawn())
@@ -3,6 +3,7 @@ from typing import Any
 
 import wikitextparser as wtp
 
+from conversion.classes import ChangeSet, ConversionWarning, NoTimings, TemplateArguments, Timings, Warnings
 
 FILE_PATTERN = re.compile(r"\[\[File:([^\|\]]+)(?:\|(x?\d+px))?.*?\]\]")
 NAVBOXCHILDNAME_PATTERN = re.compile(r"(\{\{NavBoxChild[^\n]*)\n(\|name=)")
@@ -10,23 +11,30 @@ BULLET_PATTERN = re.compile(r"\{\{ *(?:[tT]emplate:)?• *\}\}")
 WIKITEXT_COMMENT_PATTERN = re.compile(r"<!--((?!-->).)*-->", re.DOTALL)
 FLATLIST_TEMPLATE_PATTERN = re.compile(r"\{\{ *(?:[tT]emplate:)?(?:[eE]nd)?[fF]latlist *\}\}")
 SERIES_ROW_START_PATTERN = re.compile(r"(\{\{ *(?:[tT]emplate:)?(?:[sS]eriesNavBoxRow) *)")
+# Arguments of the children of a navbox, with their index
+GROUP_ARG_PATTERN = re.compile(r"(?:group|list)(0|[1-9]\d*)")
+COLUMN_ARG_PATTERN = re.compile(r"col(0|[1-9]\d*)(?:header)?")
 
 
 class NavboxConverter:
-    def __init__(self, text: str, title: str, options: dict[str, Any]) -> None:
+    def __init__(
+        self, text: str, title: str, options: dict[str, Any], timings: Timings | NoTimings | None = None
+    ) -> None:
         self.text = text
         self.title = title
         self.options = options
+        self.timings = timings or NoTimings()
 
-    def convert(self) -> tuple[str, str, str]:
-        self.info: str = ""
+    def convert(self) -> tuple[str, list[ConversionWarning], str]:
+        self.warnings = Warnings()
         self.summary: str = ""
         self.counter: int = 0
         self.max_depth: int = 0
 
-        parsed = wtp.parse(self.text)
+        with self.timings.phase("parse"):
+            parsed = wtp.parse(self.text)
 
-        changes: list[tuple[int, int, str]] = []
+        changes = ChangeSet()
         skip_before = 0
         start = -1
         for tpl in parsed.templates:
@@ -40,47 +48,46 @@ class NavboxConverter:
             skip_before = end
 
             self.max_depth = 0
-            new_text = self.navbox_text(tpl, 0)
+            with self.timings.phase("navbox"):
+                new_text = self.navbox_text(tpl, 0)
             if self.max_depth == 1:
                 new_text = "\n".join(line.removeprefix("\t") for line in new_text.split("\n"))
                 new_text = NAVBOXCHILDNAME_PATTERN.sub(r"\1\2", new_text)
-            changes.append((start, end, new_text))
+            changes.add(start, end, new_text)
 
             self.counter += 1
 
         # Apply changes
-        converted = self.text
-        for start, end, new_text in sorted(changes, reverse=True):
-            converted = f"{converted[:start]}{new_text}{converted[end:]}"
+        with self.timings.phase("apply changes"):
+            converted = changes.apply(self.text)
 
         if self.counter:
             self.summary = f"Convert navbox ({self.counter}x)"
         else:
             self.summary = ""
 
-        return converted, self.info, self.summary
+        return converted, self.warnings.collect(), self.summary
 
     def navbox_text(self, tpl: wtp.Template, depth: int = 0, child_name: str = "") -> str:
-        title = ""
-        if x := tpl.get_arg("title"):
-            title = clean_arg_value(x)
+        args = TemplateArguments(tpl, clean_arg_value)
+        title = args.value("title")
 
         image = ""
         image_size = ""
-        if (x := tpl.get_arg("image")) and (m := FILE_PATTERN.fullmatch(clean_arg_value(x))):
+        if args.get("image") and (m := FILE_PATTERN.fullmatch(args.value("image"))):
             image = m[1]
             if m[2]:
                 image_size = m[2]
 
         children = []
 
-        if (x := tpl.get_arg("above")) and (val := clean_arg_value(x)):
+        if val := args.value("above"):
             children.append(self.navbox_child_with_items_text("", [val], depth + 1, centered=True))
 
-        self.append_children(tpl, children, depth, lambda i: f"group{i}", lambda i: f"list{i}")
-        self.append_children(tpl, children, depth, lambda i: f"col{i}header", lambda i: f"col{i}")
+        self.append_children(args, children, depth, GROUP_ARG_PATTERN, lambda i: f"group{i}", lambda i: f"list{i}")
+        self.append_children(args, children, depth, COLUMN_ARG_PATTERN, lambda i: f"col{i}header", lambda i: f"col{i}")
 
-        if (x := tpl.get_arg("below")) and (val := clean_arg_value(x)):
+        if val := args.value("below"):
             children.append(self.navbox_child_with_items_text("", [val], depth + 1, centered=True))
 
         text = "{{NavBox"
@@ -90,7 +97,7 @@ class NavboxConverter:
             if self.title.startswith("Template:"):
                 text += f'\n|template={self.title.removeprefix("Template:")}'
             else:
-                self.info += f'<div class="warning">⚠️ Page is not in the Template namespace</div>'
+                self.warnings.add("Navbox", "", "not-a-template", "Page is not in the Template namespace")
         if child_name:
             text += f"\n|name={child_name}"
         if title:
@@ -111,22 +118,24 @@ class NavboxConverter:
 
         return text
 
-    def append_children(self, tpl, children, depth, title_fn, contents_fn):
-        for i in range(0, 100):
+    def append_children(self, args, children, depth, index_pattern, title_fn, contents_fn):
+        # Children are found from the arguments of the template, in the order of their indexes
+        indexes = sorted({int(m[1]) for name in args.by_name if (m := index_pattern.fullmatch(name))})
+        for i in indexes:
             title = None
-            x_title = tpl.get_arg(title_fn(i))
-            x_contents = tpl.get_arg(contents_fn(i))
+            x_title = args.get(title_fn(i))
+            x_contents = args.get(contents_fn(i))
             if not x_title and not x_contents:
                 continue
             if x_title:
                 title = clean_arg_value(x_title)
             if x_contents:
                 appended = False
-                if x_contents.templates:
-                    subtpl_names = tuple(subtpl.normal_name(capitalize=True) for subtpl in x_contents.templates)
+                if subtpls := x_contents.templates:
+                    subtpl_names = tuple(subtpl.normal_name(capitalize=True) for subtpl in subtpls)
                     if subtpl_names[0] == "Flatlist":
                         if "SeriesNavBoxRow" in subtpl_names:
-                            subtpl = x_contents.templates[subtpl_names.index("SeriesNavBoxRow")]
+                            subtpl = subtpls[subtpl_names.index("SeriesNavBoxRow")]
                             child = SERIES_ROW_START_PATTERN.sub(rf"\1|newVersion=true|name={title}", str(subtpl))
                             children.append(child)
                         else:
@@ -140,7 +149,7 @@ class NavboxConverter:
                             children.append(self.navbox_child_with_items_text(title, items, depth + 1))
                         appended = True
                     elif subtpl_names[0] in ("Navbox", "Navbox/old", "Navbox subgroup"):
-                        children.append(self.navbox_text(x_contents.templates[0], depth + 1, title))
+                        children.append(self.navbox_text(subtpls[0], depth + 1, title))
                         appended = True
                     elif all(subtpl_name == "•" for subtpl_name in subtpl_names):
                         items = [item.strip() for item in BULLET_PATTERN.split(x_contents.value)]
@@ -148,7 +157,6 @@ class NavboxConverter:
                         appended = True
                 if not appended and (val := clean_arg_value(x_contents)) != "":
                     children.append(self.navbox_child_with_items_text(title, [val], depth + 1))
-            i += 1
 
     def navbox_child_with_items_text(
         self, child_name: str, items: list[str], depth: int = 0, centered: bool = False
@@ -188,4 +196,4 @@ def clean_arg_value(arg) -> str:
     value = arg.value if arg else ""
     value = WIKITEXT_COMMENT_PATTERN.sub("", value)
     value = value.strip()
-    return value
\ No newline at end of file
+    return value
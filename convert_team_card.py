@@ -2,6 +2,8 @@ from dataclasses import dataclass
 
 import wikitextparser as wtp
 
+from conversion.classes import ChangeSet
+
 
 @dataclass
 class TeamCardPlayer:
@@ -15,7 +17,7 @@ class TeamCardPlayer:
 def convert_team_card(original: str) -> str:
     parsed = wtp.parse(original)
 
-    changes: list[tuple[int, int, str]] = []
+    changes = ChangeSet()
 
     # 0: header
     # 1: players
@@ -79,12 +81,10 @@ def convert_team_card(original: str) -> str:
                     new_text += f"|p{i}team={player.team}"
                 new_text += "\n"
             new_text += "}}"
-            changes.append((start, tbl.span[1], new_text))
+            changes.add(start, tbl.span[1], new_text)
             state = 0
 
     # Apply changes
-    converted = original
-    for start, end, new_text in sorted(changes, reverse=True):
-        converted = f"{converted[:start]}{new_text}{converted[end:]}"
+    converted = changes.apply(original)
 
     return converted
@@ -1,16 +1,63 @@
-from gevent import monkey
+import argparse
+import sys
 
-monkey.patch_all()
+from conversion.workers import CONVERTERS
 
-import argparse
-import bottle
 
-from bracket_join import bracket_join
-from convert_navbox import NavboxConverter
-from convert_team_card import convert_team_card
-from conversion.convert import convert_page, convert_wikitext
-from conversion.convert_tournaments import TournamentConverter
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="liquipedia-convert")
+    parser.add_argument("-p", "--port", type=int, default=1234)
+    parser.add_argument("-d", "--debug", action="store_true")
+    parser.add_argument("--persist-results", action="store_true", help="keep the conversion results on disk")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="number of processes running the conversions")
+    subparsers = parser.add_subparsers(dest="command")
+    batch_parser = subparsers.add_parser("batch", help="convert many pages and write the results as JSON lines")
+    batch_parser.add_argument(
+        "--pages", action="append", default=[], help="file listing one page per line: wiki and title, space-separated"
+    )
+    batch_parser.add_argument("--dir", action="append", default=[], help="directory of .wiki files to convert")
+    batch_parser.add_argument("--wiki", default="starcraft2", help="wiki of the pages of --dir")
+    batch_parser.add_argument("--converter", choices=CONVERTERS, default="tournament")
+    batch_parser.add_argument("--option", action="append", default=[], help="conversion option, as name=value")
+    batch_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of processes (default: all cores)")
+    batch_parser.add_argument("-o", "--output", help="output file (default: standard output)")
+    batch_parser.add_argument("--timings", action="store_true", help="record and log the time of each phase")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ARGS = parse_args()
+    # The batch command runs its conversions in a pool of processes, without the event loop of the server
+    if ARGS.command == "batch":
+        from conversion.batch import run_batch
+
+        if ARGS.output:
+            with open(ARGS.output, "w", encoding="utf-8") as output:
+                sys.exit(run_batch(ARGS, output))
+        sys.exit(run_batch(ARGS, sys.stdout))
+
+    # The server is patched before importing its modules, as they create their locks on import
+    from gevent import monkey
+
+    monkey.patch_all()
+
+import bottle
+from gevent.pool import Pool
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterator
+
+from conversion.classes import warnings_html, warnings_json
+from conversion.convert import RESULT_CACHE, WORKERS, convert_page, convert_wikitext, info_html
 from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+from conversion.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, render_metrics
+from conversion.workers import convert_navbox, convert_tournament
+
+# Maximum number of conversions running at the same time for a batch request
+BATCH_CONCURRENCY = 8
+# Fields of a job given back with its error
+BATCH_JOB_IDENTITY = ("input_type", "wiki", "title", "wikitext_title")
 
 
 def enable_cors(fn):
@@ -29,6 +76,29 @@ def enable_cors(fn):
     return _enable_cors
 
 
+@bottle.hook("before_request")
+def start_request_timer():
+    bottle.request.environ["liquipedia_convert.start"] = time.perf_counter()
+
+
+@bottle.hook("after_request")
+def count_request():
+    route = bottle.request.environ.get("bottle.route")
+    rule = route.rule if route else "unknown"
+    HTTP_REQUESTS.inc(rule, bottle.request.method, str(bottle.response.status_code))
+    # The duration of a streamed response is observed by its stream, once the last part is sent
+    if bottle.request.environ.get("liquipedia_convert.streamed"):
+        return
+    if (start := bottle.request.environ.get("liquipedia_convert.start")) is not None:
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, rule)
+
+
+@bottle.route("/metrics")
+def metrics():
+    bottle.response.content_type = "text/plain; version=0.0.4; charset=utf-8"
+    return render_metrics()
+
+
 @bottle.route("/static/<filepath:path>")
 def server_static(filepath):
     return bottle.static_file(filepath, root="static")
@@ -88,9 +158,9 @@ def convert_result():
         }
 
     if input_type == "wiki_and_title":
-        converted, info, summary, wikitext = convert_page(wiki, title, convert_tournament, options)
+        converted, info, warnings, summary, wikitext = convert_page(wiki, title, convert_tournament, options)
     elif input_type == "wikitext":
-        converted, info, summary = convert_wikitext(wikitext, wikitext_title, convert_tournament, options)
+        converted, info, warnings, summary = convert_wikitext(wikitext, wikitext_title, convert_tournament, options)
 
     return {
         "input_type": input_type or "wiki_and_title",
@@ -99,7 +169,7 @@ def convert_result():
         "wikitext": wikitext,
         "wikitext_title": wikitext_title,
         "converted": converted,
-        "info": info,
+        "info": info_html(info, warnings),
         "summary": summary,
         "options": options,
         "open": False,
@@ -109,19 +179,91 @@ def convert_result():
 @bottle.route("/convert_api", method=["OPTIONS", "POST"])
 @enable_cors
 def convert_api():
-    options = {
-        **{key: bool(bottle.request.json.get(key, value)) for key, value in BOOL_OPTIONS.items()},
-        **{key: bottle.request.json.get(key, value) for key, value in STRING_OPTIONS.items()},
+    return api_conversion(bottle.request.json, convert_tournament)
+
+
+@bottle.route("/convert_api/batch", method=["OPTIONS", "POST"])
+@enable_cors
+def convert_api_batch():
+    # Jobs are given as a JSON array, as {"options": {...}, "jobs": [...]},
+    # or as NDJSON where a line with an "options" key sets the options of the following jobs
+    if bottle.request.content_type.startswith("application/json"):
+        data = bottle.request.json
+        if isinstance(data, list):
+            data = {"jobs": data}
+        if not isinstance(data, dict) or not isinstance(data.get("jobs", []), list):
+            bottle.response.status = 400
+            return {"info": 'Error: the body should be a list of jobs or {"options": {...}, "jobs": [...]}'}
+        jobs = ((data.get("options", {}), job) for job in data.get("jobs", []))
+    else:
+        jobs = ndjson_jobs(bottle.request.body)
+
+    def convert_job(indexed_job):
+        index, (options, job) = indexed_job
+        try:
+            if isinstance(job, ValueError):
+                # Invalid line of NDJSON
+                raise job
+            return {"index": index, **api_conversion(job, convert_tournament, api_options(options))}
+        except Exception as e:
+            # A failed job must not end the stream of the other ones, its result only identifies it (without its text)
+            identity = {key: job[key] for key in BATCH_JOB_IDENTITY if key in job} if isinstance(job, dict) else {}
+            return {"index": index, **identity, "converted": "", "info": f"Error: {e!r}", "warnings": []}
+
+    environ = bottle.request.environ
+    environ["liquipedia_convert.streamed"] = True
+    start = environ["liquipedia_convert.start"]
+    rule = environ["bottle.route"].rule
+
+    def stream():
+        try:
+            pool = Pool(BATCH_CONCURRENCY)
+            for result in pool.imap_unordered(convert_job, enumerate(jobs)):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        finally:
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, rule)
+
+    bottle.response.content_type = "application/x-ndjson"
+    return stream()
+
+
+def ndjson_jobs(body) -> Iterator[tuple[dict[str, Any], dict[str, Any] | ValueError]]:
+    # An invalid line is given as its error, so that it only fails its own job
+    options: dict[str, Any] = {}
+    for line in body:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            yield options, e
+            continue
+        if not isinstance(job, dict):
+            yield options, ValueError("Job is not a JSON object")
+        elif "options" in job:
+            options = job["options"]
+        else:
+            yield options, job
+
+
+def api_options(data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **{key: bool(data.get(key, value)) for key, value in BOOL_OPTIONS.items()},
+        **{key: data.get(key, value) for key, value in STRING_OPTIONS.items()},
     }
 
-    # for k, v in options.items():
-    #     print(k, v)
 
-    input_type = bottle.request.json.get("input_type", "")
-    wiki = bottle.request.json.get("wiki", "")
-    title = bottle.request.json.get("title", "")
-    wikitext_title = bottle.request.json.get("wikitext_title", "")
-    wikitext = bottle.request.json.get("wikitext", "")
+def api_conversion(data: dict[str, Any], converter: Callable, options: dict[str, Any] | None = None) -> dict[str, Any]:
+    if options is None:
+        options = api_options(data)
+    # Timings of the phases of the conversion are only recorded when requested
+    timings = {} if data.get("timings") else None
+
+    input_type = data.get("input_type", "")
+    wiki = data.get("wiki", "")
+    title = data.get("title", "")
+    wikitext_title = data.get("wikitext_title", "")
+    wikitext = data.get("wikitext", "")
     if (
         (input_type == "wiki_and_title" and (not wiki or not title))
         or (input_type == "wiki_and_text" and not wikitext)
@@ -146,31 +288,40 @@ def convert_api():
             "wikitext_title": wikitext_title,
             "converted": "",
             "info": info,
+            "warnings": [],
             "options": options,
         }
 
     if input_type == "wiki_and_title":
-        converted, info, summary, wikitext = convert_page(wiki, title, convert_tournament, options)
+        converted, info, warnings, summary, wikitext = convert_page(wiki, title, converter, options, timings)
     elif input_type == "wikitext":
-        converted, info, summary = convert_wikitext(wikitext, wikitext_title, convert_tournament, options)
+        converted, info, warnings, summary = convert_wikitext(wikitext, wikitext_title, converter, options, timings)
 
-    return {
+    response = {
         "input_type": input_type,
         "wiki": wiki,
         "title": title,
         "wikitext": wikitext,
         "wikitext_title": wikitext_title,
         "converted": converted,
-        "info": info,
+        # The warnings are given both in HTML (with the other messages) and as records
+        "info": info_html(info, warnings),
+        "warnings": warnings_json(warnings),
         "summary": summary,
         "options": options,
     }
+    if timings is not None:
+        response["timings"] = timings
+    return response
 
 
 @bottle.route("/bracket_join")
 @bottle.route("/bracket_join", method="POST")
 @bottle.jinja2_view("templates/bracket_join")
 def page_bracket_join():
+    # Like the converters, the tools of the other pages are only imported by their routes
+    from bracket_join import bracket_join
+
     original = bottle.request.forms.original or ""
 
     converted = bracket_join(original)
@@ -182,6 +333,8 @@ def page_bracket_join():
 @bottle.route("/team_card_conversion", method="POST")
 @bottle.jinja2_view("templates/team_card_conversion")
 def page_team_card_conversion():
+    from convert_team_card import convert_team_card
+
     original = bottle.request.forms.original or ""
 
     converted = convert_team_card(original)
@@ -196,84 +349,21 @@ def page_navbox_conversion():
     original = bottle.request.forms.original or ""
     page_title = bottle.request.forms.title or ""
 
-    converted, info, _ = convert_navbox(original, page_title, {}) if original else ("", "", "")
+    converted, warnings, _ = WORKERS.run(convert_navbox, original, page_title, {}) if original else ("", [], "")
 
-    return {"original": original, "page_title": page_title, "converted": converted, "info": info}
+    return {"original": original, "page_title": page_title, "converted": converted, "info": warnings_html(warnings)}
 
 
 @bottle.route("/navbox_conversion_api", method=["OPTIONS", "POST"])
 @enable_cors
-def convert_api():
-    options = {
-        **{key: bool(bottle.request.json.get(key, value)) for key, value in BOOL_OPTIONS.items()},
-        **{key: bottle.request.json.get(key, value) for key, value in STRING_OPTIONS.items()},
-    }
-
-    # for k, v in options.items():
-    #     print(k, v)
-
-    input_type = bottle.request.json.get("input_type", "")
-    wiki = bottle.request.json.get("wiki", "")
-    title = bottle.request.json.get("title", "")
-    wikitext_title = bottle.request.json.get("wikitext_title", "")
-    wikitext = bottle.request.json.get("wikitext", "")
-    if (
-        (input_type == "wiki_and_title" and (not wiki or not title))
-        or (input_type == "wiki_and_text" and not wikitext)
-        or input_type not in ("wiki_and_title", "wikitext")
-    ):
-        info = ""
-        if input_type == "wiki_and_title":
-            if not wiki:
-                info = "Error: No wiki"
-            if not title:
-                info = "Error: No title"
-        elif input_type == "wikitext":
-            if not wikitext:
-                info = "Error: No wikitext"
-        else:
-            info = 'Error: input_type should be "wiki_and_title" or "wikitext"'
-        return {
-            "input_type": input_type,
-            "wiki": wiki,
-            "title": title,
-            "wikitext": wikitext,
-            "wikitext_title": wikitext_title,
-            "converted": "",
-            "info": info,
-            "options": options,
-        }
-
-    if input_type == "wiki_and_title":
-        converted, info, summary, wikitext = convert_page(wiki, title, convert_navbox, options)
-    elif input_type == "wikitext":
-        converted, info, summary = convert_wikitext(wikitext, wikitext_title, convert_navbox, options)
-
-    return {
-        "input_type": input_type,
-        "wiki": wiki,
-        "title": title,
-        "wikitext": wikitext,
-        "wikitext_title": wikitext_title,
-        "converted": converted,
-        "info": info,
-        "summary": summary,
-        "options": options,
-    }
-
-
-def convert_tournament(text, title, options) -> tuple[str, str, str]:
-    return TournamentConverter(text, title, options).convert()
-
-
-def convert_navbox(text, title, options) -> tuple[str, str, str]:
-    return NavboxConverter(text, title, options).convert()
+def navbox_conversion_api():
+    return api_conversion(bottle.request.json, convert_navbox)
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(prog="liquipedia-convert")
-    parser.add_argument("-p", "--port", type=int, default=1234)
-    parser.add_argument("-d", "--debug", action="store_true")
-    args = parser.parse_args()
+    if ARGS.persist_results:
+        RESULT_CACHE.persist(Path(__file__).parent / "cache" / "results.sqlite3")
+    if ARGS.workers > 0:
+        WORKERS.start(ARGS.workers)
 
-    bottle.run(host="0.0.0.0", port=args.port, debug=args.debug)
+    bottle.run(server="gevent", host="0.0.0.0", port=ARGS.port, debug=ARGS.debug)
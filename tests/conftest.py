@@ -0,0 +1,120 @@
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from threading import Lock, Thread
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from conversion import convert
+from conversion.page_cache import PageCache
+
+WIKI = "testwiki"
+# Key of each revision property in the answers of the API
+RVPROP_KEYS = {"content": "*", "ids": "revid", "timestamp": "timestamp"}
+
+
+@dataclass
+class StandInWiki:
+    """
+    Local stand-in for the MediaWiki API of a wiki: answers revision queries from a dict of pages,
+    with title normalizations, redirects and (if enabled) one page with revisions per response.
+    """
+
+    # Revision of each page by title: content, revid and timestamp
+    pages: dict[str, dict] = field(default_factory=dict)
+    redirects: dict[str, str] = field(default_factory=dict)
+    paginate: bool = False
+    # Seconds waited before answering, to keep concurrent requests in flight
+    delay: float = 0.0
+    # Number of the next requests answered with a server error
+    failures: int = 0
+    # Query parameters of each request, in the order they were received
+    requests: list[dict[str, str]] = field(default_factory=list)
+    lock: Lock = field(default_factory=Lock)
+
+    def add(self, title: str, content: str, revid: int) -> None:
+        self.pages[title] = {"*": content, "revid": revid, "timestamp": f"2024-01-01T00:00:{revid % 60:02}Z"}
+
+    def answer(self, params: dict[str, str]) -> dict | None:
+        with self.lock:
+            self.requests.append(params)
+            if self.failures:
+                self.failures -= 1
+                return None
+        if self.delay:
+            time.sleep(self.delay)
+
+        query: dict = {"normalized": [], "redirects": [], "pages": {}}
+        targets = []
+        for title in params["titles"].split("|"):
+            normalized = title.replace("_", " ")
+            normalized = normalized[:1].upper() + normalized[1:]
+            if normalized != title:
+                query["normalized"].append({"from": title, "to": normalized})
+            if normalized in self.redirects:
+                query["redirects"].append({"from": normalized, "to": self.redirects[normalized]})
+                normalized = self.redirects[normalized]
+            targets.append(normalized)
+
+        with_revisions = [title for title in dict.fromkeys(targets) if title in self.pages]
+        if self.paginate:
+            # The pages answered before are given back without their revisions
+            skip = int(params.get("rvcontinue", 0))
+            answered = with_revisions[skip : skip + 1]
+        else:
+            answered = with_revisions
+        for page_id, title in enumerate(dict.fromkeys(targets), start=1):
+            if title not in self.pages:
+                query["pages"][str(-page_id)] = {"title": title, "missing": ""}
+            else:
+                page = {"title": title}
+                if title in answered:
+                    keys = [RVPROP_KEYS[prop] for prop in params["rvprop"].split("|")]
+                    page["revisions"] = [{key: self.pages[title][key] for key in keys}]
+                query["pages"][str(page_id)] = page
+
+        data = {"query": query}
+        if self.paginate and answered and with_revisions.index(answered[-1]) + 1 < len(with_revisions):
+            data["continue"] = {"rvcontinue": str(with_revisions.index(answered[-1]) + 1), "continue": "||"}
+        return data
+
+    @property
+    def queried_titles(self) -> list[list[str]]:
+        return [params["titles"].split("|") for params in self.requests if "rvcontinue" not in params]
+
+
+@pytest.fixture
+def stand_in_wiki(monkeypatch, tmp_path):
+    wiki = StandInWiki()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+            data = wiki.answer(params)
+            if data is None:
+                self.send_error(503)
+                return
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+
+    # The converter talks to the stand-in, without rate limit, and caches pages in a temporary database
+    monkeypatch.setitem(convert.API_URLS, WIKI, f"http://127.0.0.1:{server.server_port}/api.php")
+    monkeypatch.setitem(convert.RATE_LIMITERS, WIKI, convert.TokenBucket(1000, 1000))
+    monkeypatch.setattr(convert, "PAGE_CACHE", PageCache(tmp_path / "pages.sqlite3"))
+    yield wiki
+
+    server.shutdown()
+    server.server_close()
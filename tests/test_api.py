@@ -0,0 +1,84 @@
+from conftest import WIKI
+from conversion import convert
+
+
+def test_titles_are_queried_in_batches_of_the_api_limit(stand_in_wiki):
+    titles = [f"Page {i}" for i in range(120)]
+    for i, title in enumerate(titles):
+        stand_in_wiki.add(title, f"content {i}", 1000 + i)
+
+    revisions = convert.query_revisions(WIKI, titles + titles[:10], "ids")
+
+    assert [len(batch) for batch in stand_in_wiki.queried_titles] == [50, 50, 20]
+    assert sum(stand_in_wiki.queried_titles, []) == titles
+    assert list(revisions) == titles
+    assert revisions["Page 119"] == {"revid": 1119}
+
+
+def test_normalized_and_redirected_titles_map_back_to_the_requested_titles(stand_in_wiki):
+    stand_in_wiki.add("Main Event", "main event", 1)
+    stand_in_wiki.add("Qualifier", "qualifier", 2)
+    stand_in_wiki.redirects["Old qualifier"] = "Qualifier"
+
+    pages = convert.get_liquipedia_pages(WIKI, ["main_Event", "old_qualifier", "Qualifier"])
+
+    assert pages["main_Event"].content == "main event"
+    assert pages["old_qualifier"].content == "qualifier"
+    assert pages["old_qualifier"].revid == 2
+    assert pages["Qualifier"].content == "qualifier"
+    assert len(stand_in_wiki.requests) == 1
+
+
+def test_continued_responses_are_merged(stand_in_wiki):
+    for i in range(3):
+        stand_in_wiki.add(f"Page {i}", f"content {i}", 10 + i)
+    stand_in_wiki.paginate = True
+
+    pages = convert.get_liquipedia_pages(WIKI, ["Page 0", "Page 1", "Page 2"])
+
+    assert {title: page.content for title, page in pages.items()} == {
+        "Page 0": "content 0",
+        "Page 1": "content 1",
+        "Page 2": "content 2",
+    }
+    assert [params.get("rvcontinue") for params in stand_in_wiki.requests] == [None, "1", "2"]
+
+
+def test_missing_pages_are_none(stand_in_wiki):
+    stand_in_wiki.add("Existing", "content", 1)
+
+    revisions = convert.query_revisions(WIKI, ["Existing", "Missing"], "content|ids|timestamp")
+    pages = convert.fetch_pages(WIKI, ["Existing", "Missing"])
+
+    assert revisions["Missing"] is None
+    assert pages["Missing"] is None
+    assert pages["Existing"].content == "content"
+    assert convert.PAGE_CACHE.get(WIKI, "Missing") is None
+
+
+def test_fetch_pages_only_refetches_pages_with_a_new_revision(stand_in_wiki):
+    for i in range(3):
+        stand_in_wiki.add(f"Page {i}", f"content {i}", 1)
+    convert.fetch_pages(WIKI, ["Page 0", "Page 1", "Page 2"])
+    stand_in_wiki.add("Page 1", "content 1, edited", 2)
+    stand_in_wiki.requests.clear()
+
+    pages = convert.fetch_pages(WIKI, ["Page 0", "Page 1", "Page 2"], ignore_cache=True)
+
+    assert pages["Page 1"].content == "content 1, edited"
+    assert pages["Page 0"].content == "content 0"
+    assert [(params["rvprop"], params["titles"]) for params in stand_in_wiki.requests] == [
+        ("ids", "Page 0|Page 1|Page 2"),
+        ("content|ids|timestamp", "Page 1"),
+    ]
+
+
+def test_server_errors_are_retried_on_the_shared_session(stand_in_wiki):
+    stand_in_wiki.add("Page", "content", 1)
+    stand_in_wiki.failures = 1
+
+    page = convert.get_liquipedia_page(WIKI, "Page")
+
+    assert page.content == "content"
+    assert len(stand_in_wiki.requests) == 2
+    assert convert.get_session(WIKI) is convert.get_session(WIKI)
@@ -0,0 +1,74 @@
+import io
+import json
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+from wsgiref.util import setup_testing_defaults
+
+ROOT = Path(__file__).parent.parent
+CORPUS = ROOT / "benchmarks" / "corpus"
+
+
+def test_batch_command_converts_more_large_pages_than_processes(tmp_path):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    for i in range(4):
+        shutil.copy(CORPUS / "legacy_bracket-medium.wiki", pages / f"Bracket_{i}.wiki")
+
+    process = subprocess.run(
+        [sys.executable, "main.py", "batch", "--dir", str(pages), "-j", "2", "-o", str(tmp_path / "results.jsonl")],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert process.returncode == 0, process.stderr
+    results = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert sorted(result["title"] for result in results) == [f"Bracket {i}" for i in range(4)]
+    assert all(result["converted"].startswith("==1==\n{{Bracket|") and not result["error"] for result in results)
+    assert "4 pages (0 failed)" in process.stderr
+
+
+def post_batch(body: bytes, content_type: str) -> tuple[str, list]:
+    # The batch endpoint is called through the WSGI application of the server (not monkey-patched when imported)
+    import bottle
+    import main  # noqa: F401
+
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": "/convert_api/batch",
+        "CONTENT_TYPE": content_type,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    response = b"".join(bottle.default_app()(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+    if content_type == "application/json" and not statuses[0].startswith("200"):
+        return statuses[0], [json.loads(response)]
+    return statuses[0], sorted(
+        (json.loads(line) for line in response.splitlines()), key=lambda result: result["index"]
+    )
+
+
+def test_invalid_ndjson_lines_only_fail_their_job():
+    job = {"input_type": "wikitext", "wikitext": "{{Match list end}}", "wikitext_title": "Test"}
+    lines = [json.dumps(job), "{not json", "[1, 2]", json.dumps(job)]
+
+    status, results = post_batch("\n".join(lines).encode(), "application/x-ndjson")
+
+    assert status.startswith("200")
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["warnings"] and results[3]["warnings"]
+    assert results[1]["info"].startswith("Error: JSONDecodeError(")
+    assert results[2]["info"] == "Error: ValueError('Job is not a JSON object')"
+
+
+def test_json_body_which_is_not_a_list_of_jobs_is_rejected():
+    for body in ("3", '"jobs"', '{"jobs": 3}', "null"):
+        status, [result] = post_batch(body.encode(), "application/json")
+
+        assert status.startswith("400"), body
+        assert result["info"].startswith("Error: the body should be a list of jobs")
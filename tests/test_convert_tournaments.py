@@ -0,0 +1,104 @@
+from conversion.classes import ChangeSet
+from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+from conversion.workers import convert_timed, convert_tournament
+
+GROUP_SECTION_PAGE = """==Group A==
+{{GroupTableStart|Group A|width=400}}
+{{GroupTableSlot|{{player|Foo|flag=kr|race=t}}|place=1|win_m=1|lose_m=0}}
+{{GroupTableSlot|{{player|Bar|flag=kr|race=z}}|place=2|win_m=0|lose_m=1}}
+{{GroupTableEnd}}
+{{Legacy Match list start|id=abc}}
+{{Match maps|player1=Foo|player2=Bar|map1=A|map1win=1|winner=1}}
+{{Match list end}}
+''May 5''
+{{MatchSummary|Foo|Bar|map1=A|win1=1|map2=B|win2=1}}
+==Other==
+{{MatchSummary|Baz|Qux|map1=C|win1=2}}
+"""
+
+
+def convert(text, **options):
+    return convert_tournament(text, "Test", {**BOOL_OPTIONS, **STRING_OPTIONS, "id_seed": "test", **options})
+
+
+def test_grouping_with_other_conversions_in_the_section_converts_every_template():
+    converted, warnings, _ = convert(GROUP_SECTION_PAGE, group_matches_of_section="Group A")
+
+    assert "{{MatchSummary" not in converted
+    assert "{{GroupTableLeague" in converted
+    assert "|opponent1={{1Opponent|Foo}}" in converted
+    assert converted.count("{{SingleMatch") == 2
+    [warning] = [w for w in warnings if w.code == "grouping-discarded"]
+    assert "Group A" in warning.message
+    assert "GroupTableStart" in warning.message and "Legacy Match list start" in warning.message
+    assert not any(w.code == "overlapping-conversions" for w in warnings)
+
+
+def test_grouping_replaces_a_section_of_match_summaries():
+    converted, warnings, _ = convert(GROUP_SECTION_PAGE, group_matches_of_section="Other")
+
+    other = converted.split("==Other==")[1]
+    assert other.startswith("\n{{Matchlist|id=")
+    assert "{{MatchSummary" not in converted
+    assert converted.count("{{SingleMatch") == 1
+    assert not any(w.code == "grouping-discarded" for w in warnings)
+
+
+def test_sections_with_templates_at_the_same_offsets_read_their_own_arguments():
+    page = "==A==\n{{MatchSummary|Foo|Bar|map1=A|win1=1}}\n==B==\n{{MatchSummary|Baz|Qux|map1=C|win1=2}}\n"
+
+    converted, _, _ = convert(page, sections="A,B")
+
+    first, second = converted.split("==B==")
+    assert "{{1Opponent|Foo|" in first and "{{1Opponent|Baz|" not in first
+    assert "{{1Opponent|Baz|" in second and "{{Map|map=C|winner=2}}" in second
+
+
+def test_timed_conversion_records_a_phase_for_each_template_name():
+    options = {**BOOL_OPTIONS, **STRING_OPTIONS, "id_seed": "test"}
+    result, timings = convert_timed(convert_tournament, GROUP_SECTION_PAGE, "Test", options)
+
+    assert result == convert(GROUP_SECTION_PAGE)
+    assert timings["pass 2: MatchSummary"]["count"] == 2
+    assert "pass 2: GroupTableStart" in timings
+
+
+NESTED_MATCH_SUMMARY_PAGES = {
+    "{{Bracket|": "{{LegacyBracket|Bracket/2|2SEBracket|R1D1=Foo|R1D2=Bar"
+    "|R1G1details={{MatchSummary|Foo|Bar|map1=A|win1=1}}}}\n",
+    "{{GroupTableLeague": """{{GroupTableStart|Group A|width=400}}
+{{GroupTableSlot|{{player|Foo|flag=kr|race=t}}|place=1|win_m=1|lose_m=0}}
+{{MatchSummary|Baz|Qux|map1=C|win1=2}}
+{{GroupTableSlot|{{player|Bar|flag=kr|race=z}}|place=2|win_m=0|lose_m=1}}
+{{GroupTableEnd}}
+""",
+    "{{Matchlist|id=abc": """{{Legacy Match list start|id=abc}}
+{{Match maps|player1=Foo|player2=Bar|map1=A|map1win=1|winner=1}}
+{{MatchSummary|Baz|Qux|map1=C|win1=2}}
+{{Match list end}}
+""",
+    "{{SingleMatch|": "{{TeamMatch|team1=A|team2=B|m1p1=x|m1p2=y|m1win=1|m1map=M"
+    "|details={{MatchSummary|x|y|map1=A|win1=1}}}}\n",
+}
+
+
+def test_conversion_containing_a_match_summary_replaces_it():
+    # As when the changes were applied one by one from the end of the text, the outer conversion wins,
+    # but the end of the converted match summary is not left after it anymore
+    for expected, page in NESTED_MATCH_SUMMARY_PAGES.items():
+        converted, warnings, _ = convert(page)
+
+        assert converted.startswith(expected), page
+        assert converted.count("{{SingleMatch") == (expected == "{{SingleMatch|"), page
+        assert "MatchSummary" not in converted, page
+        [warning] = [w for w in warnings if w.code == "overlapping-conversions"]
+        assert warning.message == "Overlapping conversions: 1 discarded (MatchSummary)"
+
+
+def test_change_set_drops_nested_and_partially_overlapping_changes():
+    outer, inner, partial, after = (0, 10, "outer"), (2, 5, "inner"), (8, 12, "partial"), (12, 14, "after")
+
+    assert ChangeSet([inner, partial, outer, after]).resolve() == [outer, after]
+    changes = ChangeSet([inner, partial, outer, after], keep_inner=True)
+    assert changes.resolve() == [inner, partial, after]
+    assert changes.discarded == [outer]
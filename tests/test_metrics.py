@@ -0,0 +1,38 @@
+import pytest
+
+from conversion.metrics import REGISTRY, Counter, Histogram
+
+
+@pytest.fixture
+def unregistered():
+    # Metrics created by a test are not exposed by the server
+    count = len(REGISTRY)
+    yield
+    del REGISTRY[count:]
+
+
+def test_counter_above_a_million_is_rendered_exactly(unregistered):
+    counter = Counter("test_total", "Test counter", ("converter",))
+    counter.inc("tournament", amount=1234567)
+    counter.inc("navbox", amount=2.5)
+
+    lines = list(counter.render())
+
+    assert lines[2:] == ['test_total{converter="tournament"} 1234567', 'test_total{converter="navbox"} 2.5']
+
+
+def test_histogram_keeps_short_bucket_bounds_and_exact_totals(unregistered):
+    histogram = Histogram("test_seconds", "Test histogram", buckets=(0.5, 1e6))
+    for _ in range(3):
+        histogram.observe(0.25)
+    histogram.observe(3000000.125)
+
+    lines = list(histogram.render())
+
+    assert lines[2:] == [
+        'test_seconds_bucket{le="0.5"} 3',
+        'test_seconds_bucket{le="1e+06"} 3',
+        'test_seconds_bucket{le="+Inf"} 4',
+        "test_seconds_sum 3000000.875",
+        "test_seconds_count 4",
+    ]
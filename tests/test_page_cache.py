@@ -0,0 +1,92 @@
+from conftest import WIKI
+from conversion import convert
+from conversion.page_cache import PageCache, content_hash
+
+
+def test_pages_are_stored_by_normalized_title(tmp_path):
+    cache = PageCache(tmp_path / "pages.sqlite3")
+
+    cache.put(WIKI, "some_tournament/Group  Stage", "content", 12, "2024-01-01T00:00:00Z")
+    page = cache.get(WIKI, "Some tournament/Group Stage")
+
+    assert page.title == "Some tournament/Group Stage"
+    assert (page.content, page.revid, page.timestamp) == ("content", 12, "2024-01-01T00:00:00Z")
+    assert page.content_hash == content_hash("content")
+    assert cache.get("otherwiki", "Some tournament/Group Stage") is None
+
+
+def test_touch_only_updates_the_check_time(tmp_path):
+    cache = PageCache(tmp_path / "pages.sqlite3")
+    put = cache.put(WIKI, "Page", "content", 12)
+
+    cache.touch(WIKI, "page")
+    page = cache.get(WIKI, "Page")
+
+    assert page.checked >= put.checked
+    assert (page.content, page.revid) == ("content", 12)
+
+
+def test_missing_page_is_fetched_and_cached(stand_in_wiki):
+    stand_in_wiki.add("Page", "content", 1)
+
+    page, info = convert.get_page(WIKI, "Page", ignore_cache=False)
+
+    assert info == "Getting content from the API"
+    assert page.content == "content"
+    assert convert.PAGE_CACHE.get(WIKI, "Page").revid == 1
+
+
+def test_fresh_page_is_not_checked(stand_in_wiki):
+    convert.PAGE_CACHE.put(WIKI, "Page", "cached", 1)
+
+    page, info = convert.get_page(WIKI, "Page", ignore_cache=False)
+
+    assert page.content == "cached"
+    assert info.startswith("Getting cached content (")
+    assert stand_in_wiki.requests == []
+
+
+def test_stale_page_with_the_latest_revision_is_revalidated(stand_in_wiki, monkeypatch):
+    monkeypatch.setattr(convert, "CACHE_MAX_AGE", -1)
+    stand_in_wiki.add("Page", "content", 1)
+    cached = convert.PAGE_CACHE.put(WIKI, "Page", "content", 1)
+
+    page, info = convert.get_page(WIKI, "Page", ignore_cache=False)
+
+    assert info == "Getting cached content (revision 1 is the latest)"
+    assert page.content == "content"
+    assert convert.PAGE_CACHE.get(WIKI, "Page").checked >= cached.checked
+    assert [params["rvprop"] for params in stand_in_wiki.requests] == ["ids"]
+
+
+def test_stale_page_with_a_new_revision_is_fetched_again(stand_in_wiki, monkeypatch):
+    monkeypatch.setattr(convert, "CACHE_MAX_AGE", -1)
+    stand_in_wiki.add("Page", "edited", 2)
+    convert.PAGE_CACHE.put(WIKI, "Page", "content", 1)
+
+    page, info = convert.get_page(WIKI, "Page", ignore_cache=False)
+
+    assert info == "Getting content from the API"
+    assert (page.content, page.revid) == ("edited", 2)
+    assert convert.PAGE_CACHE.get(WIKI, "Page").content == "edited"
+    assert [params["rvprop"] for params in stand_in_wiki.requests] == ["ids", "content|ids|timestamp"]
+
+
+def test_stale_page_is_kept_when_its_revision_is_unknown(stand_in_wiki, monkeypatch):
+    monkeypatch.setattr(convert, "CACHE_MAX_AGE", -1)
+    convert.PAGE_CACHE.put(WIKI, "Page", "cached", 1)
+
+    page, info = convert.get_page(WIKI, "Page", ignore_cache=False)
+
+    assert page.content == "cached"
+    assert "Cache is more than 1-hour old" in info
+
+
+def test_ignore_cache_fetches_an_outdated_page(stand_in_wiki):
+    stand_in_wiki.add("Page", "edited", 2)
+    convert.PAGE_CACHE.put(WIKI, "Page", "cached", 1)
+
+    page, info = convert.get_page(WIKI, "Page", ignore_cache=True)
+
+    assert info == "Getting content from the API"
+    assert page.content == "edited"
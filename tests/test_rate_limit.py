@@ -0,0 +1,85 @@
+from threading import Barrier, Thread
+import time
+
+import pytest
+
+from conftest import WIKI
+from conversion import convert
+
+
+def test_token_bucket_delays_requests_past_its_burst():
+    bucket = convert.TokenBucket(rate=20, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    burst = time.monotonic() - start
+    for _ in range(2):
+        bucket.acquire()
+    total = time.monotonic() - start
+
+    # The burst is immediate, then one token every 1/20 s
+    assert burst < 0.04
+    assert total >= 0.09
+
+
+def test_token_bucket_refills_while_idle():
+    bucket = convert.TokenBucket(rate=20, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+
+    assert time.monotonic() - start < 0.04
+
+
+def run_concurrently(function, count):
+    barrier = Barrier(count)
+    results: list = [None] * count
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = function()
+        except Exception as e:
+            results[i] = e
+
+    threads = [Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_callers_share_one_fetch(stand_in_wiki):
+    stand_in_wiki.add("Page", "content", 1)
+    stand_in_wiki.delay = 0.2
+    key = (WIKI, "Page", False)
+
+    results = run_concurrently(lambda: convert.coalesce(key, lambda: convert.get_page(WIKI, "Page", False)), 5)
+
+    assert len(stand_in_wiki.requests) == 1
+    assert all(page.content == "content" for page, _ in results)
+    assert key not in convert.IN_FLIGHT
+
+
+def test_concurrent_callers_share_the_error_of_the_fetch():
+    calls = []
+
+    def fail():
+        calls.append(None)
+        time.sleep(0.2)
+        raise RuntimeError("unavailable")
+
+    results = run_concurrently(lambda: convert.coalesce("key", fail), 3)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # The next caller starts a new fetch
+    with pytest.raises(RuntimeError):
+        convert.coalesce("key", fail)
+    assert len(calls) == 2
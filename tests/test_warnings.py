@@ -0,0 +1,96 @@
+from conversion.classes import ConversionWarning, Warnings, warnings_html, warnings_json
+from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+from conversion.result_cache import ResultCache
+from conversion.workers import ConversionWorkers, convert_tournament
+
+MATCH_LIST_PAGE = """{{Legacy Match list start|id=abc|vod=https://vod}}
+{{Match maps|player1=Foo|player2=Bar|map1=A|map1win=1|winner=1}}
+{{Match maps|player1=Baz|player2=Qux}}
+{{Match list comment|Played offline}}
+{{Match list end}}
+{{Match list end}}
+"""
+OPTIONS = {**BOOL_OPTIONS, **STRING_OPTIONS, "id_seed": "test"}
+
+
+def test_warnings_over_the_limit_of_a_category_are_counted():
+    warnings = Warnings(limit=3)
+    for i in range(5):
+        warnings.add("Players", "", "unknown-player", f"Player {i} not found")
+    warnings.add("Bracket", "abc", "unknown-arguments", "Unknown arguments")
+
+    collected = warnings.collect()
+
+    assert [warning.message for warning in collected] == [
+        "Player 0 not found",
+        "Player 1 not found",
+        "Player 2 not found",
+        "Unknown arguments",
+        "2 more warnings not shown",
+    ]
+    assert collected[-1] == ConversionWarning("Players", "", "dropped-warnings", "2 more warnings not shown")
+
+
+def test_warnings_of_a_match_list_are_grouped_under_its_id():
+    _, warnings, _ = convert_tournament(MATCH_LIST_PAGE, "Test", dict(OPTIONS))
+
+    assert [(warning.category, warning.template_id, warning.code) for warning in warnings] == [
+        ("Matchlist", "abc", "vod-moved"),
+        ("Matchlist", "abc", "bestof-not-guessed"),
+        ("Matchlist", "abc", "comment-lost"),
+        ("Matchlist", "", "end-without-start"),
+    ]
+    # The same HTML as before the warnings were records: the messages of a match list name it
+    assert warnings_html(warnings) == (
+        '<div class="warning">⚠️ vod in Match list start abc moved to the first match of the list</div>'
+        '<div class="warning">⚠️ [Matchlist abc][M2] bestof cannot be guessed for score 0-0</div>'
+        '<div class="warning">⚠️ [Matchlist abc] Match list comment may be lost</div>'
+        '<div class="warning">⚠️ Match list end without a start</div>'
+    )
+
+
+def test_warnings_of_a_bracket_are_grouped_under_its_id():
+    warnings = [
+        ConversionWarning("Bracket", "abc", "unknown-arguments", "[R1M1] Unknown arguments"),
+        ConversionWarning("Bracket", "abc", "no-duplicate-check", "noDuplicateCheck used"),
+        ConversionWarning("Bracket", "abc", "comments-moved", "[R1M2] Comments moved to the end of the line"),
+        ConversionWarning("Bracket", "def", "unknown-arguments", "Unknown arguments"),
+        ConversionWarning("Bracket", "", "dropped-warnings", "2 more warnings not shown"),
+    ]
+
+    assert warnings_html(warnings) == (
+        '<div class="warning">⚠️ [Bracket abc][R1M1] Unknown arguments</div>'
+        '<div class="warning">⚠️      noDuplicateCheck used</div>'
+        '<div class="warning">⚠️     [R1M2] Comments moved to the end of the line</div>'
+        '<div class="warning">⚠️ [Bracket def] Unknown arguments</div>'
+        '<div class="warning">⚠️ [Bracket] 2 more warnings not shown</div>'
+    )
+
+
+def test_warnings_round_trip_through_the_persisted_result_cache(tmp_path):
+    result = convert_tournament(MATCH_LIST_PAGE, "Test", dict(OPTIONS))
+    result[1].append(ConversionWarning("Players", "", "unknown-player", "Player « Foo » not found"))
+    ResultCache(4, tmp_path / "results.sqlite3").put("key", result)
+
+    # A new cache (as after a restart) only has the stored JSON
+    cached = ResultCache(4, tmp_path / "results.sqlite3").get("key")
+
+    assert cached == result
+    assert warnings_json(cached[1])[0] == {
+        "category": "Matchlist",
+        "template_id": "abc",
+        "code": "vod-moved",
+        "message": "vod in Match list start abc moved to the first match of the list",
+    }
+
+
+def test_warnings_of_a_conversion_in_a_worker_process():
+    workers = ConversionWorkers()
+    workers.start(1)
+    try:
+        result = workers.run(convert_tournament, MATCH_LIST_PAGE, "Test", dict(OPTIONS))
+    finally:
+        workers.stop()
+
+    assert result == convert_tournament(MATCH_LIST_PAGE, "Test", dict(OPTIONS))
+    assert all(isinstance(warning, ConversionWarning) for warning in result[1])
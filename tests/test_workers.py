@@ -0,0 +1,87 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from conversion.workers import ConversionWorkers
+
+# Run in another process, as monkey-patching would change the threads and sockets of the other tests
+GEVENT_SCRIPT = """
+from gevent import monkey
+
+monkey.patch_all()
+
+import time
+
+import gevent
+
+from conversion.default_option_values import BOOL_OPTIONS, STRING_OPTIONS
+from conversion.workers import ConversionWorkers, convert_tournament
+
+text = open("benchmarks/corpus/legacy_bracket-medium.wiki", encoding="utf-8").read()
+options = {**BOOL_OPTIONS, **STRING_OPTIONS, "id_seed": "test"}
+workers = ConversionWorkers()
+workers.start(2)
+ticks = []
+
+
+def tick():
+    while True:
+        ticks.append(time.monotonic())
+        gevent.sleep(0.01)
+
+
+ticker = gevent.spawn(tick)
+conversions = [gevent.spawn(workers.run, convert_tournament, text, "Test", options) for _ in range(5)]
+gevent.joinall(conversions, timeout=60, raise_error=True)
+ticker.kill()
+workers.stop()
+
+assert all(conversion.successful() for conversion in conversions)
+assert all(conversion.value == convert_tournament(text, "Test", options) for conversion in conversions)
+# The event loop kept running while the conversions were waiting for a worker or for their result
+assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.5, ticks
+print("ok")
+"""
+
+
+def test_more_conversions_than_workers_do_not_block_the_event_loop():
+    result = subprocess.run(
+        [sys.executable, "-c", GEVENT_SCRIPT],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "ok\n"
+
+
+def test_errors_of_a_conversion_are_raised_and_the_worker_is_kept():
+    workers = ConversionWorkers()
+    workers.start(1)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            workers.run(divmod, 1, 0)
+        assert workers.run(divmod, 7, 2) == (3, 1)
+        with pytest.raises(AttributeError):
+            workers.run(lambda: None)
+        assert workers.run(divmod, 7, 2) == (3, 1)
+    finally:
+        workers.stop()
+
+
+def test_a_dead_worker_is_replaced():
+    workers = ConversionWorkers()
+    workers.start(1)
+    try:
+        [process] = workers.processes.values()
+        process.kill()
+        process.join()
+        with pytest.raises((EOFError, OSError)):
+            workers.run(divmod, 7, 2)
+        assert workers.run(divmod, 7, 2) == (3, 1)
+    finally:
+        workers.stop()